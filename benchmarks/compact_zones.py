@@ -0,0 +1,169 @@
+"""Benchmark: per-zone entities in the default and compact zone modes.
+
+Adds the zone entities of a 500 zone panel to a test Home Assistant
+instance in each mode and reports the entity count, the time to add
+them, the memory they retain and the state writes (recorder rows) for
+startup and for one open/close cycle of every zone.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.compact_zones
+"""
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from unittest.mock import Mock
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.helpers import device_registry as dr, frame
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    MockEntityPlatform,
+    async_test_home_assistant,
+)
+
+from custom_components.dmp import DMPRuntimeData
+from custom_components.dmp import binary_sensor, sensor, switch
+from custom_components.dmp.const import (
+    CONF_COMPACT_ZONES,
+    CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_ZONE_CLASS,
+    CONF_ZONE_NAME,
+    CONF_ZONE_NUMBER,
+    CONF_ZONES,
+    DOMAIN,
+    EVENT_ZONE_STATE,
+)
+
+ZONES = 500
+ZONE_CLASSES = ["wired_door", "battery_window", "wired_motion", "wired_smoke"]
+
+
+class _Zone:
+    def __init__(self):
+        self.state = "N"
+
+    @property
+    def is_open(self):
+        return self.state == "O"
+
+    @property
+    def is_bypassed(self):
+        return self.state == "X"
+
+    @property
+    def has_fault(self):
+        return self.state in ("S", "L", "M")
+
+
+class _Panel:
+    def __init__(self):
+        self.zones = {}
+
+    def ensure_zone(self, zone_number):
+        return self.zones.setdefault(zone_number, _Zone())
+
+    def get_alarm(self, zone_number):
+        return False
+
+
+def _listener(panel):
+    listener = Mock()
+    listener.getPanels.return_value = {"12345": panel}
+    listener.isConnected.return_value = True
+    return listener
+
+
+async def _run(compact):
+    async with async_test_home_assistant() as hass:
+        frame.async_setup(hass)
+        panel = _Panel()
+        entry = MockConfigEntry(domain=DOMAIN, data={}, entry_id="bench")
+        entry.add_to_hass(hass)
+        entry.runtime_data = DMPRuntimeData(_listener(panel), None, None)
+        dr.async_get(hass).async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, "dmp-12345-panel")}
+        )
+        hass.data[DOMAIN] = {
+            entry.entry_id: {
+                CONF_PANEL_ACCOUNT_NUMBER: "12345",
+                CONF_COMPACT_ZONES: compact,
+                CONF_ZONES: [
+                    {
+                        CONF_ZONE_NAME: "Zone %d" % number,
+                        CONF_ZONE_NUMBER: "%03d" % number,
+                        CONF_ZONE_CLASS: ZONE_CLASSES[number % len(ZONE_CLASSES)],
+                    }
+                    for number in range(1, ZONES + 1)
+                ],
+            }
+        }
+        writes = []
+        hass.bus.async_listen(EVENT_STATE_CHANGED, writes.append)
+        events = []
+        hass.bus.async_listen(EVENT_ZONE_STATE, events.append)
+
+        entities = []
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        for module in (binary_sensor, sensor, switch):
+            created = []
+            await module.async_setup_entry(
+                hass, entry, lambda new, **kwargs: created.extend(new)
+            )
+            # Only the zone entities, not the panel diagnostic sensors
+            created = [e for e in created if hasattr(e, "process_zone_callback")]
+            platform = MockEntityPlatform(
+                hass, domain=module.__name__.rsplit(".", 1)[-1], platform_name=DOMAIN
+            )
+            platform.config_entry = entry
+            await platform.async_add_entities(created)
+            entities.extend(created)
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        retained, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        startup_writes = len(writes)
+
+        for state in ("O", "N"):
+            for zone in panel.zones.values():
+                zone.state = state
+            for entity in entities:
+                entity.process_zone_callback()
+        await hass.async_block_till_done()
+        await hass.async_stop(force=True)
+        return {
+            "entities": len(entities),
+            "seconds": elapsed,
+            "retained_kib": retained / 1024,
+            "startup_rows": startup_writes,
+            "cycle_rows": len(writes) - startup_writes,
+            "cycle_events": len(events),
+        }
+
+
+def main():
+    for compact in (False, True):
+        result = asyncio.run(_run(compact))
+        print(
+            "%-8s %5d entities  add %.3f s  %7.0f KiB retained  "
+            "startup %5d state rows  open/close cycle %5d state rows "
+            "+ %4d events"
+            % (
+                "compact" if compact else "default",
+                result["entities"],
+                result["seconds"],
+                result["retained_kib"],
+                result["startup_rows"],
+                result["cycle_rows"],
+                result["cycle_events"],
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
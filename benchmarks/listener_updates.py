@@ -0,0 +1,141 @@
+"""Benchmark: listener entity wake-ups with @callback vs coroutine consumers.
+
+Registers five zone consumers per zone for a 500 zone panel, plus the
+panel-wide and last contact consumers, then reports:
+
+* S3 zone events per second through DMPListener._handle_s3_event, with
+  coalescing and duplicate suppression off so every event wakes its zone
+* full refreshes per second through DMPListener.updateHASS(), which
+  wakes every consumer
+
+Each consumer does the same small amount of work either as a plain
+@callback function or as a coroutine function.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.listener_updates
+"""
+
+import asyncio
+import time
+from unittest.mock import Mock
+
+from homeassistant.core import callback
+from pydmp import S3Message
+
+from custom_components.dmp import DMPListener, DMPPanel
+from custom_components.dmp.const import (
+    CONF_AWAY_AREA,
+    CONF_DUPLICATE_WINDOW,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_HOME_AREA,
+    CONF_PANEL_ACCOUNT_NUMBER,
+)
+
+ZONES = 500
+CONSUMERS_PER_ZONE = 5
+EVENTS = 20_000
+REFRESHES = 20
+REPEAT = 5
+
+
+class _Consumer:
+    """Stands in for an entity: reads the zone and compares to its last state"""
+
+    def __init__(self, zone):
+        self.zone = zone
+        self.last = None
+        self.writes = 0
+
+    def _update(self):
+        state = self.zone.state if self.zone is not None else None
+        if state != self.last:
+            self.last = state
+            self.writes += 1
+
+    @callback
+    def process_callback(self):
+        self._update()
+
+    async def async_process_callback(self):
+        self._update()
+
+
+def _setup(use_coroutines):
+    config = {
+        CONF_HOME_AREA: "01",
+        CONF_AWAY_AREA: "02",
+        CONF_PANEL_ACCOUNT_NUMBER: "12345",
+        CONF_EVENT_BATCH_WINDOW: 0,
+        CONF_DUPLICATE_WINDOW: 0,
+    }
+    pydmp_panel = Mock()
+    pydmp_panel._zones = {}
+    listener = DMPListener(Mock(), config, pydmp_panel)
+    panel = DMPPanel(Mock(), config, pydmp_panel)
+    listener.addPanel(panel)
+
+    def consumer_callback(consumer):
+        if use_coroutines:
+            return consumer.async_process_callback
+        return consumer.process_callback
+
+    consumers = []
+    for number in range(1, ZONES + 1):
+        zone_number = "%03d" % number
+        zone = panel.ensure_zone(zone_number)
+        for _ in range(CONSUMERS_PER_ZONE):
+            consumer = _Consumer(zone)
+            consumers.append(consumer)
+            listener.register_zone_callback(
+                "12345", zone_number, consumer_callback(consumer)
+            )
+    for register in (listener.register_callback, listener.register_contact_callback):
+        consumer = _Consumer(None)
+        consumers.append(consumer)
+        register(consumer_callback(consumer))
+    return listener, consumers
+
+
+def _messages():
+    messages = []
+    for index in range(EVENTS):
+        zone_number = "%03d" % (index % ZONES + 1)
+        type_code = "DO" if (index // ZONES) % 2 == 0 else "DC"
+        messages.append(
+            S3Message("12345", "Zc", type_code, ['z %s"Zone' % zone_number, "t A"], "")
+        )
+    return messages
+
+
+async def _run(use_coroutines):
+    listener, consumers = _setup(use_coroutines)
+    messages = _messages()
+    events_seconds = refresh_seconds = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for msg in messages:
+            await listener._handle_s3_event(msg)
+        events_seconds = min(events_seconds, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in range(REFRESHES):
+            await listener.updateHASS()
+        refresh_seconds = min(refresh_seconds, time.perf_counter() - start)
+
+    if not any(consumer.writes for consumer in consumers):
+        raise RuntimeError("No consumer was woken; the benchmark measured nothing")
+    return EVENTS / events_seconds, REFRESHES / refresh_seconds, len(consumers)
+
+
+def main():
+    for name, use_coroutines in (("coroutine", True), ("@callback", False)):
+        events, refreshes, consumers = asyncio.run(_run(use_coroutines))
+        print(
+            "%-10s %5d consumers  %8.0f S3 events/s  %6.0f full refreshes/s"
+            % (name, consumers, events, refreshes)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Microbenchmark: S3 category dispatch table vs the legacy if/elif chain.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.s3_dispatch
+"""
+
+import timeit
+from unittest.mock import Mock
+
+from homeassistant.components.alarm_control_panel import AlarmControlPanelState
+from pydmp import S3Message, parse_s3_message
+from pydmp.const.events import DMPEventType
+
+from custom_components.dmp import DMPListener
+from custom_components.dmp.const import CONF_AWAY_AREA, CONF_HOME_AREA
+
+ROUNDS = 200_000
+
+MESSAGES = [
+    S3Message("12345", "Zc", "DO", ['z 001"Front Door', "t ADO"], ""),
+    S3Message("12345", "Zc", "DC", ['z 001"Front Door', "t ADC"], ""),
+    S3Message("12345", "Zx", None, ['z 002"Window'], ""),
+    S3Message("12345", "Zr", None, ['z 002"Window'], ""),
+    S3Message("12345", "Zq", "CL", ['a 001"Main', "t SCL"], ""),
+    S3Message("12345", "Zs", None, [], ""),
+]
+
+
+class _Zone:
+    def update_state(self, state):
+        self.state = state
+
+
+class _Panel:
+    def __init__(self):
+        self.area = {"areaState": AlarmControlPanelState.DISARMED}
+
+    def set_alarm(self, zone_number):
+        pass
+
+    def clear_alarm(self, zone_number):
+        pass
+
+    def updateArea(self, areaObj):
+        self.area = areaObj
+
+    def getArea(self):
+        return self.area
+
+
+def legacy_dispatch(home_area, panel, event, zone):
+    """The if/elif chain _handle_s3_event used before the dispatch table."""
+    category = event.category
+    type_code = event.type_code
+    zone_number = event.zone
+    if category == DMPEventType.WIRELESS_LOW_BATTERY:
+        if zone:
+            zone.update_state("L")
+    elif category == DMPEventType.ZONE_BYPASS:
+        if zone:
+            zone.update_state("X")
+    elif category in (
+        DMPEventType.ZONE_FAIL,
+        DMPEventType.WIRELESS_ZONE_MISSING,
+        DMPEventType.ZONE_TROUBLE,
+        DMPEventType.ZONE_FAULT,
+    ):
+        if zone:
+            if category == DMPEventType.WIRELESS_ZONE_MISSING:
+                zone.update_state("M")
+            else:
+                zone.update_state("S")
+    elif category in (DMPEventType.ZONE_RESET, DMPEventType.ZONE_RESTORE):
+        if zone:
+            zone.update_state("N")
+        panel.clear_alarm(zone_number)
+    elif category in (DMPEventType.ZONE_ALARM, DMPEventType.ZONE_FORCE_ARM):
+        panel.set_alarm(zone_number)
+        panel.updateArea(
+            {
+                "areaName": event.area_name or "",
+                "areaState": AlarmControlPanelState.TRIGGERED,
+            }
+        )
+    elif category == DMPEventType.ARMING_STATUS:
+        area_number = event.area
+        if type_code == "OP":
+            areaState = AlarmControlPanelState.DISARMED
+        elif type_code == "CL":
+            if area_number and area_number.strip().lstrip("0") == home_area.lstrip(
+                "0"
+            ):
+                if panel.getArea()["areaState"] != AlarmControlPanelState.ARMED_AWAY:
+                    areaState = AlarmControlPanelState.ARMED_HOME
+                else:
+                    areaState = AlarmControlPanelState.ARMED_AWAY
+            else:
+                areaState = AlarmControlPanelState.ARMED_AWAY
+        else:
+            return
+        panel.updateArea({"areaName": event.area_name or "", "areaState": areaState})
+    elif category == DMPEventType.REAL_TIME_STATUS:
+        if zone:
+            if type_code in ("DO", "HO", "FO"):
+                zone.update_state("O")
+            elif type_code == "DC":
+                zone.update_state("N")
+    elif category in (
+        DMPEventType.SYSTEM_MESSAGE,
+        DMPEventType.DOOR_ACCESS,
+        DMPEventType.SCHEDULES,
+    ):
+        pass
+
+
+def main():
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    handlers = listener._s3_handlers
+    unhandled = listener._s3_unhandled
+    panel = _Panel()
+    zone = _Zone()
+    events = [parse_s3_message(msg) for msg in MESSAGES]
+
+    def run_legacy():
+        for event in events:
+            legacy_dispatch("01", panel, event, zone)
+
+    def run_table():
+        for event in events:
+            handler = (
+                handlers.get((event.category, event.type_code))
+                or handlers.get((event.category, None))
+                or unhandled
+            )
+            handler(panel, event, zone)
+
+    per_event = ROUNDS * len(events)
+    for name, func in (("if/elif chain", run_legacy), ("dispatch table", run_table)):
+        seconds = min(timeit.repeat(func, number=ROUNDS, repeat=5))
+        print("%-15s %7.1f ns/event" % (name, seconds / per_event * 1e9))
+
+
+if __name__ == "__main__":
+    main()
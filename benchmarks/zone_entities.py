@@ -0,0 +1,166 @@
+"""Benchmark: memory and identity lookups of the per-zone entities.
+
+Creates the six default entities (open/close, battery, trouble, alarm,
+status, bypass switch) of 999 battery door zones and reports the
+memory they retain once created and the time for ten sweeps of name,
+unique_id, icon and device_info, the properties HA reads on every
+state write.
+
+The same is measured for a stand-in of the previous entities, which
+kept their fields in the instance dict and rebuilt the unique ID,
+device info and icon in properties on every access.
+
+Run from the repository root with the test requirements installed:
+
+    python -m benchmarks.zone_entities
+"""
+
+import gc
+import time
+import tracemalloc
+from unittest.mock import Mock
+
+from homeassistant.helpers.entity import DeviceInfo, Entity
+
+from custom_components.dmp import DMPPanel, DMPRuntimeData
+from custom_components.dmp.binary_sensor import ZONE_BINARY_SENSORS
+from custom_components.dmp.const import (
+    CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_ZONE_CLASS,
+    CONF_ZONE_NAME,
+    CONF_ZONE_NUMBER,
+    DOMAIN,
+)
+from custom_components.dmp.entity import create_zone_entities
+from custom_components.dmp.sensor import DMPZoneStatus
+from custom_components.dmp.switch import DMPZoneBypassSwitch
+
+ZONES = 999
+SWEEPS = 10
+ENTITY_CLASSES = (*ZONE_BINARY_SENSORS, DMPZoneStatus, DMPZoneBypassSwitch)
+LEGACY_SUFFIXES = ("openclose", "battery", "trouble", "alarm", "status", "bypass")
+
+
+class _LegacyZoneEntity(Entity):
+    """Zone entity in the style the integration used before the shared base"""
+
+    def __init__(self, hass, config_entry, entity_config, suffix):
+        self._hass = hass
+        self._config_entry = config_entry
+        config = hass.data[DOMAIN][config_entry.entry_id]
+        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
+        self._listener = config_entry.runtime_data.listener
+        self._name = entity_config.get(CONF_ZONE_NAME)
+        self._device_name = entity_config.get(CONF_ZONE_NAME)
+        self._number = entity_config.get(CONF_ZONE_NUMBER)
+        self._suffix = suffix
+        if "door" in entity_config.get(CONF_ZONE_CLASS):
+            self._device_class = "door"
+        elif "window" in entity_config.get(CONF_ZONE_CLASS):
+            self._device_class = "window"
+        else:
+            self._device_class = "sensors"
+        self._panel = self._listener.getPanels()[str(self._accountNum)]
+        self._zone = self._panel.ensure_zone(self._number)
+        self._state = False
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def icon(self):
+        if self._state:
+            if self._device_class == "window":
+                return "mdi:window-open"
+            return "mdi:door-open"
+        if self._device_class == "window":
+            return "mdi:window-closed"
+        return "mdi:door-closed"
+
+    @property
+    def unique_id(self):
+        return "dmp-%s-zone-%s-%s" % (self._accountNum, self._number, self._suffix)
+
+    @property
+    def device_info(self):
+        return DeviceInfo(
+            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
+            name=self._device_name,
+            manufacturer="Digital Monitoring Products",
+            via_device=(DOMAIN, "dmp-%s-panel" % self._accountNum),
+        )
+
+
+def _zones():
+    return [
+        {
+            CONF_ZONE_NAME: "Zone %d" % number,
+            CONF_ZONE_NUMBER: "%03d" % number,
+            CONF_ZONE_CLASS: "battery_door",
+        }
+        for number in range(1, ZONES + 1)
+    ]
+
+
+def _setup():
+    pydmp_panel = Mock()
+    pydmp_panel._zones = {}
+    panel = DMPPanel(Mock(), {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, pydmp_panel)
+    listener = Mock()
+    listener.getPanels.return_value = {"12345": panel}
+    entry = Mock()
+    entry.entry_id = "bench"
+    entry.runtime_data = DMPRuntimeData(listener, pydmp_panel, None)
+    hass = Mock()
+    hass.data = {DOMAIN: {"bench": {CONF_PANEL_ACCOUNT_NUMBER: "12345"}}}
+    zones = _zones()
+    # Create the pyDMP zones up front so they are not counted per entity
+    for zone in zones:
+        panel.ensure_zone(zone[CONF_ZONE_NUMBER])
+    return hass, entry, zones
+
+
+def _create_current(hass, entry, zones):
+    return create_zone_entities(hass, entry, zones, ENTITY_CLASSES)
+
+
+def _create_legacy(hass, entry, zones):
+    return [
+        _LegacyZoneEntity(hass, entry, zone, suffix)
+        for zone in zones
+        for suffix in LEGACY_SUFFIXES
+    ]
+
+
+def _measure(create):
+    hass, entry, zones = _setup()
+    gc.collect()
+    tracemalloc.start()
+    entities = create(hass, entry, zones)
+    gc.collect()
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(SWEEPS):
+        for entity in entities:
+            entity.name
+            entity.unique_id
+            entity.icon
+            entity.device_info
+    elapsed = time.perf_counter() - start
+    return len(entities), retained / len(entities), elapsed
+
+
+def main():
+    for name, create in (("previous", _create_legacy), ("current", _create_current)):
+        entities, per_entity, elapsed = _measure(create)
+        print(
+            "%-9s %5d entities  %5.0f B retained per entity  "
+            "%d identity sweeps %.3f s" % (name, entities, per_entity, SWEEPS, elapsed)
+        )
+
+
+if __name__ == "__main__":
+    main()
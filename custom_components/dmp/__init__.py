@@ -1,30 +1,75 @@
 """The DMP Integration Component"""
 
+import asyncio
+from collections import OrderedDict
 from datetime import datetime, timezone
 import logging
+import random
+import time
 
 from homeassistant.helpers import entity_registry as er
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.storage import Store
 from homeassistant.components.alarm_control_panel import AlarmControlPanelState
 from homeassistant.const import Platform
 
-from pydmp import DMPPanel as PyDMPPanel, DMPStatusServer, parse_s3_message, Zone
+from pydmp import DMPPanel as PyDMPPanel, parse_s3_message, Zone
+from pydmp import panel as pydmp_panel_module
 from pydmp.const.events import DMPEventType
+from pydmp.exceptions import DMPInvalidParameterError
 
 from .const import (
     CONF_PANEL_IP,
-    LISTENER,
     CONF_PANEL_LISTEN_PORT,
     CONF_PANEL_REMOTE_PORT,
     CONF_PANEL_ACCOUNT_NUMBER,
     CONF_PANEL_REMOTE_KEY,
     CONF_HOME_AREA,
     CONF_AWAY_AREA,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_INGEST_QUEUE_SIZE,
+    CONF_INGEST_OVERFLOW,
+    CONF_FAST_S3_PARSER,
+    CONF_DUPLICATE_WINDOW,
+    CONF_RECONCILE_MIN_INTERVAL,
+    CONF_RECONCILE_MAX_INTERVAL,
+    CONF_ZONE_RATE_LIMITS,
+    CONF_ZONE_DEGLITCH,
+    DEFAULT_EVENT_BATCH_WINDOW,
+    DEFAULT_DUPLICATE_WINDOW,
+    DUPLICATE_CACHE_SIZE,
+    DEFAULT_RECONCILE_MIN_INTERVAL,
+    DEFAULT_RECONCILE_MAX_INTERVAL,
+    DEFAULT_INGEST_QUEUE_SIZE,
+    DEFAULT_INGEST_OVERFLOW,
+    DEFAULT_ZONE_RATE_LIMITS,
+    DEFAULT_ZONE_DEGLITCH,
+    INGEST_OVERFLOW_DROP_OLDEST,
+    OPTIONS_ENTRY_KEYS,
     DOMAIN,
     CONF_ZONES,
     CONF_ZONE_NUMBER,
-    PYDMP_PANEL,
-    STATUS_SERVER,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_STORAGE_KEY,
+    SNAPSHOT_SAVE_DELAY,
+    CONNECTION_CONNECTING,
+    CONNECTION_CONNECTED,
+    CONNECTION_DEGRADED,
+    CONNECTION_OFFLINE,
+    RECONNECT_BASE_DELAY,
+    RECONNECT_MAX_DELAY,
+    RECONNECT_OFFLINE_AFTER,
+    CONNECTION_CHECK_INTERVAL,
+    COMMAND_PRIORITY_ARMING,
+    COMMAND_PRIORITY_BYPASS,
+    COMMAND_PRIORITY_STATUS,
+    COMMAND_TIMEOUTS,
 )
+from .command_queue import DMPCommandQueue
+from .services import async_setup_services
+from .status_server import async_acquire_status_server, async_release_status_server
+from .s3_parser import fast_parse_s3_message, number_key
+from .zone_filter import DMPZoneFilter
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -56,6 +101,43 @@ ZONE_STATE_TO_STATUS = {
     "M": "Trouble",
 }
 
+# Compact mode status sensor: trouble and battery have no binary sensors there,
+# so short and missing zones are told apart
+ZONE_STATE_TO_COMPACT_STATUS = {
+    "N": "Ready",
+    "O": "Open",
+    "S": "Short",
+    "X": "Bypass",
+    "L": "Low Battery",
+    "M": "Missing",
+}
+
+
+def zone_flags(zone, alarm):
+    """Return the zone booleans otherwise exposed as binary sensors"""
+    if zone is None:
+        return {
+            "open": False,
+            "low_battery": False,
+            "trouble": False,
+            "bypassed": False,
+            "alarm": alarm,
+        }
+    return {
+        "open": bool(zone.is_open),
+        "low_battery": zone.state == "L",
+        "trouble": bool(zone.has_fault),
+        "bypassed": bool(zone.is_bypassed),
+        "alarm": alarm,
+    }
+
+
+# Zc type codes that open (DO, HO, FO) or close (DC) a zone
+ZONE_TRANSITION_TYPE_CODES = frozenset(("DO", "HO", "FO", "DC"))
+
+# pyDMP zone states that keep an area from arming
+ZONE_FAULT_STATES = frozenset(("O", "S", "M"))
+
 # Maps pyDMP single-char area state to HA status string
 AREA_STATUS_MAP = {
     "A": "Armed",
@@ -63,6 +145,26 @@ AREA_STATUS_MAP = {
 }
 
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass, config) -> bool:
+    """Set up the DMP services."""
+    async_setup_services(hass)
+    return True
+
+
+class DMPRuntimeData:
+    """Runtime objects owned by a single config entry."""
+
+    __slots__ = ("listener", "pydmp_panel", "status_server")
+
+    def __init__(self, listener, pydmp_panel, status_server):
+        self.listener = listener
+        self.pydmp_panel = pydmp_panel
+        self.status_server = status_server
+
+
 async def async_setup_entry(hass, entry) -> bool:
     """Set up platform from a ConfigEntry."""
     hass.data.setdefault(DOMAIN, {})
@@ -71,53 +173,70 @@ async def async_setup_entry(hass, entry) -> bool:
     entry.add_update_listener(options_update_listener)
     _LOGGER.debug("Loaded config %s", config)
 
-    # Create pyDMP panel and connect
+    # Create pyDMP panel, connected in the background once setup is done
     panel_port = config.get(CONF_PANEL_REMOTE_PORT) or 2001
     pydmp_panel = PyDMPPanel(port=panel_port)
     ip = config.get(CONF_PANEL_IP)
     account = config.get(CONF_PANEL_ACCOUNT_NUMBER)
     remote_key = config.get(CONF_PANEL_REMOTE_KEY) or "                "
-    await pydmp_panel.connect(ip, account, remote_key)
-    await pydmp_panel.start_keepalive()
 
-    # Create status server for realtime events
+    # Realtime events arrive on a status server shared by every panel
+    # reporting to this listen port
     listen_port = config.get(CONF_PANEL_LISTEN_PORT)
-    status_server = DMPStatusServer("0.0.0.0", listen_port)
-
-    # Create HA state container
-    panel = DMPPanel(hass, config, pydmp_panel)
-    _LOGGER.debug("Panel account number: %s", panel.getAccountNumber())
-
-    # Create listener and wire up S3 event callback
-    listener = DMPListener(hass, config, pydmp_panel, status_server)
-    listener.addPanel(panel)
-    _LOGGER.debug("Panels attached to listener: %s", str(listener.getPanels()))
-
-    # Start status server
-    await status_server.start()
-
-    # Store everything in hass.data
-    hass.data[DOMAIN][LISTENER] = listener
-    hass.data[DOMAIN][PYDMP_PANEL] = pydmp_panel
-    hass.data[DOMAIN][STATUS_SERVER] = status_server
-    hass.data[DOMAIN][entry.entry_id] = config
+    status_server = await async_acquire_status_server(hass, listen_port)
+
+    listener = None
+    try:
+        # Create HA state container
+        panel = DMPPanel(hass, config, pydmp_panel)
+        _LOGGER.debug("Panel account number: %s", panel.getAccountNumber())
+
+        # Create listener and wire up S3 event callback
+        listener = DMPListener(hass, config, pydmp_panel, status_server)
+        listener.addPanel(panel)
+        _LOGGER.debug("Panels attached to listener: %s", str(listener.getPanels()))
+
+        # Restore the last known zone/area state so entities start out correct
+        await listener.restoreSnapshot(
+            Store(hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY % entry.entry_id)
+        )
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    hass.async_create_task(listener.updateStatus())
+        # Start S3 event consumer
+        listener.start()
+
+        # Runtime objects belong to this entry so several panels can coexist
+        entry.runtime_data = DMPRuntimeData(listener, pydmp_panel, status_server)
+        hass.data[DOMAIN][entry.entry_id] = config
+
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        # Give back the status server reference, or the port stays bound
+        if listener is not None:
+            await listener.stop()
+        await async_release_status_server(hass, status_server)
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        raise
+    # Connect without holding up startup; the status is refreshed on connect
+    listener.startConnection(ip, account, remote_key)
     return True
 
 
 async def async_unload_entry(hass, entry):
     _LOGGER.debug("Unloading entry.")
-    status_server = hass.data[DOMAIN][STATUS_SERVER]
-    pydmp_panel = hass.data[DOMAIN][PYDMP_PANEL]
+    runtime_data = entry.runtime_data
+    listener = runtime_data.listener
+    status_server = runtime_data.status_server
+    pydmp_panel = runtime_data.pydmp_panel
 
-    # Stop status server
-    await status_server.stop()
+    # Detach from the status server, then stop the S3 consumer and
+    # coalesced updates; the server stops once no entry uses it
+    await listener.stop()
+    await async_release_status_server(hass, status_server)
 
     # Stop keepalive and disconnect
     await pydmp_panel.stop_keepalive()
     await pydmp_panel.disconnect()
+    listener.releaseConnection()
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
@@ -125,6 +244,13 @@ async def async_unload_entry(hass, entry):
     return unload_ok
 
 
+async def async_remove_entry(hass, entry):
+    """Delete the state snapshot of a removed entry"""
+    await Store(
+        hass, SNAPSHOT_STORAGE_VERSION, SNAPSHOT_STORAGE_KEY % entry.entry_id
+    ).async_remove()
+
+
 async def options_update_listener(hass, entry):
     _LOGGER.debug("Options flow completed.")
     entity_registry = er.async_get(hass)
@@ -152,6 +278,9 @@ async def options_update_listener(hass, entry):
         _LOGGER.debug("Current config zones: %s" % config[CONF_ZONES])
         _LOGGER.debug("New config zones: %s" % options[CONF_ZONES])
         config[CONF_ZONES] = options[CONF_ZONES]
+        for key in OPTIONS_ENTRY_KEYS:
+            if key in options:
+                config[key] = options[key]
         hass.config_entries.async_update_entry(entry, data=config, options={})
         await hass.config_entries.async_reload(entry.entry_id)
 
@@ -164,6 +293,13 @@ class DMPPanel:
         self._area = AlarmControlPanelState.DISARMED  # Default Value
         self._pydmp_panel = pydmp_panel
         self._alarm_zones = {}
+        self._commands_in_flight = 0
+        # every command on the remote link goes through one queue
+        self._commands = DMPCommandQueue()
+        # zone number -> state, for zones that would keep an area from arming
+        self._faulted_zones = {}
+        # zone number -> area number, learned from S3 events
+        self._zone_areas = {}
 
     def __str__(self):
         return "DMP Panel with account number %s at addr %s" % (
@@ -184,14 +320,15 @@ class DMPPanel:
     def getArea(self):
         return self._area
 
+    # Alarm flags are keyed like zone callbacks, so "5" and "005" match
     def set_alarm(self, zone_number):
-        self._alarm_zones[zone_number] = True
+        self._alarm_zones[number_key(zone_number)] = True
 
     def clear_alarm(self, zone_number):
-        self._alarm_zones[zone_number] = False
+        self._alarm_zones[number_key(zone_number)] = False
 
     def get_alarm(self, zone_number):
-        return self._alarm_zones.get(zone_number, False)
+        return self._alarm_zones.get(number_key(zone_number), False)
 
     def ensure_zone(self, zone_num):
         try:
@@ -208,17 +345,157 @@ class DMPPanel:
     def getAccountNumber(self):
         return self._accountNumber
 
+    def getZoneFlags(self, zone_num):
+        """Return the zone booleans and compact status of a zone"""
+        # Read-only: never add zones the panel has not been asked about
+        zone = None
+        if self._pydmp_panel is not None:
+            try:
+                zone = self._pydmp_panel._zones.get(int(zone_num))
+            except (ValueError, TypeError):
+                pass
+        alarm = self.get_alarm(zone_num)
+        flags = zone_flags(zone, alarm)
+        if alarm:
+            flags["status"] = "Alarm"
+        else:
+            state = zone.state if zone is not None else "N"
+            flags["status"] = ZONE_STATE_TO_COMPACT_STATUS.get(state, "Ready")
+        return flags
+
+    def noteZone(self, zone_num, state, area=None):
+        """Keep the fault and zone area indexes in step with a zone"""
+        try:
+            zone_int = int(zone_num)
+        except (ValueError, TypeError):
+            return
+        if state in ZONE_FAULT_STATES:
+            self._faulted_zones[zone_int] = state
+        else:
+            self._faulted_zones.pop(zone_int, None)
+        if area:
+            try:
+                self._zone_areas[zone_int] = int(area)
+            except ValueError:
+                pass
+
+    def getFaultedZones(self, areas):
+        """Return faulted zones known to be in the given areas"""
+        areas = set(areas)
+        zone_areas = self._zone_areas
+        return sorted(
+            zone
+            for zone in self._faulted_zones
+            if zone in zone_areas and zone_areas[zone] in areas
+        )
+
+    def getFaultedZonesWithoutArea(self):
+        """Return faulted zones whose area no panel message has named yet"""
+        return sorted(
+            zone for zone in self._faulted_zones if zone not in self._zone_areas
+        )
+
+    def getSnapshot(self):
+        """Return the zone states and areas, alarm flags and area to persist"""
+        zones = {}
+        if self._pydmp_panel is not None:
+            for zone_num, zone_obj in self._pydmp_panel._zones.items():
+                if zone_obj.state != "unknown":
+                    zones[str(zone_num)] = zone_obj.state
+        area = self._area if isinstance(self._area, dict) else {}
+        return {
+            "zones": zones,
+            "alarms": sorted(
+                str(z) for z, active in self._alarm_zones.items() if active
+            ),
+            "area": area.get("areaState"),
+            # Learned from panel messages; arming only bypasses placed zones
+            "zone_areas": {str(z): a for z, a in sorted(self._zone_areas.items())},
+        }
+
+    def restoreSnapshot(self, snapshot):
+        """Apply a persisted snapshot, returning the number of zones restored"""
+        restored = 0
+        for zone_num, area in snapshot.get("zone_areas", {}).items():
+            # Areas seen since startup are newer than the snapshot
+            try:
+                self._zone_areas.setdefault(int(zone_num), int(area))
+            except (ValueError, TypeError):
+                continue
+        for zone_num, state in snapshot.get("zones", {}).items():
+            zone = self.ensure_zone(zone_num)
+            # Never overwrite a state already reported by the panel
+            if zone is not None and zone.state == "unknown":
+                zone.update_state(state)
+                self.noteZone(zone_num, state)
+                restored += 1
+        for zone_number in snapshot.get("alarms", []):
+            self.set_alarm(zone_number)
+        if snapshot.get("area"):
+            self.updateArea(
+                {
+                    "areaName": "",
+                    "areaState": AlarmControlPanelState(snapshot["area"]),
+                }
+            )
+        return restored
+
     async def _zone_command(self, zone_num, command):
         try:
             zone_int = int(zone_num)
         except (ValueError, TypeError):
             _LOGGER.error("Invalid zone number for %s command: %s", command, zone_num)
             return
-        if zone_int in self._pydmp_panel._zones:
-            await getattr(self._pydmp_panel._zones[zone_int], command)()
-        else:
+        zone = self._command_zone(zone_int)
+        await self._run_command(COMMAND_PRIORITY_BYPASS, zone, command)
+
+    def _command_zone(self, zone_num):
+        """Return the pyDMP zone to send a command to.
+
+        Zones the panel has not reported yet get a throwaway Zone, so a
+        command never adds them to the panel. Raises ValueError, TypeError
+        or DMPInvalidParameterError for invalid zone numbers.
+        """
+        zone_int = int(zone_num)
+        zone = self._pydmp_panel._zones.get(zone_int)
+        if zone is None:
             zone = Zone(self._pydmp_panel, zone_int)
-            await getattr(zone, command)()
+        return zone
+
+    async def _run_command(self, priority, target, command, *args, **kwargs):
+        self._commands_in_flight += 1
+        try:
+            return await self._commands.submit(
+                priority, getattr(target, command), *args, **kwargs
+            )
+        finally:
+            self._commands_in_flight -= 1
+
+    def close(self):
+        """Cancel queued and running panel commands"""
+        self._commands.close()
+
+    def commandInFlight(self):
+        return self._commands_in_flight > 0
+
+    def getCommandStats(self):
+        return self._commands.getStats()
+
+    async def arm_areas(self, *args, **kwargs):
+        await self._run_command(
+            COMMAND_PRIORITY_ARMING, self._pydmp_panel, "arm_areas", *args, **kwargs
+        )
+
+    async def disarm_areas(self, *args, **kwargs):
+        await self._run_command(
+            COMMAND_PRIORITY_ARMING, self._pydmp_panel, "disarm_areas", *args, **kwargs
+        )
+
+    async def update_status(self):
+        # Status queries are not commands, so they never hold off reconciliation
+        await self._commands.submit(
+            COMMAND_PRIORITY_STATUS, self._pydmp_panel.update_status
+        )
 
     async def bypass_zone(self, zone_num):
         await self._zone_command(zone_num, "bypass")
@@ -226,6 +503,179 @@ class DMPPanel:
     async def restore_zone(self, zone_num):
         await self._zone_command(zone_num, "restore")
 
+    async def bypass_zones(self, zone_nums):
+        return await self._zone_batch(zone_nums, "bypass")
+
+    async def restore_zones(self, zone_nums):
+        return await self._zone_batch(zone_nums, "restore")
+
+    async def _zone_batch(self, zone_nums, command):
+        """Run a zone command for several zones in a single queue slot.
+
+        Returns {zone: "ok" or the error message} for each zone.
+        """
+        self._commands_in_flight += 1
+        try:
+            return await self._commands.submit(
+                COMMAND_PRIORITY_BYPASS,
+                self._run_zone_batch,
+                zone_nums,
+                command,
+                timeout=COMMAND_TIMEOUTS[COMMAND_PRIORITY_BYPASS] * len(zone_nums),
+            )
+        finally:
+            self._commands_in_flight -= 1
+
+    async def arm_with_bypass(self, areas, instant=False):
+        """Bypass faulted zones in the areas, then arm them, as one command.
+
+        Returns {"bypassed": {zone: result}, "armed": bool, "unknown_area":
+        [zone]}. Nothing is armed if any bypass fails. Faulted zones whose
+        area is not known are never bypassed, since they may belong to an
+        area that is not being armed; they are listed in unknown_area.
+        """
+        timeout = (
+            COMMAND_TIMEOUTS[COMMAND_PRIORITY_ARMING]
+            + COMMAND_TIMEOUTS[COMMAND_PRIORITY_BYPASS] * len(self._faulted_zones)
+        )
+        self._commands_in_flight += 1
+        try:
+            return await self._commands.submit(
+                COMMAND_PRIORITY_ARMING,
+                self._run_arm_with_bypass,
+                areas,
+                instant,
+                timeout=timeout,
+            )
+        finally:
+            self._commands_in_flight -= 1
+
+    async def _run_arm_with_bypass(self, areas, instant):
+        # Looked up once the command runs, after anything queued ahead of it
+        faulted = ["%03d" % zone for zone in self.getFaultedZones(areas)]
+        unknown_area = ["%03d" % zone for zone in self.getFaultedZonesWithoutArea()]
+        bypassed = await self._run_zone_batch(faulted, "bypass")
+        if any(result != "ok" for result in bypassed.values()):
+            return {
+                "bypassed": bypassed,
+                "armed": False,
+                "unknown_area": unknown_area,
+            }
+        if instant:
+            await self._pydmp_panel.arm_areas(areas, instant=True)
+        else:
+            await self._pydmp_panel.arm_areas(areas)
+        return {"bypassed": bypassed, "armed": True, "unknown_area": unknown_area}
+
+    async def _run_zone_batch(self, zone_nums, command):
+        results = {}
+        for zone_num in zone_nums:
+            try:
+                zone = self._command_zone(zone_num)
+            except (ValueError, TypeError, DMPInvalidParameterError):
+                results[zone_num] = "Invalid zone number"
+                continue
+            try:
+                await getattr(zone, command)()
+            except Exception as err:
+                _LOGGER.warning("Zone %s %s failed: %s", zone_num, command, err)
+                results[zone_num] = str(err)
+            else:
+                results[zone_num] = "ok"
+        return results
+
+
+class S3IngestQueue(asyncio.Queue):
+    """Bounded queue of (S3 message, enqueue time) pairs that can shed its
+    oldest non-alarm entry"""
+
+    def drop_oldest(self, keep):
+        """Remove the oldest message not matched by keep, if any."""
+        for item in self._queue:
+            if not keep(item[0]):
+                self._queue.remove(item)
+                # Balance the unfinished count of the message we never get()
+                self.task_done()
+                return item[0]
+        return None
+
+
+class S3PanelWorker:
+    """Ingest queue, consumer task and counters for one panel account"""
+
+    __slots__ = ("account", "queue", "task", "stats", "latency_total", "latency_max")
+
+    def __init__(self, account, maxsize):
+        self.account = account
+        self.queue = S3IngestQueue(maxsize)
+        self.task = None
+        self.stats = {
+            "enqueued": 0,
+            "processed": 0,
+            "dropped": 0,
+            "high_water_mark": 0,
+        }
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def getStats(self):
+        stats = dict(self.stats)
+        processed = stats["processed"]
+        stats["depth"] = self.queue.qsize()
+        stats["mean_latency"] = (
+            round(self.latency_total / processed, 3) if processed else 0.0
+        )
+        stats["max_latency"] = round(self.latency_max, 3)
+        return stats
+
+
+class CallbackSet:
+    """Consumers the listener wakes together.
+
+    @callback functions are called inline in the event loop, without a
+    coroutine per wake-up. Coroutine functions are awaited after them and
+    are meant for the few consumers that need I/O.
+    """
+
+    __slots__ = ("callbacks", "coroutines")
+
+    def __init__(self):
+        self.callbacks = set()
+        self.coroutines = set()
+
+    def __contains__(self, callback):
+        return callback in self.callbacks or callback in self.coroutines
+
+    def __len__(self):
+        return len(self.callbacks) + len(self.coroutines)
+
+    def add(self, callback):
+        if asyncio.iscoroutinefunction(callback):
+            self.coroutines.add(callback)
+        else:
+            self.callbacks.add(callback)
+
+    def discard(self, callback):
+        self.callbacks.discard(callback)
+        self.coroutines.discard(callback)
+
+    async def run(self):
+        await CallbackSet.run_all((self,))
+
+    @staticmethod
+    async def run_all(callback_sets):
+        # Copy first so consumers can unsubscribe while being woken
+        callbacks = []
+        coroutines = []
+        for callback_set in callback_sets:
+            callbacks.extend(callback_set.callbacks)
+            if callback_set.coroutines:
+                coroutines.extend(callback_set.coroutines)
+        for callback in callbacks:
+            callback()
+        for coroutine in coroutines:
+            await coroutine()
+
 
 class DMPListener:
     def __init__(self, hass, config, pydmp_panel=None, status_server=None):
@@ -233,21 +683,108 @@ class DMPListener:
         self._domain = config
         self._home_area = config[CONF_HOME_AREA]
         self._away_area = config[CONF_AWAY_AREA]
+        # normalized lookup keys, so "1" and "001" name the same area
+        self._home_area_key = number_key(self._home_area)
         self._port = config.get(CONF_PANEL_LISTEN_PORT)
         self._pydmp_panel = pydmp_panel
         self._status_server = status_server
         self._panels = {}
+        # normalized account number -> account number as configured
+        self._account_index = {}
         self.statusAttributes = {}
-        # callbacks to call when an event gets posted in
-        self._callbacks = set()
-
-        # Register S3 event callback with status server
-        if status_server is not None:
-            status_server.register_callback(self._handle_s3_event)
+        # panel-wide callbacks (area, refresh button) woken on panel events
+        self._callbacks = CallbackSet()
+        # per-zone callbacks keyed by (account, zone number)
+        self._zone_callbacks = {}
+        # callbacks woken whenever a panel reports in (last contact)
+        self._contact_callbacks = CallbackSet()
+        # no-op state writes skipped by zone entities
+        self._suppressed_writes = 0
+        # coalesced entity updates: account -> [zone numbers, notify_panel]
+        self._batch_window = config.get(
+            CONF_EVENT_BATCH_WINDOW, DEFAULT_EVENT_BATCH_WINDOW
+        )
+        self._pending_updates = {}
+        self._flush_timer = None
+        # rate limit and deglitch of zone open/close wake-ups
+        self._zone_filter = DMPZoneFilter(
+            config.get(CONF_ZONE_RATE_LIMITS, DEFAULT_ZONE_RATE_LIMITS),
+            config.get(CONF_ZONE_DEGLITCH, DEFAULT_ZONE_DEGLITCH),
+            self._wake_filtered_zone,
+        )
+        # one bounded S3 ingest queue and consumer task per panel account,
+        # so events stay ordered per panel but panels never wait on each other
+        self._ingest_queue_size = config.get(
+            CONF_INGEST_QUEUE_SIZE, DEFAULT_INGEST_QUEUE_SIZE
+        )
+        self._ingest_overflow = config.get(
+            CONF_INGEST_OVERFLOW, DEFAULT_INGEST_OVERFLOW
+        )
+        self._ingest_stats = {
+            "enqueued": 0,
+            "processed": 0,
+            "dropped": 0,
+            "high_water_mark": 0,
+        }
+        self._workers = {}
+        self._consuming = False
+        # Zc/Zx/Zr are parsed directly unless the fast path is turned off
+        if config.get(CONF_FAST_S3_PARSER, True):
+            self._parse_s3_message = fast_parse_s3_message
+        else:
+            self._parse_s3_message = parse_s3_message
+        # last message fingerprint and arrival time per (account, zone, area)
+        self._duplicate_window = config.get(
+            CONF_DUPLICATE_WINDOW, DEFAULT_DUPLICATE_WINDOW
+        )
+        self._recent_messages = OrderedDict()
+        self._duplicates = 0
+        # single-flight status refresh and the trailing refresh queued behind it
+        self._status_task = None
+        self._status_waiter = None
+        self._status_trailing = None
+        self._coalesced_status_requests = 0
+        # adaptive reconciliation poll between the configured bounds
+        self._reconcile_min_interval = config.get(
+            CONF_RECONCILE_MIN_INTERVAL, DEFAULT_RECONCILE_MIN_INTERVAL
+        )
+        self._reconcile_max_interval = config.get(
+            CONF_RECONCILE_MAX_INTERVAL, DEFAULT_RECONCILE_MAX_INTERVAL
+        )
+        self._reconcile_interval = self._reconcile_min_interval
+        self._reconcile_timer = None
+        self._reconcile_task = None
+        self._reconcile_seen_events = 0
+        self._reconcile_stats = {
+            "polls": 0,
+            "suspended": 0,
+            "corrections": 0,
+            "last_corrections": 0,
+        }
+        # persisted state snapshot and how long startup took to get correct
+        self._store = None
+        self._setup_started = time.monotonic()
+        self._startup_stats = {
+            "restored_zones": 0,
+            "restore_seconds": None,
+            "refresh_seconds": None,
+            "refresh_corrections": None,
+        }
+        # panel connection supervised in the background
+        self._connection_state = CONNECTION_CONNECTING
+        self._stopped = False
+        self._connection_task = None
+        self._connection_failures = 0
+        # S3 event handlers keyed by (category, type_code)
+        self._s3_handlers = {}
+        self._register_default_s3_handlers()
 
     def __str__(self):
         return "DMP Listener on port %s" % (self._port)
 
+    def getHomeArea(self):
+        return self._home_area
+
     def register_callback(self, callback):
         """Allow callbacks to be registered for when dict entries change"""
         self._callbacks.add(callback)
@@ -256,16 +793,387 @@ class DMPListener:
         """Allow callbacks to be de-registered"""
         self._callbacks.discard(callback)
 
+    def register_contact_callback(self, callback):
+        """Register a callback woken once per flush of received events"""
+        self._contact_callbacks.add(callback)
+
+    def remove_contact_callback(self, callback):
+        self._contact_callbacks.discard(callback)
+
+    @staticmethod
+    def _zone_key(account, zone_number):
+        try:
+            return (number_key(account), int(zone_number))
+        except (ValueError, TypeError):
+            return None
+
+    def register_zone_callback(self, account, zone_number, callback):
+        """Register a callback woken only for events naming this zone"""
+        key = self._zone_key(account, zone_number)
+        if key is None:
+            _LOGGER.error("Invalid zone number for callback: %s", zone_number)
+            return
+        self._zone_callbacks.setdefault(key, CallbackSet()).add(callback)
+
+    def remove_zone_callback(self, account, zone_number, callback):
+        """De-register a zone callback"""
+        key = self._zone_key(account, zone_number)
+        callbacks = self._zone_callbacks.get(key)
+        if callbacks is None:
+            return
+        callbacks.discard(callback)
+        if not callbacks:
+            del self._zone_callbacks[key]
+
+    def record_suppressed_write(self):
+        self._suppressed_writes += 1
+
+    def getSuppressedWrites(self):
+        return self._suppressed_writes
+
     def addPanel(self, panelToAdd):
         self._panels[panelToAdd.getAccountNumber()] = panelToAdd
+        self._index_accounts()
+        self._zone_filter.setZones(
+            panelToAdd.getAccountNumber(), self._domain.get(CONF_ZONES, [])
+        )
+        # The shared status server routes this account's S3 events here
+        if self._status_server is not None:
+            self._status_server.attach(
+                panelToAdd.getAccountNumber(), self._enqueue_s3_event
+            )
 
     def getPanels(self):
         return self._panels
 
+    def _index_accounts(self):
+        self._account_index = {number_key(account): account for account in self._panels}
+
+    def _resolve_account(self, account):
+        """Return the configured account number for one sent by a panel"""
+        key = number_key(account)
+        found = self._account_index.get(key)
+        # Fallback: if account empty and single panel, use it
+        if found is None and key == "" and len(self._panels) == 1:
+            found = next(iter(self._panels))
+        return found
+
+    def start(self):
+        """Start the S3 event consumer tasks"""
+        self._consuming = True
+        for worker in self._workers.values():
+            self._start_worker(worker)
+        self._schedule_reconcile()
+
+    async def stop(self):
+        """Stop the S3 event consumer and drop coalesced updates"""
+        if self._status_server is not None:
+            for account in self._panels:
+                self._status_server.detach(account, self._enqueue_s3_event)
+        self._stopped = True
+        for panel in self._panels.values():
+            panel.close()
+        self._cancel_reconcile()
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            self._reconcile_task = None
+        if self._connection_task is not None:
+            self._connection_task.cancel()
+            try:
+                await self._connection_task
+            except asyncio.CancelledError:
+                pass
+            self._connection_task = None
+        self._consuming = False
+        for worker in self._workers.values():
+            if worker.task is None:
+                continue
+            worker.task.cancel()
+            try:
+                await worker.task
+            except asyncio.CancelledError:
+                pass
+            worker.task = None
+        if self._status_task is not None:
+            self._status_task.cancel()
+            self._status_task = None
+            # Callers sharing the refresh would otherwise wait forever
+            for waiter in (self._status_waiter, self._status_trailing):
+                if waiter is not None and not waiter.done():
+                    waiter.cancel()
+            self._status_waiter = None
+            self._status_trailing = None
+        self.cancel_pending_updates()
+        if self._store is not None:
+            await self._store.async_save(self._snapshot())
+
+    def startConnection(self, host, account, remote_key):
+        """Connect to the panel in the background and keep it connected"""
+        if self._connection_task is None:
+            self._connection_task = self._hass.async_create_background_task(
+                self._supervise_connection(host, account, remote_key),
+                "dmp_connection_supervisor",
+            )
+
+    def getConnectionState(self):
+        return self._connection_state
+
+    def isConnected(self):
+        return self._connection_state == CONNECTION_CONNECTED
+
+    async def _set_connection_state(self, state):
+        if state == self._connection_state:
+            return
+        _LOGGER.info(
+            "Panel connection %s -> %s" % (self._connection_state, state)
+        )
+        self._connection_state = state
+        # Command entities follow the link for their availability
+        await self.updateHASS()
+
+    def _reconnect_delay(self):
+        """Exponential backoff with jitter for the next connection attempt"""
+        delay = min(
+            RECONNECT_MAX_DELAY,
+            RECONNECT_BASE_DELAY * 2 ** (self._connection_failures - 1),
+        )
+        # Jitter only spreads out reconnects, it is not security-sensitive
+        return random.uniform(delay / 2, delay)  # nosec B311
+
+    def releaseConnection(self):
+        """Drop what is left of a dropped panel link.
+
+        pyDMP's disconnect() is a no-op once the link has dropped, which
+        leaves its one-connection-per-panel guard registered and the old
+        socket open. A new pyDMP panel (after a reload) would then be
+        refused until Home Assistant restarts.
+        """
+        panel = self._pydmp_panel
+        key = getattr(panel, "_active_key", None)
+        if key is not None:
+            pydmp_panel_module._ACTIVE_CONNECTIONS.discard(key)
+            panel._active_key = None
+        transport = getattr(panel, "_connection", None)
+        writer = getattr(transport, "_writer", None)
+        if writer is not None:
+            writer.close()
+            transport._reader = None
+            transport._writer = None
+            transport._connected = False
+        panel._connection = None
+
+    async def _supervise_connection(self, host, account, remote_key):
+        while True:
+            if self._pydmp_panel.is_connected:
+                await asyncio.sleep(CONNECTION_CHECK_INTERVAL)
+                continue
+
+            if self._connection_state == CONNECTION_CONNECTED:
+                _LOGGER.warning("Lost connection to panel, reconnecting")
+                await self._set_connection_state(CONNECTION_DEGRADED)
+            try:
+                await self._pydmp_panel.stop_keepalive()
+                self.releaseConnection()
+                await self._pydmp_panel.connect(host, account, remote_key)
+                await self._pydmp_panel.start_keepalive()
+            except Exception as err:
+                self._connection_failures += 1
+                if self._connection_failures >= RECONNECT_OFFLINE_AFTER:
+                    await self._set_connection_state(CONNECTION_OFFLINE)
+                delay = self._reconnect_delay()
+                _LOGGER.warning(
+                    "Panel connection attempt %s failed (%s), retrying in %.0fs"
+                    % (self._connection_failures, err, delay)
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self._connection_failures = 0
+            await self._set_connection_state(CONNECTION_CONNECTED)
+            # S3 messages may have been missed while the link was down
+            self.resetReconcileInterval()
+            try:
+                await self.updateStatus()
+            except Exception as err:
+                _LOGGER.warning("Status refresh after connect failed: %s", err)
+
+    async def restoreSnapshot(self, store):
+        """Restore the last persisted panel state and keep it up to date"""
+        self._store = store
+        data = await store.async_load() or {}
+        restored = 0
+        for account, snapshot in data.get("panels", {}).items():
+            panel = self._panels.get(account)
+            if panel is not None:
+                restored += panel.restoreSnapshot(snapshot)
+        self._startup_stats["restored_zones"] = restored
+        self._startup_stats["restore_seconds"] = round(
+            time.monotonic() - self._setup_started, 3
+        )
+        _LOGGER.debug("Restored %s zones from the state snapshot", restored)
+
+    def _snapshot(self):
+        return {
+            "panels": {
+                account: panel.getSnapshot() for account, panel in self._panels.items()
+            }
+        }
+
+    def _save_snapshot(self):
+        if self._store is not None:
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    def getStartupStats(self):
+        return dict(self._startup_stats)
+
+    def _schedule_reconcile(self, delay=None):
+        self._cancel_reconcile()
+        # A poll still finishing after stop() must not start the next one
+        if self._reconcile_max_interval <= 0 or self._stopped:
+            return
+        if delay is None:
+            delay = self._reconcile_interval
+        self._reconcile_timer = asyncio.get_running_loop().call_later(
+            delay, self._reconcile_timer_fired
+        )
+
+    def _cancel_reconcile(self):
+        if self._reconcile_timer is not None:
+            self._reconcile_timer.cancel()
+            self._reconcile_timer = None
+
+    def _reconcile_timer_fired(self):
+        self._reconcile_timer = None
+        self._reconcile_task = self._hass.async_create_task(self._reconcile())
+
+    def resetReconcileInterval(self):
+        """Poll soon after a reconnect, when S3 messages may have been missed"""
+        self._reconcile_interval = self._reconcile_min_interval
+        if self._reconcile_timer is not None:
+            self._schedule_reconcile()
+
+    async def _reconcile(self):
+        """Poll the panel and adapt the next poll interval.
+
+        Polls back off towards the maximum interval while S3 traffic keeps
+        flowing and the panel agrees with it. Any drift drops the interval
+        back to the minimum. Polls are deferred while a command is running,
+        since the panel is expected to be mid-transition, and while the
+        panel is not connected.
+        """
+        if self._connection_state != CONNECTION_CONNECTED or any(
+            panel.commandInFlight() for panel in self._panels.values()
+        ):
+            self._reconcile_stats["suspended"] += 1
+            self._schedule_reconcile(self._reconcile_min_interval)
+            return
+
+        seen_events = self._ingest_stats["processed"]
+        try:
+            diff = await self.updateStatus()
+        except Exception as err:
+            _LOGGER.warning("Status reconciliation failed: %s", err)
+            self._reconcile_interval = self._reconcile_min_interval
+        else:
+            corrections = len(diff["zones"]) + len(diff["areas"])
+            self._reconcile_stats["polls"] += 1
+            self._reconcile_stats["corrections"] += corrections
+            self._reconcile_stats["last_corrections"] = corrections
+            if corrections:
+                _LOGGER.debug("Reconciliation corrected drift: %s" % diff)
+                self._reconcile_interval = self._reconcile_min_interval
+            elif seen_events != self._reconcile_seen_events:
+                self._reconcile_interval = min(
+                    self._reconcile_interval * 2, self._reconcile_max_interval
+                )
+        self._reconcile_seen_events = seen_events
+        self._schedule_reconcile()
+
+    def getReconcileStats(self):
+        stats = dict(self._reconcile_stats)
+        stats["interval"] = self._reconcile_interval
+        return stats
+
+    @staticmethod
+    def _is_alarm_message(msg):
+        return getattr(msg, "definition", None) == DMPEventType.ZONE_ALARM.value
+
+    def _start_worker(self, worker):
+        if worker.task is None:
+            worker.task = self._hass.async_create_background_task(
+                self._consume_s3_events(worker),
+                "dmp_s3_consumer_%s" % worker.account,
+            )
+
+    def _get_worker(self, account):
+        worker = self._workers.get(account)
+        if worker is None:
+            worker = S3PanelWorker(account, self._ingest_queue_size)
+            self._workers[account] = worker
+            if self._consuming:
+                self._start_worker(worker)
+        return worker
+
+    async def _enqueue_s3_event(self, msg):
+        """Queue an S3 message from the status server for its panel's worker."""
+        account = self._resolve_account(msg.account)
+        if account is None:
+            account = msg.account.strip()
+        worker = self._get_worker(account)
+        queue = worker.queue
+        if (
+            queue.full()
+            and self._ingest_overflow == INGEST_OVERFLOW_DROP_OLDEST
+            and not self._is_alarm_message(msg)
+        ):
+            dropped = queue.drop_oldest(self._is_alarm_message)
+            if dropped is not None:
+                worker.stats["dropped"] += 1
+                self._ingest_stats["dropped"] += 1
+                _LOGGER.debug("S3 ingest queue full, dropped %s", dropped.definition)
+        # Blocks this panel's status connection (and its ACKs) while its
+        # queue is full; other panels keep flowing
+        await queue.put((msg, time.monotonic()))
+        worker.stats["enqueued"] += 1
+        self._ingest_stats["enqueued"] += 1
+        depth = queue.qsize()
+        if depth > worker.stats["high_water_mark"]:
+            worker.stats["high_water_mark"] = depth
+        if depth > self._ingest_stats["high_water_mark"]:
+            self._ingest_stats["high_water_mark"] = depth
+
+    async def _consume_s3_events(self, worker):
+        queue = worker.queue
+        while True:
+            msg, enqueued = await queue.get()
+            try:
+                await self._handle_s3_event(msg)
+            except Exception:
+                _LOGGER.exception("Error processing S3 event")
+            finally:
+                latency = time.monotonic() - enqueued
+                worker.latency_total += latency
+                worker.latency_max = max(worker.latency_max, latency)
+                worker.stats["processed"] += 1
+                self._ingest_stats["processed"] += 1
+                queue.task_done()
+            # A burst from one panel must not hold the loop from the others
+            await asyncio.sleep(0)
+
+    def getIngestStats(self):
+        stats = dict(self._ingest_stats)
+        stats["depth"] = sum(w.queue.qsize() for w in self._workers.values())
+        return stats
+
+    def getPanelIngestStats(self):
+        return {
+            account: worker.getStats() for account, worker in self._workers.items()
+        }
+
     async def _handle_s3_event(self, msg):
         """Handle incoming S3 event from DMPStatusServer."""
         try:
-            event = parse_s3_message(msg)
+            event = self._parse_s3_message(msg)
         except Exception:
             _LOGGER.warning(
                 "Failed to parse S3 message: %s",
@@ -273,16 +1181,17 @@ class DMPListener:
             )
             return
 
-        account = event.account.strip()
-
-        # Fallback: if account empty and single panel, use it
-        if not account and len(self._panels) == 1:
-            account = next(iter(self._panels))
+        account = self._resolve_account(event.account)
+        if account is None:
+            _LOGGER.warning(
+                "Unknown account number sending data - %s", event.account.strip()
+            )
+            return
+        panel = self._panels[account]
 
-        try:
-            panel = self._panels[account]
-        except KeyError:
-            _LOGGER.warning("Unknown account number sending data - %s", account)
+        if self._is_duplicate(account, event):
+            self._duplicates += 1
+            _LOGGER.debug("Dropping duplicate S3 message from %s", account)
             return
 
         _LOGGER.debug(
@@ -291,125 +1200,347 @@ class DMPListener:
 
         category = event.category
         zone_number = event.zone
-        type_code = event.type_code
 
         # Ensure pyDMP Zone object exists for zone events
         zone = None
         if zone_number:
             zone = panel.ensure_zone(zone_number)
 
-        if category == DMPEventType.WIRELESS_LOW_BATTERY:  # Zd
-            if zone:
-                zone.update_state("L")
-
-        elif category == DMPEventType.ZONE_BYPASS:  # Zx
-            if zone:
-                zone.update_state("X")
+        handlers = self._s3_handlers
+        handler = (
+            handlers.get((category, event.type_code))
+            or handlers.get((category, None))
+            or self._s3_unhandled
+        )
+        notify_panel = handler(panel, event, zone)
+        if notify_panel is None:
+            return
+        if zone is not None:
+            panel.noteZone(zone_number, zone.state, event.area)
+        # Area/panel entities only need waking when the area state can change
+        notify_panel = notify_panel or not zone_number
 
-        elif category in (
-            DMPEventType.ZONE_FAIL,  # Zf
-            DMPEventType.WIRELESS_ZONE_MISSING,  # Zh
-            DMPEventType.ZONE_TROUBLE,  # Zt
-            DMPEventType.ZONE_FAULT,  # Zw
-        ):
-            if zone:
-                if category == DMPEventType.WIRELESS_ZONE_MISSING:
-                    zone.update_state("M")
-                else:
-                    zone.update_state("S")
-
-        elif category in (
-            DMPEventType.ZONE_RESET,  # Zy
-            DMPEventType.ZONE_RESTORE,  # Zr
+        # update contact time on successful message
+        panel.updateContactTime(datetime.now(timezone.utc))
+        # Chattering open/close events only wake the zone when the filter
+        # lets them through; held back ones are delivered by its timers
+        if (
+            category == DMPEventType.REAL_TIME_STATUS
+            and event.type_code in ZONE_TRANSITION_TYPE_CODES
+            and zone is not None
+            and self._zone_filter.enabled
+            and not self._zone_filter.allow(account, zone_number, zone.state)
         ):
-            if zone:
-                zone.update_state("N")
-            panel.clear_alarm(zone_number)
+            zone_number = None
+        self._queue_update(account, zone_number, notify_panel)
+        # Alarms flush straight away so they never wait on the batch window
+        if self._batch_window <= 0 or category == DMPEventType.ZONE_ALARM:
+            await self.flushUpdates()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self._batch_window, self._flush_timer_fired
+            )
 
-        elif category in (
-            DMPEventType.ZONE_ALARM,  # Za
-            DMPEventType.ZONE_FORCE_ARM,  # Zb
+    def _is_duplicate(self, account, event):
+        """Return True for a retransmit of the last message for a zone/area.
+
+        Only the most recent message per zone (or area, for zone-less
+        events) is remembered, so a repeated transition such as
+        open/close/open is never mistaken for a retransmit.
+        """
+        if self._duplicate_window <= 0:
+            return False
+        now = time.monotonic()
+        key = (
+            account,
+            number_key(event.zone),
+            None if event.zone else number_key(event.area),
+        )
+        fingerprint = (event.category, event.type_code, event.raw)
+        recent = self._recent_messages
+        last = recent.get(key)
+        if (
+            last is not None
+            and last[0] == fingerprint
+            and now - last[1] <= self._duplicate_window
         ):
-            panel.set_alarm(zone_number)
-            areaObj = {
-                "areaName": event.area_name or "",
-                "areaState": AlarmControlPanelState.TRIGGERED,
-            }
-            panel.updateArea(areaObj)
-
-        elif category == DMPEventType.ARMING_STATUS:  # Zq
-            area_number = event.area
-            area_name = event.area_name or ""
-            if type_code == "OP":  # Disarm
-                areaState = AlarmControlPanelState.DISARMED
-                # do a manual status query - bypassed zones are reset but no message for it
-                self._hass.async_create_task(self.updateStatus())
-            elif type_code == "CL":  # Arm
-                if area_number and area_number.strip().lstrip(
-                    "0"
-                ) == self._home_area.lstrip("0"):
-                    # Make sure we're not already armed away
-                    if (
-                        panel.getArea()["areaState"]
-                        != AlarmControlPanelState.ARMED_AWAY
-                    ):
-                        areaState = AlarmControlPanelState.ARMED_HOME
-                    else:
-                        areaState = AlarmControlPanelState.ARMED_AWAY
-                else:
-                    areaState = AlarmControlPanelState.ARMED_AWAY
-            else:
-                _LOGGER.warning("Unknown arming type_code: %s, ignoring", type_code)
-                return
-            areaObj = {"areaName": area_name, "areaState": areaState}
-            _LOGGER.debug("Updated area: %s" % areaObj)
-            panel.updateArea(areaObj)
-
-        elif category == DMPEventType.REAL_TIME_STATUS:  # Zc
+            return True
+        recent[key] = (fingerprint, now)
+        recent.move_to_end(key)
+        if len(recent) > DUPLICATE_CACHE_SIZE:
+            recent.popitem(last=False)
+        return False
+
+    def getDuplicateCount(self):
+        return self._duplicates
+
+    def register_s3_handler(self, category, handler, type_code=None):
+        """Register a handler for an S3 event category.
+
+        Handlers are called as handler(panel, event, zone) and return True
+        to also wake panel-wide entities, False to wake only the event's
+        zone, or None to discard the event. A handler registered with a
+        type_code takes precedence over the category-wide handler.
+        """
+        self._s3_handlers[(category, type_code)] = handler
+
+    def _register_default_s3_handlers(self):
+        register = self.register_s3_handler
+        register(DMPEventType.WIRELESS_LOW_BATTERY, self._s3_zone_state("L"))  # Zd
+        register(DMPEventType.ZONE_BYPASS, self._s3_zone_state("X"))  # Zx
+        register(DMPEventType.ZONE_FAIL, self._s3_zone_state("S"))  # Zf
+        register(DMPEventType.WIRELESS_ZONE_MISSING, self._s3_zone_state("M"))  # Zh
+        register(DMPEventType.ZONE_TROUBLE, self._s3_zone_state("S"))  # Zt
+        register(DMPEventType.ZONE_FAULT, self._s3_zone_state("S"))  # Zw
+        register(DMPEventType.ZONE_RESET, self._s3_zone_restore)  # Zy
+        register(DMPEventType.ZONE_RESTORE, self._s3_zone_restore)  # Zr
+        register(DMPEventType.ZONE_ALARM, self._s3_zone_alarm)  # Za
+        register(DMPEventType.ZONE_FORCE_ARM, self._s3_zone_alarm)  # Zb
+        register(DMPEventType.ARMING_STATUS, self._s3_disarm, "OP")  # Zq
+        register(DMPEventType.ARMING_STATUS, self._s3_arm, "CL")
+        register(DMPEventType.ARMING_STATUS, self._s3_arming_unknown)
+        register(DMPEventType.REAL_TIME_STATUS, self._s3_zone_state("N"), "DC")  # Zc
+        for type_code in ("DO", "HO", "FO"):
+            register(
+                DMPEventType.REAL_TIME_STATUS, self._s3_zone_state("O"), type_code
+            )
+        register(DMPEventType.REAL_TIME_STATUS, self._s3_ignored)
+        # Ignored
+        register(DMPEventType.SYSTEM_MESSAGE, self._s3_ignored)  # Zs
+        register(DMPEventType.DOOR_ACCESS, self._s3_ignored)  # Zj
+        register(DMPEventType.SCHEDULES, self._s3_ignored)  # Zl
+
+    @staticmethod
+    def _s3_zone_state(state):
+        def handler(panel, event, zone):
             if zone:
-                if type_code in ("DO", "HO", "FO"):
-                    zone.update_state("O")
-                elif type_code == "DC":
-                    zone.update_state("N")
-
-        elif category in (
-            DMPEventType.SYSTEM_MESSAGE,  # Zs
-            DMPEventType.DOOR_ACCESS,  # Zj
-            DMPEventType.SCHEDULES,  # Zl
-        ):
-            pass  # Ignored
+                zone.update_state(state)
+            return False
+
+        return handler
+
+    @staticmethod
+    def _s3_zone_restore(panel, event, zone):
+        if zone:
+            zone.update_state("N")
+        panel.clear_alarm(event.zone)
+        return False
+
+    @staticmethod
+    def _s3_zone_alarm(panel, event, zone):
+        panel.set_alarm(event.zone)
+        areaObj = {
+            "areaName": event.area_name or "",
+            "areaState": AlarmControlPanelState.TRIGGERED,
+        }
+        panel.updateArea(areaObj)
+        return True
+
+    def _s3_disarm(self, panel, event, zone):
+        areaObj = {
+            "areaName": event.area_name or "",
+            "areaState": AlarmControlPanelState.DISARMED,
+        }
+        _LOGGER.debug("Updated area: %s" % areaObj)
+        panel.updateArea(areaObj)
+        # do a manual status query - bypassed zones are reset but no message for it
+        self._hass.async_create_task(self._refreshAfterDisarm())
+        return True
+
+    async def _refreshAfterDisarm(self):
+        diff = await self.updateStatus()
+        if diff["zones"]:
+            _LOGGER.debug("Zones changed after disarm: %s" % diff["zones"])
+
+    def _s3_arm(self, panel, event, zone):
+        area_number = event.area
+        if area_number and number_key(area_number) == self._home_area_key:
+            # Make sure we're not already armed away
+            if panel.getArea()["areaState"] != AlarmControlPanelState.ARMED_AWAY:
+                areaState = AlarmControlPanelState.ARMED_HOME
+            else:
+                areaState = AlarmControlPanelState.ARMED_AWAY
         else:
-            _LOGGER.warning("%s: Unhandled event category - %s", account, category)
+            areaState = AlarmControlPanelState.ARMED_AWAY
+        areaObj = {"areaName": event.area_name or "", "areaState": areaState}
+        _LOGGER.debug("Updated area: %s" % areaObj)
+        panel.updateArea(areaObj)
+        return True
+
+    @staticmethod
+    def _s3_arming_unknown(panel, event, zone):
+        _LOGGER.warning("Unknown arming type_code: %s, ignoring", event.type_code)
+        return None
 
-        # update contact time on successful message
-        panel.updateContactTime(datetime.now(timezone.utc))
-        await self.updateHASS()
+    @staticmethod
+    def _s3_ignored(panel, event, zone):
+        return False
+
+    @staticmethod
+    def _s3_unhandled(panel, event, zone):
+        _LOGGER.warning(
+            "%s: Unhandled event category - %s", event.account.strip(), event.category
+        )
+        return False
+
+    def _queue_update(self, account, zone_number, notify_panel):
+        pending = self._pending_updates.setdefault(account, [set(), False])
+        if zone_number:
+            pending[0].add(zone_number)
+        pending[1] = pending[1] or notify_panel
+
+    def _flush_timer_fired(self):
+        self._flush_timer = None
+        self._hass.async_create_task(self.flushUpdates())
+
+    def _wake_filtered_zone(self, account, zone_number):
+        """Wake a zone the zone filter held back, through the batch window"""
+        self._queue_update(account, zone_number, False)
+        if self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                max(self._batch_window, 0), self._flush_timer_fired
+            )
+
+    def cancel_pending_updates(self):
+        """Drop coalesced updates and stop the batch and zone filter timers"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._pending_updates = {}
+        self._zone_filter.cancel()
+
+    def getZoneFilterStats(self, account=None, zone_number=None):
+        """Return the open/close transitions suppressed by the zone filter.
+
+        With an account and zone number only that zone's counts are returned.
+        """
+        if zone_number is not None:
+            return self._zone_filter.getZoneStats(account, zone_number)
+        return self._zone_filter.getStats()
+
+    async def flushUpdates(self):
+        """Wake the entities for all events coalesced since the last flush"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self._pending_updates = self._pending_updates, {}
+        for account, (zone_numbers, notify_panel) in pending.items():
+            await self.updateHASS(account, zone_numbers, notify_panel)
+        if pending:
+            self._save_snapshot()
+            await self._contact_callbacks.run()
 
     async def updateStatus(self):
-        for panelName, panel in self._panels.items():
-            await self._pydmp_panel.update_status()
-            # Read zone states from pyDMP
-            zoneStatus = {}
-            for zone_num, zone_obj in self._pydmp_panel._zones.items():
-                zone_num_str = f"{zone_num:03d}"
-                status_str = ZONE_STATUS_MAP.get(zone_obj.state, zone_obj.state)
-                zoneStatus[zone_num_str] = {
-                    "name": zone_obj.name,
-                    "status": status_str,
-                }
+        """Refresh zone and area status from the panel.
+
+        Only one refresh runs at a time. Callers arriving while a refresh
+        is in flight share a single trailing refresh that starts when it
+        finishes, so a burst of requests costs at most two panel queries.
+
+        Returns the zones and areas whose status changed, as
+        {"zones": {number: (old, new)}, "areas": {number: (old, new)}}.
+        """
+        loop = asyncio.get_running_loop()
+        if self._status_task is None:
+            waiter = loop.create_future()
+            self._status_task = loop.create_task(self._run_status_refreshes(waiter))
+        else:
+            self._coalesced_status_requests += 1
+            if self._status_trailing is None:
+                self._status_trailing = loop.create_future()
+            waiter = self._status_trailing
+        return await asyncio.shield(waiter)
+
+    async def _run_status_refreshes(self, waiter):
+        while waiter is not None:
+            self._status_waiter = waiter
+            try:
+                diff = await self._refreshStatus()
+            except Exception as err:
+                waiter.set_exception(err)
+            else:
+                waiter.set_result(diff)
+            waiter, self._status_trailing = self._status_trailing, None
+        self._status_task = None
+        self._status_waiter = None
+
+    def getCoalescedStatusRequests(self):
+        return self._coalesced_status_requests
+
+    def _readStatus(self):
+        # Read zone states from pyDMP
+        zoneStatus = {}
+        for zone_num, zone_obj in self._pydmp_panel._zones.items():
+            zone_num_str = f"{zone_num:03d}"
+            status_str = ZONE_STATUS_MAP.get(zone_obj.state, zone_obj.state)
+            zoneStatus[zone_num_str] = {
+                "name": zone_obj.name,
+                "status": status_str,
+            }
 
-            # Read area states from pyDMP
-            areaStatus = {}
-            for area_num, area_obj in self._pydmp_panel._areas.items():
-                area_num_str = f"{area_num:02d}"
-                area_status_str = AREA_STATUS_MAP.get(area_obj.state, area_obj.state)
-                areaStatus[area_num_str] = {
-                    "name": area_obj.name,
-                    "status": area_status_str,
-                }
+        # Read area states from pyDMP
+        areaStatus = {}
+        for area_num, area_obj in self._pydmp_panel._areas.items():
+            area_num_str = f"{area_num:02d}"
+            area_status_str = AREA_STATUS_MAP.get(area_obj.state, area_obj.state)
+            areaStatus[area_num_str] = {
+                "name": area_obj.name,
+                "status": area_status_str,
+            }
+        return zoneStatus, areaStatus
 
+    async def _refreshStatus(self):
+        # S3 events update the pyDMP zones in place, so the state read just
+        # before the query is what the entities are currently showing
+        zoneBefore, areaBefore = self._readStatus()
+        for panelName, panel in self._panels.items():
+            await panel.update_status()
+        zoneStatus, areaStatus = self._readStatus()
+
+        diff = {
+            "zones": self._diffStatus(zoneBefore, zoneStatus),
+            "areas": self._diffStatus(areaBefore, areaStatus),
+        }
+        if self._startup_stats["refresh_seconds"] is None:
+            # Time to correct state without a snapshot, and how much of the
+            # restored snapshot the first refresh had to correct
+            self._startup_stats["refresh_seconds"] = round(
+                time.monotonic() - self._setup_started, 3
+            )
+            self._startup_stats["refresh_corrections"] = len(diff["zones"]) + len(
+                diff["areas"]
+            )
+        # Always rebuilt, so names the panel filled in and the refresh time
+        # show up even when no status changed
         self.setStatusAttributes(areaStatus, zoneStatus)
-        await self.updateHASS()
+        if not diff["zones"] and not diff["areas"]:
+            _LOGGER.debug("Status refresh found no changes")
+            return diff
+
+        self._save_snapshot()
+        for number in diff["zones"]:
+            state = self._pydmp_panel._zones[int(number)].state
+            for panel in self._panels.values():
+                panel.noteZone(number, state)
+        # Panel-wide entities show area state and the zone status list, so
+        # they are woken on any change; zone entities only when theirs changed
+        for account in self._panels:
+            await self.updateHASS(account, diff["zones"], True)
+        return diff
+
+    @staticmethod
+    def _diffStatus(previous, current):
+        """Return {number: (old status, new status)} for changed entries.
+
+        Only the status is compared; a new name alone is not a change.
+        """
+        changes = {}
+        for number, entry in current.items():
+            old = previous.get(number)
+            old_status = old["status"] if old is not None else None
+            if old is None or old_status != entry["status"]:
+                changes[number] = (old_status, entry["status"])
+        return changes
 
     def setStatusAttributes(self, areaStatus, zoneStatus):
         attr = {}
@@ -429,7 +1560,21 @@ class DMPListener:
     def getStatusAttributes(self):
         return self.statusAttributes
 
-    async def updateHASS(self):
-        # call to update the hass object
-        for callback in self._callbacks:
-            await callback()
+    async def updateHASS(self, account=None, zone_numbers=(), notify_panel=True):
+        """Wake subscribed entities.
+
+        With no account every callback is woken. Otherwise only the
+        callbacks of the named zones are woken, plus the panel-wide
+        callbacks when notify_panel is set.
+        """
+        if account is None:
+            woken = [self._callbacks, *self._zone_callbacks.values()]
+        else:
+            woken = [self._callbacks] if notify_panel else []
+            for zone_number in zone_numbers:
+                zone_callbacks = self._zone_callbacks.get(
+                    self._zone_key(account, zone_number)
+                )
+                if zone_callbacks:
+                    woken.append(zone_callbacks)
+        await CallbackSet.run_all(woken)
@@ -2,6 +2,7 @@
 
 import logging
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 
 from homeassistant.components.alarm_control_panel import (
@@ -11,7 +12,6 @@ from homeassistant.components.alarm_control_panel import (
 )
 from .const import (
     DOMAIN,
-    LISTENER,
     CONF_PANEL_NAME,
     CONF_PANEL_ACCOUNT_NUMBER,
     CONF_HOME_AREA,
@@ -31,7 +31,7 @@ async def async_setup_entry(
     hass.data.setdefault(DOMAIN, {})
     config = hass.data[DOMAIN][entry.entry_id]
     _LOGGER.debug("Alarm control panel config: %s" % config)
-    listener = hass.data[DOMAIN][LISTENER]
+    listener = entry.runtime_data.listener
     area = DMPArea(listener, config)
     areas = []
     areas.append(area)
@@ -48,7 +48,13 @@ class DMPArea(AlarmControlPanelEntity):
         self._panel = listener.getPanels()[str(self._account_number)]
         self._home_zone = config.get(CONF_HOME_AREA) or self._number[1:]
         self._away_zone = config.get(CONF_AWAY_AREA) or self._number[1:]
-        areaObj = {"areaName": self._name, "areaState": AlarmControlPanelState.DISARMED}
+        # Keep an area state restored from the snapshot, default to disarmed
+        area = self._panel.getArea()
+        if isinstance(area, dict) and area.get("areaState"):
+            areaState = area["areaState"]
+        else:
+            areaState = AlarmControlPanelState.DISARMED
+        areaObj = {"areaName": self._name, "areaState": areaState}
         self._panel.updateArea(areaObj)
 
     async def async_added_to_hass(self):
@@ -59,9 +65,15 @@ class DMPArea(AlarmControlPanelEntity):
         _LOGGER.debug("Removing DMPArea Callback")
         self._listener.remove_callback(self.process_area_callback)
 
-    async def process_area_callback(self):
+    @callback
+    def process_area_callback(self):
         self.async_write_ha_state()
 
+    @property
+    def available(self):
+        """Commands need the panel connection"""
+        return self._listener.isConnected()
+
     @property
     def name(self):
         """Return the name of the device."""
@@ -115,17 +127,17 @@ class DMPArea(AlarmControlPanelEntity):
 
     async def async_alarm_disarm(self, code=None):
         """Send disarm command."""
-        await self._panel._pydmp_panel.disarm_areas([1, 2, 3])
+        await self._panel.disarm_areas([1, 2, 3])
 
     async def async_alarm_arm_away(self, code=None):
         """Send arm away command."""
-        await self._panel._pydmp_panel.arm_areas([1, 2, 3])
+        await self._panel.arm_areas([1, 2, 3])
 
     async def async_alarm_arm_home(self, code=None):
         """Send arm home command."""
-        await self._panel._pydmp_panel.arm_areas([int(self._home_zone)])
+        await self._panel.arm_areas([int(self._home_zone)])
 
     # arm night is just an arm home with no exit/entry delay
     async def async_alarm_arm_night(self, code=None):
         """Send arm night command."""
-        await self._panel._pydmp_panel.arm_areas([int(self._home_zone)], instant=True)
+        await self._panel.arm_areas([int(self._home_zone)], instant=True)
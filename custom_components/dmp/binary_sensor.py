@@ -1,20 +1,26 @@
 """Platform for DMP Alarm Panel integration"""
 
+from dataclasses import dataclass
 import logging
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.components.binary_sensor import (
+    DOMAIN as BINARY_SENSOR_DOMAIN,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.helpers import entity_registry as er
+from .entity import DMPZoneEntity, DMPZoneEntityDescription, create_zone_entities
 from .const import (
     DOMAIN,
-    LISTENER,
-    CONF_PANEL_ACCOUNT_NUMBER,
-    CONF_ZONE_NAME,
-    CONF_ZONE_NUMBER,
-    CONF_ZONE_CLASS,
+    CONF_COMPACT_ZONES,
     CONF_ZONES,
+    DEFAULT_COMPACT_ZONES,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Zone kinds that can trip an alarm
+ALARM_KINDS = frozenset(("door", "window", "glassbreak", "motion"))
+
 
 async def async_setup_entry(
     hass,
@@ -26,475 +32,99 @@ async def async_setup_entry(
     hass.data.setdefault(DOMAIN, {})
     config = hass.data[DOMAIN][config_entry.entry_id]
     _LOGGER.debug("Binary sensor config: %s" % config)
-    # Add all zones to trouble zones
-    troubleZones = [
-        DMPZoneTrouble(hass, config_entry, zone) for zone in config[CONF_ZONES]
-    ]
-    openCloseZones = []
-    for zone in config[CONF_ZONES]:
-        if (
-            "window" in zone[CONF_ZONE_CLASS]
-            or "door" in zone[CONF_ZONE_CLASS]
-            or "motion" in zone[CONF_ZONE_CLASS]
-            or "default" in zone[CONF_ZONE_CLASS]
+    if config.get(CONF_COMPACT_ZONES, DEFAULT_COMPACT_ZONES):
+        # Compact mode serves these through get_zone_states; drop any left
+        # over from before it was turned on
+        entity_registry = er.async_get(hass)
+        for entity in er.async_entries_for_config_entry(
+            entity_registry, config_entry.entry_id
         ):
-            openCloseZones.append(DMPZoneOpenClose(hass, config_entry, zone))
-    # Only battery zones
-    batteryZones = []
-    for zone in config[CONF_ZONES]:
-        if "battery" in zone[CONF_ZONE_CLASS]:
-            batteryZones.append(DMPZoneBattery(hass, config_entry, zone))
-    # Bypass and Alarm Zones should be the same
-    bypassZones = []
-    alarmZones = []
-    for zone in config[CONF_ZONES]:
-        if (
-            "window" in zone[CONF_ZONE_CLASS]
-            or "door" in zone[CONF_ZONE_CLASS]
-            or "glassbreak" in zone[CONF_ZONE_CLASS]
-            or "motion" in zone[CONF_ZONE_CLASS]
-        ):
-            alarmZones.append(DMPZoneAlarm(hass, config_entry, zone))
-            bypassZones.append(DMPZoneBypass(hass, config_entry, zone))
+            if entity.domain == BINARY_SENSOR_DOMAIN:
+                entity_registry.async_remove(entity.entity_id)
+        return
+    zoneSensors = create_zone_entities(
+        hass, config_entry, config[CONF_ZONES], ZONE_BINARY_SENSORS
+    )
     # Don't update before add or you have a race condition with the
     # status zone.
-    async_add_entities(openCloseZones, update_before_add=False)
-    async_add_entities(batteryZones, update_before_add=False)
-    async_add_entities(troubleZones, update_before_add=False)
-    async_add_entities(alarmZones, update_before_add=False)
-
-
-class DMPZoneOpenClose(BinarySensorEntity):
-    def __init__(self, hass, config_entry, entity_config):
-        self._hass = hass
-        self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        _LOGGER.debug("Config is: %s" % entity_config)
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._name = entity_config.get(CONF_ZONE_NAME)
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        if "door" in entity_config.get(CONF_ZONE_CLASS):
-            self._device_class = "door"
-        elif "window" in entity_config.get(CONF_ZONE_CLASS):
-            self._device_class = "window"
-        elif "motion" in entity_config.get(CONF_ZONE_CLASS):
-            self._device_class = "motion"
-        else:
-            self._device_class = "sensors"
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._zone = self._panel.ensure_zone(self._number)
-        self._state = False
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneOpenClose Callback")
-        self._listener.register_callback(self.process_zone_callback)
-
-    async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneOpenClose Callback")
-        self._listener.remove_callback(self.process_zone_callback)
-
-    async def process_zone_callback(self):
-        self._state = self._zone.is_open
-        self.async_write_ha_state()
-
-    @property
-    def device_name(self):
-        """Return the name of the device."""
-        return self._device_name
-
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return self._name
-
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
-
-    @property
-    def is_on(self):
-        """Return the state of the device."""
-        return self._state
-
-    @property
-    def icon(self):
-        """Icon to show for status"""
-        state = self.is_on
-        device_class = self._device_class
-        if state:
-            if device_class == "window":
-                return "mdi:window-open"
-            elif device_class == "motion":
-                return "mdi:motion-sensor"
-            else:
-                return "mdi:door-open"
-        else:
-            if device_class == "window":
-                return "mdi:window-closed"
-            elif device_class == "motion":
-                return "mdi:motion-sensor-off"
-            else:
-                return "mdi:door-closed"
-
-    @property
-    def device_class(self):
-        """Return the class of the device"""
-        return self._device_class
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {"last_contact": self._panel.getContactTime()}
-
-    @property
-    def unique_id(self):
-        """Return unique ID"""
-        return "dmp-%s-zone-%s-openclose" % (self._accountNum, self._number)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            name=self.name,
-            manufacturer="Digital Monitoring Products",
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
-        )
-
-
-class DMPZoneBattery(BinarySensorEntity):
-    def __init__(self, hass, config_entry, entity_config):
-        self._hass = hass
-        self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._name = "%s Battery" % entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        self._device_class = "battery"
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._zone = self._panel.ensure_zone(self._number)
-        self._state = False
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneBattery Callback")
-        self._listener.register_callback(self.process_zone_callback)
-
-    async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneBattery Callback")
-        self._listener.remove_callback(self.process_zone_callback)
-
-    async def process_zone_callback(self):
-        self._state = self._zone.state == "L"
-        self.async_write_ha_state()
-
-    @property
-    def device_name(self):
-        """Return the name of the device."""
-        return self._device_name
-
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return self._name
-
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
-
-    @property
-    def is_on(self):
-        """Return the state of the device."""
-        return self._state
-
-    @property
-    def icon(self):
-        """Icon to show for status"""
-        state = self.is_on
-        if state:
-            return "mdi:battery-alert-variant-outline"
-        else:
-            return "mdi:battery"
-
-    @property
-    def device_class(self):
-        """Return the class of the device"""
-        return self._device_class
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_contact": self._panel.getContactTime(),
-        }
-
-    @property
-    def unique_id(self):
-        """Return unique ID"""
-        return "dmp-%s-zone-%s-battery" % (self._accountNum, self._number)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            name=self.name,
-            manufacturer="Digital Monitoring Products",
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
-        )
-
-
-class DMPZoneTrouble(BinarySensorEntity):
-    def __init__(self, hass, config_entry, entity_config):
-        self._hass = hass
-        self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._name = "%s Trouble" % entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        self._device_class = "problem"
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._zone = self._panel.ensure_zone(self._number)
-        self._state = False
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneTrouble Callback")
-        self._listener.register_callback(self.process_zone_callback)
-
-    async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneTrouble Callback")
-        self._listener.remove_callback(self.process_zone_callback)
-
-    async def process_zone_callback(self):
-        self._state = self._zone.has_fault
-        self.async_write_ha_state()
-
-    @property
-    def device_name(self):
-        """Return the name of the device."""
-        return self._device_name
+    async_add_entities(zoneSensors, update_before_add=False)
 
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return self._name
-
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
-
-    @property
-    def is_on(self):
-        """Return the state of the device."""
-        return self._state
-
-    @property
-    def icon(self):
-        """Icon to show for status"""
-        state = self.is_on
-        if state:
-            return "mdi:alert-outline"
-        else:
-            return "mdi:check"
-
-    @property
-    def device_class(self):
-        """Return the class of the device"""
-        return self._device_class
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_contact": self._panel.getContactTime(),
-        }
-
-    @property
-    def unique_id(self):
-        """Return unique ID"""
-        return "dmp-%s-zone-%s-trouble" % (self._accountNum, self._number)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            name=self.name,
-            manufacturer="Digital Monitoring Products",
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
-        )
-
-
-class DMPZoneBypass(BinarySensorEntity):
-    def __init__(self, hass, config_entry, entity_config):
-        self._hass = hass
-        self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._name = "%s Bypass" % entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        self._device_class = "problem"
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._zone = self._panel.ensure_zone(self._number)
-        self._state = False
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneBypass Callback")
-        self._listener.register_callback(self.process_zone_callback)
-
-    async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneBypass Callback")
-        self._listener.remove_callback(self.process_zone_callback)
-
-    async def process_zone_callback(self):
-        self._state = self._zone.is_bypassed
-        self.async_write_ha_state()
-
-    @property
-    def device_name(self):
-        """Return the name of the device."""
-        return self._device_name
-
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return self._name
-
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
-
-    @property
-    def is_on(self):
-        """Return the state of the device."""
-        return self._state
-
-    @property
-    def icon(self):
-        """Icon to show for status"""
-        state = self.is_on
-        if state:
-            return "mdi:alert-outline"
-        else:
-            return "mdi:check"
-
-    @property
-    def device_class(self):
-        """Return the class of the device"""
-        return self._device_class
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_contact": self._panel.getContactTime(),
-        }
-
-    @property
-    def unique_id(self):
-        """Return unique ID"""
-        return "dmp-%s-zone-%s-bypass" % (self._accountNum, self._number)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            name=self.name,
-            manufacturer="Digital Monitoring Products",
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
-        )
-
-
-class DMPZoneAlarm(BinarySensorEntity):
-    def __init__(self, hass, config_entry, entity_config):
-        self._hass = hass
-        self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._name = "%s Alarm" % entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        self._device_class = "problem"
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._state = False
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneAlarm Callback")
-        self._listener.register_callback(self.process_zone_callback)
 
-    async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneAlarm Callback")
-        self._listener.remove_callback(self.process_zone_callback)
-
-    async def process_zone_callback(self):
-        self._state = self._panel.get_alarm(self._number)
-        self.async_write_ha_state()
-
-    @property
-    def device_name(self):
-        """Return the name of the device."""
-        return self._device_name
-
-    @property
-    def name(self):
-        """Return the name of the device."""
-        return self._name
+@dataclass(frozen=True, kw_only=True)
+class DMPZoneBinarySensorEntityDescription(
+    DMPZoneEntityDescription, BinarySensorEntityDescription
+):
+    """Describes a DMP zone binary sensor."""
 
-    @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
 
+class DMPZoneBinarySensor(DMPZoneEntity, BinarySensorEntity):
     @property
     def is_on(self):
         """Return the state of the device."""
         return self._state
 
-    @property
-    def icon(self):
-        """Icon to show for status"""
-        state = self.is_on
-        if state:
-            return "mdi:alarm-bell"
-        else:
-            return "mdi:check"
 
-    @property
-    def device_class(self):
-        """Return the class of the device"""
-        return self._device_class
-
-    @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_contact": self._panel.getContactTime(),
-        }
-
-    @property
-    def unique_id(self):
-        """Return unique ID"""
-        return "dmp-%s-zone-%s-alarm" % (self._accountNum, self._number)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            name=self.device_name,
-            manufacturer="Digital Monitoring Products",
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
-        )
+def _open_close(kind, device_class, icon_on, icon_off):
+    return DMPZoneBinarySensorEntityDescription(
+        key="openclose",
+        device_class=device_class,
+        value_fn=lambda entity: entity._zone.is_open,
+        icon_on=icon_on,
+        icon_off=icon_off,
+        zone_kinds=frozenset((kind,)),
+    )
+
+
+class DMPZoneOpenClose(DMPZoneBinarySensor):
+    # The last entry also covers zones of an unknown kind
+    zone_descriptions = (
+        _open_close("door", "door", "mdi:door-open", "mdi:door-closed"),
+        _open_close("window", "window", "mdi:window-open", "mdi:window-closed"),
+        _open_close("motion", "motion", "mdi:motion-sensor", "mdi:motion-sensor-off"),
+        _open_close("default", "sensors", "mdi:door-open", "mdi:door-closed"),
+    )
+
+
+class DMPZoneBattery(DMPZoneBinarySensor):
+    zone_descriptions = (
+        DMPZoneBinarySensorEntityDescription(
+            key="battery",
+            name_suffix="Battery",
+            device_class="battery",
+            value_fn=lambda entity: entity._zone.state == "L",
+            icon_on="mdi:battery-alert-variant-outline",
+            icon_off="mdi:battery",
+            battery_only=True,
+        ),
+    )
+
+
+class DMPZoneTrouble(DMPZoneBinarySensor):
+    zone_descriptions = (
+        DMPZoneBinarySensorEntityDescription(
+            key="trouble",
+            name_suffix="Trouble",
+            device_class="problem",
+            value_fn=lambda entity: entity._zone.has_fault,
+            icon_on="mdi:alert-outline",
+            icon_off="mdi:check",
+        ),
+    )
+
+
+class DMPZoneAlarm(DMPZoneBinarySensor):
+    zone_descriptions = (
+        DMPZoneBinarySensorEntityDescription(
+            key="alarm",
+            name_suffix="Alarm",
+            device_class="problem",
+            value_fn=lambda entity: entity._panel.get_alarm(entity._number),
+            icon_on="mdi:alarm-bell",
+            icon_off="mdi:check",
+            zone_kinds=ALARM_KINDS,
+        ),
+    )
+
+
+# Entity types created for each zone, in the order they are added
+ZONE_BINARY_SENSORS = (DMPZoneOpenClose, DMPZoneBattery, DMPZoneTrouble, DMPZoneAlarm)
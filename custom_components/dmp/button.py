@@ -1,10 +1,11 @@
 import logging
 
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
 
 from homeassistant.components.button import ButtonEntity
 
-from .const import (DOMAIN, LISTENER, CONF_PANEL_NAME,
+from .const import (DOMAIN, CONF_PANEL_NAME,
                     CONF_PANEL_ACCOUNT_NUMBER)
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,7 +24,7 @@ class DMPRefreshStatusButton(ButtonEntity):
         config = hass.data[DOMAIN][config_entry.entry_id]
         self._panel_name = config.get(CONF_PANEL_NAME)
         self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
+        self._listener = config_entry.runtime_data.listener
         self._name = "Refresh Status"
 
     async def async_added_to_hass(self):
@@ -32,11 +33,20 @@ class DMPRefreshStatusButton(ButtonEntity):
     async def async_will_remove_from_hass(self):
         self._listener.remove_callback(self.process_zone_callback)
 
-    async def process_zone_callback(self):
+    @callback
+    def process_zone_callback(self):
         self.async_write_ha_state()
 
     async def async_press(self):
         await self._listener.updateStatus()
+        # The refresh only wakes entities whose status changed; show the
+        # refreshed status attributes here either way
+        self.async_write_ha_state()
+
+    @property
+    def available(self):
+        """Commands need the panel connection"""
+        return self._listener.isConnected()
 
     @property
     def name(self):
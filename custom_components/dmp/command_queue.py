@@ -0,0 +1,147 @@
+"""Serialized, prioritized command queue for the pyDMP panel connection"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+from .const import (
+    COMMAND_PRIORITY_ARMING,
+    COMMAND_PRIORITY_BYPASS,
+    COMMAND_PRIORITY_STATUS,
+    COMMAND_TIMEOUTS,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PRIORITY_NAMES = {
+    COMMAND_PRIORITY_ARMING: "arming",
+    COMMAND_PRIORITY_BYPASS: "bypass",
+    COMMAND_PRIORITY_STATUS: "status",
+}
+
+
+class _Command:
+    __slots__ = ("priority", "func", "args", "kwargs", "timeout", "future", "enqueued")
+
+    def __init__(self, priority, func, args, kwargs, timeout, future):
+        self.priority = priority
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.timeout = timeout
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class DMPCommandQueue:
+    """Runs panel commands one at a time, most urgent first.
+
+    The remote link is a single session, so commands are never interleaved.
+    Arming and disarming run ahead of bypass commands, which run ahead of
+    status queries. A status query submitted while another one is still
+    waiting is folded into the waiting one. The worker only runs while
+    there are commands to send.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = itertools.count()
+        self._worker = None
+        self._pending_status = None
+        self._superseded = 0
+        self._stats = {
+            name: {"commands": 0, "wait_total": 0.0, "wait_max": 0.0, "timeouts": 0}
+            for name in PRIORITY_NAMES.values()
+        }
+
+    async def submit(self, priority, func, *args, timeout=None, **kwargs):
+        """Queue func(*args, **kwargs) and wait for its result.
+
+        The timeout defaults to the one configured for the priority.
+        """
+        if priority == COMMAND_PRIORITY_STATUS and self._pending_status is not None:
+            self._superseded += 1
+            return await asyncio.shield(self._pending_status.future)
+
+        loop = asyncio.get_running_loop()
+        if timeout is None:
+            timeout = COMMAND_TIMEOUTS[priority]
+        command = _Command(priority, func, args, kwargs, timeout, loop.create_future())
+        heapq.heappush(self._heap, (priority, next(self._seq), command))
+        if priority == COMMAND_PRIORITY_STATUS:
+            self._pending_status = command
+        if self._worker is None:
+            self._worker = loop.create_task(self._run())
+        return await asyncio.shield(command.future)
+
+    async def _run(self):
+        try:
+            while self._heap:
+                priority, _, command = heapq.heappop(self._heap)
+                if command is self._pending_status:
+                    self._pending_status = None
+                stats = self._stats[PRIORITY_NAMES[priority]]
+                wait = time.monotonic() - command.enqueued
+                stats["commands"] += 1
+                stats["wait_total"] += wait
+                stats["wait_max"] = max(stats["wait_max"], wait)
+                try:
+                    async with asyncio.timeout(command.timeout):
+                        result = await command.func(*command.args, **command.kwargs)
+                except TimeoutError as err:
+                    stats["timeouts"] += 1
+                    _LOGGER.warning(
+                        "Panel command %s timed out after %ss"
+                        % (
+                            getattr(command.func, "__name__", command.func),
+                            command.timeout,
+                        )
+                    )
+                    command.future.set_exception(err)
+                except asyncio.CancelledError:
+                    command.future.cancel()
+                    # Only stop the worker if it is the one being cancelled
+                    if asyncio.current_task().cancelling():
+                        raise
+                except Exception as err:
+                    command.future.set_exception(err)
+                else:
+                    command.future.set_result(result)
+        finally:
+            self._worker = None
+            self._cancel_queued()
+
+    def _cancel_queued(self):
+        # Callers must never wait on commands that will not run
+        while self._heap:
+            _, _, command = heapq.heappop(self._heap)
+            if not command.future.done():
+                command.future.cancel()
+        self._pending_status = None
+
+    def close(self):
+        """Stop the worker and cancel every queued command"""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        self._cancel_queued()
+
+    def getStats(self):
+        wait = {}
+        for name, stats in self._stats.items():
+            commands = stats["commands"]
+            wait[name] = {
+                "commands": commands,
+                "mean_wait": round(stats["wait_total"] / commands, 3)
+                if commands
+                else 0.0,
+                "max_wait": round(stats["wait_max"], 3),
+                "timeouts": stats["timeouts"],
+            }
+        return {
+            "depth": len(self._heap),
+            "superseded_status": self._superseded,
+            "wait": wait,
+        }
@@ -16,12 +16,34 @@ from .const import (
     CONF_PANEL_REMOTE_PORT,
     CONF_PANEL_ACCOUNT_NUMBER,
     CONF_PANEL_REMOTE_KEY,
+    CONF_COMPACT_ZONES,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_DUPLICATE_WINDOW,
+    CONF_LAST_CONTACT_THROTTLE,
+    CONF_RECONCILE_MIN_INTERVAL,
+    CONF_RECONCILE_MAX_INTERVAL,
+    CONF_INGEST_QUEUE_SIZE,
+    CONF_INGEST_OVERFLOW,
     CONF_HOME_AREA,
     CONF_AWAY_AREA,
     CONF_ZONE_NAME,
     CONF_ZONE_NUMBER,
     CONF_ZONE_CLASS,
+    CONF_ZONE_DEGLITCH,
+    CONF_ZONE_RATE_LIMITS,
     CONF_ADD_ANOTHER,
+    DEFAULT_COMPACT_ZONES,
+    DEFAULT_EVENT_BATCH_WINDOW,
+    DEFAULT_DUPLICATE_WINDOW,
+    DEFAULT_LAST_CONTACT_THROTTLE,
+    DEFAULT_RECONCILE_MIN_INTERVAL,
+    DEFAULT_RECONCILE_MAX_INTERVAL,
+    DEFAULT_INGEST_QUEUE_SIZE,
+    DEFAULT_INGEST_OVERFLOW,
+    INGEST_OVERFLOW_BLOCK,
+    INGEST_OVERFLOW_DROP_OLDEST,
+    DEFAULT_ZONE_DEGLITCH,
+    DEFAULT_ZONE_RATE_LIMITS,
     DEV_TYPE_BATTERY_DOOR,
     DEV_TYPE_BATTERY_GLASSBREAK,
     DEV_TYPE_BATTERY_MOTION,
@@ -33,6 +55,7 @@ from .const import (
     DEV_TYPE_WIRED_MOTION,
     DEV_TYPE_WIRED_SMOKE,
     DEV_TYPE_WIRED_WINDOW,
+    ZONE_RATE_LIMIT_KINDS,
 )
 
 from .const import CONF_ZONES, DOMAIN
@@ -84,6 +107,7 @@ PANEL_SCHEMA = vol.Schema(
         vol.Optional(CONF_PANEL_LISTEN_PORT, default=8001): cv.port,
         vol.Required(CONF_PANEL_ACCOUNT_NUMBER): cv.string,
         vol.Optional(CONF_PANEL_REMOTE_KEY): cv.string,
+        vol.Optional(CONF_COMPACT_ZONES, default=False): cv.boolean,
     }
 )
 
@@ -114,6 +138,35 @@ ZONE_SCHEMA = vol.Schema(
 )
 
 
+# Entry settings changed from the options flow: key, default, validator
+OPTIONS_SETTINGS = (
+    (CONF_EVENT_BATCH_WINDOW, DEFAULT_EVENT_BATCH_WINDOW, cv.positive_float),
+    (
+        CONF_INGEST_QUEUE_SIZE,
+        DEFAULT_INGEST_QUEUE_SIZE,
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    ),
+    (
+        CONF_INGEST_OVERFLOW,
+        DEFAULT_INGEST_OVERFLOW,
+        vol.In([INGEST_OVERFLOW_BLOCK, INGEST_OVERFLOW_DROP_OLDEST]),
+    ),
+    (CONF_DUPLICATE_WINDOW, DEFAULT_DUPLICATE_WINDOW, cv.positive_float),
+    (CONF_LAST_CONTACT_THROTTLE, DEFAULT_LAST_CONTACT_THROTTLE, cv.positive_float),
+    (
+        CONF_RECONCILE_MIN_INTERVAL,
+        DEFAULT_RECONCILE_MIN_INTERVAL,
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    ),
+    (CONF_RECONCILE_MAX_INTERVAL, DEFAULT_RECONCILE_MAX_INTERVAL, cv.positive_int),
+    (CONF_COMPACT_ZONES, DEFAULT_COMPACT_ZONES, cv.boolean),
+)
+
+
+def _rate_limit_key(kind):
+    return "%s_%s" % (CONF_ZONE_RATE_LIMITS, kind)
+
+
 class DMPCustomConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """DMP Custom config flow."""
 
@@ -173,6 +226,14 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         # sensors.
         zones = dict(self.config_entry.data)[CONF_ZONES]
         zones_dict = {z[CONF_ZONE_NUMBER]: z[CONF_ZONE_NAME] for z in zones}
+        rate_limits = self.config_entry.data.get(
+            CONF_ZONE_RATE_LIMITS, DEFAULT_ZONE_RATE_LIMITS
+        )
+        deglitch = self.config_entry.data.get(CONF_ZONE_DEGLITCH, DEFAULT_ZONE_DEGLITCH)
+        settings = {
+            key: self.config_entry.data.get(key, default)
+            for key, default, _validator in OPTIONS_SETTINGS
+        }
         if user_input is not None:
             updated_zones = deepcopy(self.config_entry.data[CONF_ZONES])
             deleted_zones = deleted_zones = [
@@ -195,10 +256,35 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     }
                 )
 
+            # Chattering zone filter, 0 turns a limit off
+            updated_limits = dict(rate_limits)
+            for kind in ZONE_RATE_LIMIT_KINDS:
+                updated_limits[kind] = user_input.get(
+                    _rate_limit_key(kind), rate_limits.get(kind, 0)
+                )
+            updated_limits = {
+                kind: limit for kind, limit in updated_limits.items() if limit > 0
+            }
+
+            updated_settings = {
+                key: user_input.get(key, value) for key, value in settings.items()
+            }
+            # A max of 0 turns the poll off, otherwise it may not undercut the min
+            max_interval = updated_settings[CONF_RECONCILE_MAX_INTERVAL]
+            if 0 < max_interval < updated_settings[CONF_RECONCILE_MIN_INTERVAL]:
+                errors[CONF_RECONCILE_MAX_INTERVAL] = "reconcile_interval"
+
             if not errors:
                 return self.async_create_entry(
                     title="",
-                    data={CONF_ZONES: updated_zones},
+                    data={
+                        CONF_ZONES: updated_zones,
+                        CONF_ZONE_RATE_LIMITS: updated_limits,
+                        CONF_ZONE_DEGLITCH: user_input.get(
+                            CONF_ZONE_DEGLITCH, deglitch
+                        ),
+                        **updated_settings,
+                    },
                 )
 
         options_schema = vol.Schema(
@@ -212,6 +298,17 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     vol.Match(r"^\d+$", msg="Zone number must be numeric"),
                 ),
                 vol.Optional(CONF_ZONE_CLASS, default="default"): SENSOR_TYPES,
+                **{
+                    vol.Optional(
+                        _rate_limit_key(kind), default=rate_limits.get(kind, 0)
+                    ): cv.positive_float
+                    for kind in ZONE_RATE_LIMIT_KINDS
+                },
+                vol.Optional(CONF_ZONE_DEGLITCH, default=deglitch): cv.positive_int,
+                **{
+                    vol.Optional(key, default=settings[key]): validator
+                    for key, _default, validator in OPTIONS_SETTINGS
+                },
             }
         )
         return self.async_show_form(
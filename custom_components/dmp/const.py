@@ -1,6 +1,5 @@
 # Configuation Constants
 DOMAIN = "dmp"
-LISTENER = "dmp_listener"
 
 CONF_PANEL = "panel"
 CONF_PANEL_NAME = "panel_name"
@@ -10,6 +9,18 @@ CONF_PANEL_REMOTE_PORT = "remote_port"
 CONF_PANEL_ACCOUNT_NUMBER = "account_number"
 CONF_PANEL_REMOTE_KEY = "remote_key"
 
+CONF_EVENT_BATCH_WINDOW = "event_batch_window"
+CONF_INGEST_QUEUE_SIZE = "ingest_queue_size"
+CONF_INGEST_OVERFLOW = "ingest_overflow"
+CONF_FAST_S3_PARSER = "fast_s3_parser"
+CONF_DUPLICATE_WINDOW = "duplicate_window"
+CONF_LAST_CONTACT_THROTTLE = "last_contact_throttle"
+CONF_RECONCILE_MIN_INTERVAL = "reconcile_min_interval"
+CONF_RECONCILE_MAX_INTERVAL = "reconcile_max_interval"
+CONF_COMPACT_ZONES = "compact_zones"
+CONF_ZONE_RATE_LIMITS = "zone_rate_limits"
+CONF_ZONE_DEGLITCH = "zone_deglitch"
+
 CONF_HOME_AREA = "home_zone"
 CONF_AWAY_AREA = "away_zone"
 
@@ -50,6 +61,95 @@ BATTERY_LEVEL = "BatteryLevel"
 # Other Constants
 PANEL_ALL_AREAS = "010203"
 
-# pyDMP object keys for hass.data
-PYDMP_PANEL = "pydmp_panel"
-STATUS_SERVER = "status_server"
+# Entry data keys the options flow can change, copied into the entry data
+# by the options update listener
+OPTIONS_ENTRY_KEYS = (
+    CONF_ZONE_RATE_LIMITS,
+    CONF_ZONE_DEGLITCH,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_INGEST_QUEUE_SIZE,
+    CONF_INGEST_OVERFLOW,
+    CONF_DUPLICATE_WINDOW,
+    CONF_LAST_CONTACT_THROTTLE,
+    CONF_RECONCILE_MIN_INTERVAL,
+    CONF_RECONCILE_MAX_INTERVAL,
+    CONF_COMPACT_ZONES,
+)
+
+# Seconds to coalesce S3 events before waking entities (0 disables)
+DEFAULT_EVENT_BATCH_WINDOW = 0.05
+
+# S3 ingest queue depth and overflow policy
+DEFAULT_INGEST_QUEUE_SIZE = 256
+INGEST_OVERFLOW_BLOCK = "block"
+INGEST_OVERFLOW_DROP_OLDEST = "drop_oldest"
+DEFAULT_INGEST_OVERFLOW = INGEST_OVERFLOW_BLOCK
+
+# Seconds a retransmitted S3 message is treated as a duplicate (0 disables)
+DEFAULT_DUPLICATE_WINDOW = 2.0
+# Most recent message remembered per zone/area for duplicate detection
+DUPLICATE_CACHE_SIZE = 512
+
+# Minimum seconds between last contact sensor writes (0 writes every contact)
+DEFAULT_LAST_CONTACT_THROTTLE = 0
+
+# Compact mode: one status sensor and bypass switch per zone, with the other
+# zone booleans served by the get_zone_states service and zone state events
+DEFAULT_COMPACT_ZONES = False
+EVENT_ZONE_STATE = "dmp_zone_state"
+
+# Minimum seconds between open/close wake-ups of a zone's entities, keyed by
+# zone kind (door, window, motion, ... or default); unlisted kinds are not
+# limited. The final state is always delivered once the interval has passed.
+DEFAULT_ZONE_RATE_LIMITS = {}
+# Zone kinds whose rate limit can be set in the options flow
+ZONE_RATE_LIMIT_KINDS = ("door", "window", "motion", "default")
+# Milliseconds a zone must stay open before the open is delivered; shorter
+# open/close pulses are dropped (0 disables)
+DEFAULT_ZONE_DEGLITCH = 0
+
+# Bounds in seconds of the adaptive status reconciliation poll (max 0 disables)
+DEFAULT_RECONCILE_MIN_INTERVAL = 60
+DEFAULT_RECONCILE_MAX_INTERVAL = 900
+
+# Persisted zone/area state snapshot restored at startup
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_STORAGE_KEY = "dmp.snapshot.%s"
+# Seconds to debounce snapshot writes
+SNAPSHOT_SAVE_DELAY = 10
+
+# Panel connection states tracked by the connection supervisor
+CONNECTION_CONNECTING = "connecting"
+CONNECTION_CONNECTED = "connected"
+CONNECTION_DEGRADED = "degraded"
+CONNECTION_OFFLINE = "offline"
+# Reconnect backoff bounds in seconds, and failed attempts before offline
+RECONNECT_BASE_DELAY = 5
+RECONNECT_MAX_DELAY = 300
+RECONNECT_OFFLINE_AFTER = 3
+# Seconds between connection health checks once connected
+CONNECTION_CHECK_INTERVAL = 10
+
+# Panel command priorities, lowest runs first, and their timeouts in seconds
+COMMAND_PRIORITY_ARMING = 0
+COMMAND_PRIORITY_BYPASS = 1
+COMMAND_PRIORITY_STATUS = 2
+COMMAND_TIMEOUTS = {
+    COMMAND_PRIORITY_ARMING: 15,
+    COMMAND_PRIORITY_BYPASS: 15,
+    COMMAND_PRIORITY_STATUS: 60,
+}
+
+# Services
+SERVICE_BYPASS_ZONES = "bypass_zones"
+SERVICE_RESTORE_ZONES = "restore_zones"
+SERVICE_ARM_WITH_BYPASS = "arm_with_bypass"
+SERVICE_GET_ZONE_STATES = "get_zone_states"
+ATTR_ZONES = "zones"
+ATTR_MODE = "mode"
+ARM_MODE_AWAY = "away"
+ARM_MODE_HOME = "home"
+ARM_MODE_NIGHT = "night"
+
+# hass.data key for the shared S3 status servers, keyed by listen port
+STATUS_SERVERS = "status_servers"
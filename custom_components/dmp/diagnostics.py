@@ -0,0 +1,23 @@
+"""Diagnostics support for the DMP integration"""
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    listener = entry.runtime_data.listener
+    status_server = entry.runtime_data.status_server
+    return {
+        "connection": listener.getConnectionState(),
+        "suppressed_writes": listener.getSuppressedWrites(),
+        "ingest": listener.getIngestStats(),
+        "panel_ingest": listener.getPanelIngestStats(),
+        "duplicates": listener.getDuplicateCount(),
+        "zone_filter": listener.getZoneFilterStats(),
+        "coalesced_status_requests": listener.getCoalescedStatusRequests(),
+        "reconcile": listener.getReconcileStats(),
+        "startup": listener.getStartupStats(),
+        "status_server": status_server.getStats(),
+        "commands": {
+            account: panel.getCommandStats()
+            for account, panel in listener.getPanels().items()
+        },
+    }
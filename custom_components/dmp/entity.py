@@ -0,0 +1,198 @@
+"""Shared entity base for DMP zone entities"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import DeviceInfo, Entity, EntityDescription
+
+from .const import (
+    DOMAIN,
+    CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_ZONE_CLASS,
+    CONF_ZONE_NAME,
+    CONF_ZONE_NUMBER,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def zone_device_info(account, zone_number, zone_name):
+    """Return the DeviceInfo shared by every entity of a zone."""
+    return DeviceInfo(
+        identifiers={(DOMAIN, "dmp-%s-zone-%s" % (account, zone_number))},
+        name=zone_name,
+        manufacturer="Digital Monitoring Products",
+        via_device=(DOMAIN, "dmp-%s-panel" % account),
+    )
+
+
+@lru_cache(maxsize=None)
+def zone_kind(zone_class):
+    """Split a zone class such as battery_window into (kind, battery)."""
+    power, _, kind = (zone_class or "default").rpartition("_")
+    return kind, power == "battery"
+
+
+@dataclass(frozen=True, kw_only=True)
+class DMPZoneEntityDescription(EntityDescription):
+    """Describes an entity created for each matching zone.
+
+    The key doubles as the unique ID suffix. zone_kinds limits the
+    description to zones of those kinds, None matches every zone.
+    """
+
+    value_fn: Callable[[Any], Any]
+    name_suffix: str | None = None
+    icon_on: str | None = None
+    icon_off: str | None = None
+    zone_kinds: frozenset[str] | None = None
+    battery_only: bool = False
+
+    def matches(self, kind, battery):
+        if self.battery_only and not battery:
+            return False
+        return self.zone_kinds is None or kind in self.zone_kinds
+
+
+@lru_cache(maxsize=None)
+def _zone_plan(zone_class, entity_classes):
+    kind, battery = zone_kind(zone_class)
+    plan = []
+    for entity_cls in entity_classes:
+        for description in entity_cls.zone_descriptions:
+            if description.matches(kind, battery):
+                plan.append((entity_cls, description))
+                break
+    return tuple(plan)
+
+
+def create_zone_entities(hass, config_entry, zones, entity_classes):
+    """Create the entities of every zone in one pass over the zones.
+
+    Which descriptions apply is worked out once per zone class, so large
+    zone lists only pay for a dictionary lookup per zone.
+    """
+    entity_classes = tuple(entity_classes)
+    entities = []
+    for zone in zones:
+        for entity_cls, description in _zone_plan(
+            zone.get(CONF_ZONE_CLASS), entity_classes
+        ):
+            entities.append(entity_cls(hass, config_entry, zone, description))
+    return entities
+
+
+class DMPZoneEntity(Entity):
+    """Zone entity that only writes state to HA on real transitions.
+
+    Name, unique ID and device info are fixed when the entity is created,
+    and the device info object is shared by all entities of the zone.
+    Subclasses list the descriptions they can be created from in
+    zone_descriptions; the description sets the name and unique ID
+    suffixes, the on/off icons and how the zone state is read.
+
+    The last published state, icon, attributes and availability are kept
+    as a snapshot and compared before each write, so repeated callbacks
+    that leave the entity unchanged never reach the state machine.
+    """
+
+    _attr_should_poll = False
+    zone_descriptions = ()
+
+    def __init__(self, hass, config_entry, entity_config, description=None):
+        if description is None:
+            description = self.describe(entity_config.get(CONF_ZONE_CLASS))
+        self.entity_description = description
+        config = hass.data[DOMAIN][config_entry.entry_id]
+        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
+        self._listener = config_entry.runtime_data.listener
+        self._number = entity_config.get(CONF_ZONE_NUMBER)
+        zone_name = entity_config.get(CONF_ZONE_NAME)
+        if description.name_suffix:
+            self._attr_name = "%s %s" % (zone_name, description.name_suffix)
+        else:
+            self._attr_name = zone_name
+        self._attr_unique_id = "dmp-%s-zone-%s-%s" % (
+            self._accountNum,
+            self._number,
+            description.key,
+        )
+        self._attr_device_info = zone_device_info(
+            self._accountNum, self._number, zone_name
+        )
+        self._panel = self._listener.getPanels()[str(self._accountNum)]
+        self._zone = self._panel.ensure_zone(self._number)
+        # Start from the zone state restored from the snapshot, if any
+        self._state = self._read_state()
+        self._last_published = None
+        self._suppressed_writes = 0
+
+    async def async_added_to_hass(self):
+        _LOGGER.debug("Registering %s Callback", type(self).__name__)
+        self._listener.register_zone_callback(
+            self._accountNum, self._number, self.process_zone_callback
+        )
+
+    async def async_will_remove_from_hass(self):
+        _LOGGER.debug("Removing %s Callback", type(self).__name__)
+        self._listener.remove_zone_callback(
+            self._accountNum, self._number, self.process_zone_callback
+        )
+
+    @classmethod
+    def describe(cls, zone_class):
+        """Return the description used for a zone class.
+
+        Falls back to the last description so an entity can always be
+        created directly for any zone.
+        """
+        kind, battery = zone_kind(zone_class)
+        for description in cls.zone_descriptions:
+            if description.matches(kind, battery):
+                return description
+        return cls.zone_descriptions[-1]
+
+    def _read_state(self):
+        """Return the entity state from the pyDMP zone."""
+        return self.entity_description.value_fn(self)
+
+    @callback
+    def process_zone_callback(self):
+        self._state = self._read_state()
+        self.async_write_ha_state_if_changed()
+
+    @property
+    def device_name(self):
+        """Return the name of the device."""
+        return self._attr_device_info["name"]
+
+    @property
+    def icon(self):
+        """Icon to show for status"""
+        description = self.entity_description
+        return description.icon_on if self._state else description.icon_off
+
+    def _state_snapshot(self):
+        return (self.state, self.icon, self.extra_state_attributes, self.available)
+
+    @callback
+    def async_write_ha_state_if_changed(self):
+        """Write state only if it differs from the last published state."""
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_published:
+            self._suppressed_writes += 1
+            self._listener.record_suppressed_write()
+            return False
+        self._last_published = snapshot
+        self.async_write_ha_state()
+        return True
+
+    @property
+    def suppressed_writes(self):
+        """Return the number of no-op state writes skipped."""
+        return self._suppressed_writes
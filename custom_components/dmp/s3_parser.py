@@ -0,0 +1,149 @@
+"""Fast-path parser for high-frequency S3 realtime messages"""
+
+from pydmp import parse_s3_message
+from pydmp.const.events import DMPEventType, DMPRealTimeStatusEvent, DMPZoneEvent
+
+_REAL_TIME_STATUS_CODES = {e.value: e for e in DMPRealTimeStatusEvent}
+_ZONE_CODES = {e.value: e for e in DMPZoneEvent}
+
+# Definitions parsed directly: definition -> (category, type_code enum table)
+FAST_PATH_DEFINITIONS = {
+    DMPEventType.REAL_TIME_STATUS.value: (
+        DMPEventType.REAL_TIME_STATUS,
+        _REAL_TIME_STATUS_CODES,
+    ),
+    DMPEventType.ZONE_BYPASS.value: (DMPEventType.ZONE_BYPASS, _ZONE_CODES),
+    DMPEventType.ZONE_RESTORE.value: (DMPEventType.ZONE_RESTORE, _ZONE_CODES),
+}
+
+
+class S3Event:
+    """Compact event record with the same fields as pydmp's ParsedEvent."""
+
+    __slots__ = (
+        "account",
+        "category",
+        "type_code",
+        "code_enum",
+        "area",
+        "area_name",
+        "zone",
+        "zone_name",
+        "device",
+        "device_name",
+        "system_code",
+        "system_text",
+        "fields",
+        "raw",
+    )
+
+    def __init__(
+        self,
+        account,
+        category,
+        type_code,
+        code_enum,
+        area,
+        area_name,
+        zone,
+        zone_name,
+        device,
+        device_name,
+        system_code,
+        fields,
+        raw,
+    ):
+        self.account = account
+        self.category = category
+        self.type_code = type_code
+        self.code_enum = code_enum
+        self.area = area
+        self.area_name = area_name
+        self.zone = zone
+        self.zone_name = zone_name
+        self.device = device
+        self.device_name = device_name
+        self.system_code = system_code
+        # System message text only applies to Zs, which is never fast-pathed
+        self.system_text = None
+        self.fields = fields
+        self.raw = raw
+
+    def __repr__(self):
+        return "S3Event(account=%r, category=%r, type_code=%r, zone=%r)" % (
+            self.account,
+            self.category,
+            self.type_code,
+            self.zone,
+        )
+
+
+def number_key(value):
+    """Lookup key for an account, area or zone number.
+
+    Panels pad these numbers with zeros or spaces, so "001", " 1" and 1
+    all give the key 1. Values that are not numbers are only stripped.
+    """
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None if value is None else str(value).strip()
+
+
+def _split_number_name(value):
+    number, sep, name = value.partition('"')
+    if not sep:
+        return number.strip(), None
+    return number.strip(), name.strip()
+
+
+def fast_parse_s3_message(msg):
+    """Parse Zc/Zx/Zr messages directly, deferring anything else to pyDMP."""
+    fast_path = FAST_PATH_DEFINITIONS.get(msg.definition)
+    if fast_path is None:
+        return parse_s3_message(msg)
+    category, codes = fast_path
+
+    area = zone = device = system_code = None
+    for field in msg.fields:
+        if len(field) < 2 or field[1] != " ":
+            continue
+        key = field[0]
+        # First occurrence of each field wins, as in parse_s3_message
+        if key == "z":
+            if zone is None:
+                zone = field[2:].strip()
+        elif key == "a":
+            if area is None:
+                area = field[2:].strip()
+        elif key == "v":
+            if device is None:
+                device = field[2:].strip()
+        elif key == "s":
+            if system_code is None:
+                system_code = field[2:].strip()
+
+    zone_name = area_name = device_name = None
+    if zone is not None:
+        zone, zone_name = _split_number_name(zone)
+    if area is not None:
+        area, area_name = _split_number_name(area)
+    if device is not None:
+        device, device_name = _split_number_name(device)
+
+    type_code = msg.type_code
+    return S3Event(
+        msg.account,
+        category,
+        type_code,
+        codes.get(type_code) if type_code else None,
+        area,
+        area_name,
+        zone,
+        zone_name,
+        device,
+        device_name,
+        system_code,
+        msg.fields,
+        msg.raw,
+    )
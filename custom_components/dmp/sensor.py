@@ -1,22 +1,50 @@
 """Platform for DMP Alarm Panel integration"""
 
+from dataclasses import dataclass
 import logging
+import time
+from homeassistant.core import callback
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.components.sensor import SensorEntity
-from . import ZONE_STATE_TO_STATUS
+from homeassistant.helpers.event import async_call_later
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import EntityCategory
+from . import ZONE_STATE_TO_COMPACT_STATUS, ZONE_STATE_TO_STATUS, zone_flags
+from .entity import (
+    DMPZoneEntity,
+    DMPZoneEntityDescription,
+    create_zone_entities,
+    zone_kind,
+)
 from .const import (
     DOMAIN,
-    LISTENER,
+    CONF_PANEL_NAME,
     CONF_PANEL_ACCOUNT_NUMBER,
-    CONF_ZONE_NAME,
-    CONF_ZONE_NUMBER,
+    CONF_COMPACT_ZONES,
+    CONF_LAST_CONTACT_THROTTLE,
+    DEFAULT_COMPACT_ZONES,
+    DEFAULT_LAST_CONTACT_THROTTLE,
     CONF_ZONE_CLASS,
+    CONF_ZONE_NUMBER,
     CONF_ZONES,
+    EVENT_ZONE_STATE,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# S3 ingest queue counters exposed as diagnostic sensors: stat -> (name, class)
+INGEST_STAT_SENSORS = {
+    "enqueued": ("S3 Events Enqueued", SensorStateClass.TOTAL_INCREASING),
+    "processed": ("S3 Events Processed", SensorStateClass.TOTAL_INCREASING),
+    "dropped": ("S3 Events Dropped", SensorStateClass.TOTAL_INCREASING),
+    "high_water_mark": ("S3 Queue High Water Mark", SensorStateClass.MEASUREMENT),
+}
+
 
 async def async_setup_entry(
     hass,
@@ -28,44 +56,78 @@ async def async_setup_entry(
     hass.data.setdefault(DOMAIN, {})
     config = hass.data[DOMAIN][config_entry.entry_id]
     _LOGGER.debug("Sensor config: %s" % config)
-    # Add all zones to trouble zones
-    statusZones = [
-        DMPZoneStatus(hass, config_entry, zone) for zone in config[CONF_ZONES]
-    ]
+    # Every zone gets a status sensor
+    if config.get(CONF_COMPACT_ZONES, DEFAULT_COMPACT_ZONES):
+        statusClass = DMPCompactZoneStatus
+    else:
+        statusClass = DMPZoneStatus
+    statusZones = create_zone_entities(
+        hass, config_entry, config[CONF_ZONES], (statusClass,)
+    )
     async_add_entities(statusZones, update_before_add=True)
+    ingestStats = [
+        DMPIngestStatSensor(hass, config_entry, stat) for stat in INGEST_STAT_SENSORS
+    ]
+    async_add_entities(ingestStats, update_before_add=False)
+    async_add_entities(
+        [DMPLastContactSensor(hass, config_entry)], update_before_add=False
+    )
+
+
+# zone kind -> device class used to pick the "Open" icon
+ZONE_KIND_DEVICE_CLASSES = {"door": "door", "window": "window", "motion": "motion"}
+
+# zone status -> icon; "Open" depends on the zone class
+ZONE_STATUS_ICONS = {
+    "Alarm": "mdi:alarm-bell",
+    "Trouble": "mdi:alert",
+    "Bypass": "mdi:alert",
+    "Low Battery": "mdi:battery-alert-variant-outline",
+    "Ready": "mdi:check",
+    "Short": "mdi:alert",
+    "Missing": "mdi:alert",
+}
+ZONE_OPEN_ICONS = {"window": "mdi:window-open"}
+
+
+def _zone_status(entity):
+    if entity._panel.get_alarm(entity._number):
+        return "Alarm"
+    zone_state = entity._zone.state if entity._zone else "N"
+    return ZONE_STATE_TO_STATUS.get(zone_state, "Ready")
+
 
+def _compact_zone_status(entity):
+    if entity._panel.get_alarm(entity._number):
+        return "Alarm"
+    zone_state = entity._zone.state if entity._zone else "N"
+    return ZONE_STATE_TO_COMPACT_STATUS.get(zone_state, "Ready")
 
-class DMPZoneStatus(SensorEntity):
-    def __init__(self, hass, config_entry, entity_config):
+
+COMPACT_ZONE_STATUSES = ["Alarm", *dict.fromkeys(ZONE_STATE_TO_COMPACT_STATUS.values())]
+
+
+@dataclass(frozen=True, kw_only=True)
+class DMPZoneSensorEntityDescription(DMPZoneEntityDescription, SensorEntityDescription):
+    """Describes a DMP zone sensor."""
+
+
+class DMPZoneStatus(DMPZoneEntity, SensorEntity):
+    zone_descriptions = (
+        DMPZoneSensorEntityDescription(
+            key="status", name_suffix="Status", value_fn=_zone_status
+        ),
+    )
+
+    def __init__(self, hass, config_entry, entity_config, description=None):
+        super().__init__(hass, config_entry, entity_config, description)
         self._hass = hass
         self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        _LOGGER.debug("Config is: %s" % entity_config)
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._name = "%s Status" % entity_config.get(CONF_ZONE_NAME)
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        if "door" in entity_config.get(CONF_ZONE_CLASS):
-            self._device_class = "door"
-        elif "window" in entity_config.get(CONF_ZONE_CLASS):
-            self._device_class = "window"
-        elif "motion" in entity_config.get(CONF_ZONE_CLASS):
-            self._device_class = "motion"
-        else:
-            self._device_class = "default"
-        self._zone = self._panel.ensure_zone(self._number)
-        self._state = "Ready"
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneStatus Callback")
-        self._listener.register_callback(self.process_zone_callback)
+        kind, _ = zone_kind(entity_config.get(CONF_ZONE_CLASS))
+        self._device_class = ZONE_KIND_DEVICE_CLASSES.get(kind, "default")
 
     async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneStatus Callback")
-        self._listener.remove_callback(self.process_zone_callback)
+        await super().async_will_remove_from_hass()
         # Removing linked device, since all zones have a status sensor this
         # is the most logical place to execute this code.
         device_registry = dr.async_get(self._hass)
@@ -77,81 +139,194 @@ class DMPZoneStatus(SensorEntity):
             for i in e.identifiers:
                 if i in device_identifiers:
                     device_registry.async_remove_device(e.id)
-        # for i in device_identifiers:
-        # item = device_registry.async_get_device(i)
-
-    async def process_zone_callback(self):
-        if self._panel.get_alarm(self._number):
-            self._state = "Alarm"
-        else:
-            zone_state = self._zone.state if self._zone else "N"
-            self._state = ZONE_STATE_TO_STATUS.get(zone_state, "Ready")
-        self.async_write_ha_state()
-
-    @property
-    def device_name(self):
-        """Return the name of the device."""
-        return self._device_name
 
     @property
     def native_value(self):
         """Return the native value of the device"""
         return None
 
+    @property
+    def state(self):
+        """Return the state of the device."""
+        return self._state
+
+    @property
+    def icon(self):
+        """Icon to show for status"""
+        state = self._state
+        if state == "Open":
+            return ZONE_OPEN_ICONS.get(self._device_class, "mdi:door-open")
+        return ZONE_STATUS_ICONS.get(state)
+
+
+class DMPCompactZoneStatus(DMPZoneStatus):
+    """Zone status sensor used in compact mode.
+
+    Short and missing zones are reported separately, and a zone state
+    event is fired whenever one of the zone's booleans changes, in place
+    of the binary sensors compact mode does not create.
+    """
+
+    zone_descriptions = (
+        DMPZoneSensorEntityDescription(
+            key="status",
+            name_suffix="Status",
+            device_class=SensorDeviceClass.ENUM,
+            options=COMPACT_ZONE_STATUSES,
+            value_fn=_compact_zone_status,
+        ),
+    )
+
+    def __init__(self, hass, config_entry, entity_config, description=None):
+        super().__init__(hass, config_entry, entity_config, description)
+        self._last_flags = self._zone_flags()
+
+    def _zone_flags(self):
+        return zone_flags(self._zone, self._panel.get_alarm(self._number))
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # Only transitions after startup are reported as events
+        self._last_flags = self._zone_flags()
+
+    @callback
+    def process_zone_callback(self):
+        super().process_zone_callback()
+        flags = self._zone_flags()
+        if flags == self._last_flags:
+            return
+        self._last_flags = flags
+        self._hass.bus.async_fire(
+            EVENT_ZONE_STATE,
+            {
+                CONF_PANEL_ACCOUNT_NUMBER: self._accountNum,
+                CONF_ZONE_NUMBER: self._number,
+                "status": self._state,
+                **flags,
+            },
+        )
+
+
+class DMPIngestStatSensor(SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, hass, config_entry, stat):
+        self._hass = hass
+        self._config_entry = config_entry
+        config = hass.data[DOMAIN][config_entry.entry_id]
+        self._panel_name = config.get(CONF_PANEL_NAME)
+        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
+        self._listener = config_entry.runtime_data.listener
+        self._stat = stat
+        self._name, self._attr_state_class = INGEST_STAT_SENSORS[stat]
+
     @property
     def name(self):
-        """Return the name of the device."""
+        """Return the name of the sensor."""
         return self._name
 
     @property
-    def should_poll(self):
-        """Return the polling state."""
-        return False
+    def native_value(self):
+        """Return the current counter value"""
+        return self._listener.getIngestStats()[self._stat]
 
     @property
-    def state(self):
-        """Return the state of the device."""
-        return self._state
+    def unique_id(self):
+        """Return unique ID"""
+        return "dmp-%s-panel-ingest-%s" % (
+            self._accountNum,
+            self._stat.replace("_", "-"),
+        )
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, "dmp-%s-panel" % self._accountNum)},
+            name=self._panel_name,
+            manufacturer="Digital Monitoring Products",
+        )
+
+
+class DMPLastContactSensor(SensorEntity):
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, hass, config_entry):
+        self._hass = hass
+        self._config_entry = config_entry
+        config = hass.data[DOMAIN][config_entry.entry_id]
+        self._panel_name = config.get(CONF_PANEL_NAME)
+        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
+        self._listener = config_entry.runtime_data.listener
+        self._panel = self._listener.getPanels()[str(self._accountNum)]
+        self._name = "Last Contact"
+        self._throttle = config.get(
+            CONF_LAST_CONTACT_THROTTLE, DEFAULT_LAST_CONTACT_THROTTLE
+        )
+        self._last_write = None
+        self._unsub_throttle = None
+
+    async def async_added_to_hass(self):
+        _LOGGER.debug("Registering DMPLastContactSensor Callback")
+        self._listener.register_contact_callback(self.process_contact_callback)
+
+    async def async_will_remove_from_hass(self):
+        _LOGGER.debug("Removing DMPLastContactSensor Callback")
+        self._listener.remove_contact_callback(self.process_contact_callback)
+        if self._unsub_throttle is not None:
+            self._unsub_throttle()
+            self._unsub_throttle = None
+
+    @callback
+    def process_contact_callback(self):
+        if self._unsub_throttle is not None:
+            # A trailing write is already scheduled and will pick this up
+            return
+        now = time.monotonic()
+        if self._throttle and self._last_write is not None:
+            remaining = self._last_write + self._throttle - now
+            if remaining > 0:
+                self._unsub_throttle = async_call_later(
+                    self._hass, remaining, self._async_throttled_write
+                )
+                return
+        self._write_contact(now)
+
+    @callback
+    def _async_throttled_write(self, _now):
+        self._unsub_throttle = None
+        self._write_contact(time.monotonic())
+
+    def _write_contact(self, now):
+        self._last_write = now
+        self.async_write_ha_state()
 
     @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        return {
-            "last_contact": self._panel.getContactTime(),
-        }
+    def name(self):
+        """Return the name of the sensor."""
+        return self._name
 
     @property
-    def icon(self):
-        """Icon to show for status"""
-        state = self.state
-        device_class = self._device_class
-        if state == "Alarm":
-            return "mdi:alarm-bell"
-        elif state == "Trouble":
-            return "mdi:alert"
-        elif state == "Bypass":
-            return "mdi:alert"
-        elif state == "Low Battery":
-            return "mdi:battery-alert-variant-outline"
-        elif state == "Open":
-            if device_class == "window":
-                return "mdi:window-open"
-            else:
-                return "mdi:door-open"
-        elif state == "Ready":
-            return "mdi:check"
+    def should_poll(self):
+        """Return the polling state."""
+        return False
+
+    @property
+    def native_value(self):
+        """Return the time the panel last reported in"""
+        return self._panel.getContactTime()
 
     @property
     def unique_id(self):
         """Return unique ID"""
-        return "dmp-%s-zone-%s-status" % (self._accountNum, self._number)
+        return "dmp-%s-panel-last-contact" % self._accountNum
 
     @property
     def device_info(self) -> DeviceInfo:
         """Return the device info."""
         return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            name=self.device_name,
+            identifiers={(DOMAIN, "dmp-%s-panel" % self._accountNum)},
+            name=self._panel_name,
             manufacturer="Digital Monitoring Products",
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
         )
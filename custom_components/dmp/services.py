@@ -0,0 +1,194 @@
+"""Services for the DMP integration"""
+
+import logging
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+
+from .const import (
+    ARM_MODE_AWAY,
+    ARM_MODE_HOME,
+    ARM_MODE_NIGHT,
+    ATTR_MODE,
+    ATTR_ZONES,
+    CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_ZONE_NAME,
+    CONF_ZONE_NUMBER,
+    CONF_ZONES,
+    DOMAIN,
+    SERVICE_ARM_WITH_BYPASS,
+    SERVICE_BYPASS_ZONES,
+    SERVICE_GET_ZONE_STATES,
+    SERVICE_RESTORE_ZONES,
+)
+from .s3_parser import number_key
+
+_LOGGER = logging.getLogger(__name__)
+
+ZONE_BATCH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ZONES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_PANEL_ACCOUNT_NUMBER): cv.string,
+    }
+)
+
+ARM_WITH_BYPASS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_MODE): vol.In([ARM_MODE_AWAY, ARM_MODE_HOME, ARM_MODE_NIGHT]),
+        vol.Optional(CONF_PANEL_ACCOUNT_NUMBER): cv.string,
+    }
+)
+
+ZONE_STATES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ZONES): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_PANEL_ACCOUNT_NUMBER): cv.string,
+    }
+)
+
+
+def _get_entry_panel(hass, account):
+    # Each loaded entry owns its own listener; find the one with the panel
+    panels = {}
+    # async_loaded_entries() is newer than the minimum supported core
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is not ConfigEntryState.LOADED:
+            continue
+        listener = entry.runtime_data.listener
+        for panel_account, panel in listener.getPanels().items():
+            panels[number_key(panel_account)] = (entry, listener, panel)
+    if not panels:
+        raise ServiceValidationError("No DMP panel is set up")
+    if account is None:
+        if len(panels) != 1:
+            raise ServiceValidationError(
+                "account_number is required when more than one panel is set up"
+            )
+        return next(iter(panels.values()))
+    found = panels.get(number_key(account))
+    if found is None:
+        raise ServiceValidationError("Unknown panel account number %s" % account)
+    return found
+
+
+def _get_panel(hass, account):
+    _entry, listener, panel = _get_entry_panel(hass, account)
+    return listener, panel
+
+
+def _configured_zones(hass, entry, zone_numbers):
+    """Return {zone key: name} of the entry's zones.
+
+    Raises if any of zone_numbers is not one of them.
+    """
+    config = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    names = {
+        number_key(zone[CONF_ZONE_NUMBER]): zone[CONF_ZONE_NAME]
+        for zone in config.get(CONF_ZONES, [])
+    }
+    unknown = [
+        zone_number
+        for zone_number in zone_numbers
+        if number_key(zone_number) not in names
+    ]
+    if unknown:
+        raise ServiceValidationError(
+            "Zones not configured for this panel: %s" % ", ".join(unknown)
+        )
+    return names
+
+
+async def _async_zone_batch(hass, call: ServiceCall, command):
+    entry, listener, panel = _get_entry_panel(
+        hass, call.data.get(CONF_PANEL_ACCOUNT_NUMBER)
+    )
+    # Only act on zones the entry has entities for
+    _configured_zones(hass, entry, call.data[ATTR_ZONES])
+    results = await getattr(panel, command)(call.data[ATTR_ZONES])
+    # One refresh picks up every zone the batch changed in a single update
+    try:
+        await listener.updateStatus()
+    except Exception as err:
+        _LOGGER.warning("Status refresh after %s failed: %s", command, err)
+    return {"results": results}
+
+
+async def _async_arm_with_bypass(hass, call: ServiceCall):
+    listener, panel = _get_panel(hass, call.data.get(CONF_PANEL_ACCOUNT_NUMBER))
+    mode = call.data[ATTR_MODE]
+    # Same areas as the arming panel: away arms 01-03, home/night the home area
+    if mode == ARM_MODE_AWAY:
+        areas = [1, 2, 3]
+    else:
+        areas = [int(listener.getHomeArea())]
+    return await panel.arm_with_bypass(areas, instant=mode == ARM_MODE_NIGHT)
+
+
+def _get_zone_states(hass, call: ServiceCall):
+    entry, listener, panel = _get_entry_panel(
+        hass, call.data.get(CONF_PANEL_ACCOUNT_NUMBER)
+    )
+    config = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    configured = [zone[CONF_ZONE_NUMBER] for zone in config.get(CONF_ZONES, [])]
+    names = _configured_zones(hass, entry, call.data.get(ATTR_ZONES, []))
+    zones = {}
+    for zone_number in call.data.get(ATTR_ZONES, configured):
+        flags = panel.getZoneFlags(zone_number)
+        flags["name"] = names.get(number_key(zone_number))
+        flags["suppressed"] = listener.getZoneFilterStats(
+            panel.getAccountNumber(), zone_number
+        )
+        zones[zone_number] = flags
+    return {"zones": zones}
+
+
+@callback
+def async_setup_services(hass):
+    """Register the DMP services."""
+    if hass.services.has_service(DOMAIN, SERVICE_BYPASS_ZONES):
+        return
+
+    async def async_bypass_zones(call: ServiceCall):
+        return await _async_zone_batch(hass, call, "bypass_zones")
+
+    async def async_restore_zones(call: ServiceCall):
+        return await _async_zone_batch(hass, call, "restore_zones")
+
+    async def async_arm_with_bypass(call: ServiceCall):
+        return await _async_arm_with_bypass(hass, call)
+
+    @callback
+    def async_get_zone_states(call: ServiceCall):
+        return _get_zone_states(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BYPASS_ZONES,
+        async_bypass_zones,
+        schema=ZONE_BATCH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RESTORE_ZONES,
+        async_restore_zones,
+        schema=ZONE_BATCH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_ARM_WITH_BYPASS,
+        async_arm_with_bypass,
+        schema=ARM_WITH_BYPASS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ZONE_STATES,
+        async_get_zone_states,
+        schema=ZONE_STATES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -0,0 +1,130 @@
+"""S3 status server shared by every panel reporting to the same listen port"""
+
+import asyncio
+import logging
+
+from pydmp.status_server import DMPStatusServer
+
+from .const import DOMAIN, STATUS_SERVERS
+from .s3_parser import number_key
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DMPSharedStatusServer:
+    """One socket and accept loop for all panels on a listen port.
+
+    Each config entry attaches the account numbers it owns along with its
+    listener's S3 callback. Messages are routed by account number, so
+    entries can come and go without restarting the server.
+    """
+
+    def __init__(self, host, port):
+        self._port = port
+        self._server = DMPStatusServer(host, port)
+        self._server.register_callback(self._route)
+        # normalized account number -> S3 callback of the owning listener
+        self._accounts = {}
+        self._users = 0
+        self._started = False
+        self._lock = asyncio.Lock()
+        self._unrouted = 0
+
+    def __str__(self):
+        return "DMP shared status server on port %s" % self._port
+
+    def attach(self, account, callback):
+        account = number_key(account)
+        if self._accounts.get(account, callback) is not callback:
+            _LOGGER.warning(
+                "Account %s is already attached to the status server on port %s"
+                % (account, self._port)
+            )
+        self._accounts[account] = callback
+
+    def detach(self, account, callback):
+        account = number_key(account)
+        if self._accounts.get(account) is callback:
+            del self._accounts[account]
+
+    def getAccounts(self):
+        return list(self._accounts)
+
+    def getPort(self):
+        return self._port
+
+    def inUse(self):
+        return self._users > 0
+
+    async def acquire(self):
+        """Take a reference, starting the server for the first user."""
+        self._users += 1
+        async with self._lock:
+            if self._started:
+                return
+            try:
+                await self._server.start()
+            except Exception:
+                self._users -= 1
+                raise
+            self._started = True
+
+    async def release(self):
+        """Drop a reference, stopping the server once nobody uses it.
+
+        Returns True when the server was stopped.
+        """
+        self._users -= 1
+        async with self._lock:
+            if self._users > 0:
+                return False
+            if self._started:
+                self._started = False
+                await self._server.stop()
+        return True
+
+    async def _route(self, msg):
+        account = number_key(msg.account)
+        callback = self._accounts.get(account)
+        # Fallback: a frame without an account goes to the only panel
+        if callback is None and not account and len(self._accounts) == 1:
+            callback = next(iter(self._accounts.values()))
+        if callback is None:
+            self._unrouted += 1
+            _LOGGER.debug(
+                "No panel attached for account %r on port %s" % (account, self._port)
+            )
+            return
+        await callback(msg)
+
+    def getStats(self):
+        return {
+            "port": self._port,
+            "accounts": len(self._accounts),
+            "users": self._users,
+            "unrouted": self._unrouted,
+        }
+
+
+async def async_acquire_status_server(hass, port):
+    """Return the running status server for a port, creating it if needed."""
+    servers = hass.data.setdefault(DOMAIN, {}).setdefault(STATUS_SERVERS, {})
+    server = servers.get(port)
+    if server is None:
+        server = DMPSharedStatusServer("0.0.0.0", port)
+        servers[port] = server
+    try:
+        await server.acquire()
+    except Exception:
+        if servers.get(port) is server and not server.inUse():
+            del servers[port]
+        raise
+    return server
+
+
+async def async_release_status_server(hass, server):
+    """Release a status server, forgetting it once it has stopped."""
+    if await server.release() and not server.inUse():
+        servers = hass.data.get(DOMAIN, {}).get(STATUS_SERVERS, {})
+        if servers.get(server.getPort()) is server:
+            del servers[server.getPort()]
@@ -1,12 +1,10 @@
-from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.entity import DeviceInfo
+from dataclasses import dataclass
 
+from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+
+from .entity import DMPZoneEntity, DMPZoneEntityDescription, create_zone_entities
 from .const import (
     DOMAIN,
-    LISTENER,
-    CONF_PANEL_ACCOUNT_NUMBER,
-    CONF_ZONE_NAME,
-    CONF_ZONE_NUMBER,
     CONF_ZONES,
 )
 import logging
@@ -22,72 +20,39 @@ async def async_setup_entry(
     _LOGGER.debug("Setting up bypass switches")
     hass.data.setdefault(DOMAIN, {})
     config = hass.data[DOMAIN][config_entry.entry_id]
-    # broken out from binary_sensor
-    bypassZones = []
-    for zone in config[CONF_ZONES]:
-        # allow all zones to be bypassed
-        bypassZones.append(DMPZoneBypassSwitch(hass, config_entry, zone))
+    # broken out from binary_sensor; allow all zones to be bypassed
+    bypassZones = create_zone_entities(
+        hass, config_entry, config[CONF_ZONES], (DMPZoneBypassSwitch,)
+    )
     # Don't update before add or you have a race condition with the
     # status zone.
     async_add_entities(bypassZones, update_before_add=False)
 
 
-class DMPZoneBypassSwitch(SwitchEntity):
-    def __init__(self, hass, config_entry, entity_config):
-        self._hass = hass
-        self._config_entry = config_entry
-        config = hass.data[DOMAIN][config_entry.entry_id]
-        self._accountNum = config.get(CONF_PANEL_ACCOUNT_NUMBER)
-        self._listener = self._hass.data[DOMAIN][LISTENER]
-        self._device_name = entity_config.get(CONF_ZONE_NAME)
-        self._name = "%s Bypass" % entity_config.get(CONF_ZONE_NAME)
-        self._number = entity_config.get(CONF_ZONE_NUMBER)
-        self._device_class = "switch"
-        self._panel = self._listener.getPanels()[str(self._accountNum)]
-        self._zone = self._panel.ensure_zone(self._number)
-        self._state = False
-
-    async def async_added_to_hass(self):
-        _LOGGER.debug("Registering DMPZoneBypassSwitch Callback")
-        self._listener.register_callback(self.process_zone_callback)
+@dataclass(frozen=True, kw_only=True)
+class DMPZoneSwitchEntityDescription(DMPZoneEntityDescription, SwitchEntityDescription):
+    """Describes a DMP zone switch."""
 
-    async def async_will_remove_from_hass(self):
-        _LOGGER.debug("Removing DMPZoneBypassSwitch Callback")
-        self._listener.remove_callback(self.process_zone_callback)
 
-    async def process_zone_callback(self):
-        self._state = self._zone.is_bypassed
-        self.async_write_ha_state()
+class DMPZoneBypassSwitch(DMPZoneEntity, SwitchEntity):
+    zone_descriptions = (
+        DMPZoneSwitchEntityDescription(
+            key="bypass-switch",
+            name_suffix="Bypass",
+            device_class="switch",
+            value_fn=lambda entity: entity._zone.is_bypassed,
+        ),
+    )
 
     @property
-    def device_name(self):
-        return self._device_name
-
-    @property
-    def name(self):
-        return self._name
+    def available(self):
+        """Commands need the panel connection"""
+        return self._listener.isConnected()
 
     @property
     def is_on(self):
         return self._state
 
-    @property
-    def device_class(self):
-        """Return the class of the device"""
-        return self._device_class
-
-    @property
-    def unique_id(self):
-        return "dmp-%s-zone-%s-bypass-switch" % (self._accountNum, self._number)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, "dmp-%s-zone-%s" % (self._accountNum, self._number))},
-            via_device=(DOMAIN, "dmp-%s-panel" % (self._accountNum)),
-        )
-
     async def async_turn_on(self):
         await self._panel.bypass_zone(self._number)
 
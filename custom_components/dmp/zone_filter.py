@@ -0,0 +1,184 @@
+"""Rate limiting and deglitching of chattering zone open/close events"""
+
+import asyncio
+import logging
+import time
+
+from .const import CONF_ZONE_CLASS, CONF_ZONE_NUMBER
+from .entity import zone_kind
+from .s3_parser import number_key
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _ZoneFilterState:
+    __slots__ = (
+        "account",
+        "zone_number",
+        "state",
+        "delivered",
+        "last_wake",
+        "trailing",
+        "glitch",
+        "rate_limited",
+        "deglitched",
+    )
+
+    def __init__(self, account, zone_number):
+        self.account = account
+        self.zone_number = zone_number
+        self.state = None
+        self.delivered = None
+        self.last_wake = None
+        self.trailing = None
+        self.glitch = None
+        self.rate_limited = 0
+        self.deglitched = 0
+
+
+class DMPZoneFilter:
+    """Decides which zone open/close events wake the zone's entities.
+
+    Motion detectors and loose contacts can report several open/close
+    pairs a second. Two filters run before the entities are woken:
+
+    - Rate limit: the first change of a zone wakes its entities at once,
+      later changes within the zone kind's interval are held back and a
+      single trailing wake delivers the final state when it ends.
+    - Deglitch: an open is only delivered once the zone has stayed open
+      for the deglitch time, so shorter open/close pulses never reach
+      the entities.
+
+    Held back wake-ups are delivered through wake(account, zone_number).
+    """
+
+    def __init__(self, rate_limits, deglitch, wake):
+        self._rate_limits = {
+            kind: limit for kind, limit in rate_limits.items() if limit > 0
+        }
+        self._deglitch = max(deglitch, 0) / 1000
+        self._wake = wake
+        # (account, zone) -> rate limit in seconds, from the configured zone kinds
+        self._limits = {}
+        self._zones = {}
+
+    @property
+    def enabled(self):
+        return bool(self._rate_limits) or self._deglitch > 0
+
+    def setZones(self, account, zones):
+        """Work out the rate limit of each configured zone of an account"""
+        account_key = number_key(account)
+        for key in [key for key in self._limits if key[0] == account_key]:
+            del self._limits[key]
+        for zone in zones:
+            try:
+                key = (account_key, int(zone[CONF_ZONE_NUMBER]))
+            except (KeyError, ValueError, TypeError):
+                continue
+            kind = zone_kind(zone.get(CONF_ZONE_CLASS))[0]
+            self._limits[key] = self._rate_limits.get(kind, 0)
+
+    def _limit(self, key):
+        # Zones missing from the configuration use the default kind
+        return self._limits.get(key, self._rate_limits.get("default", 0))
+
+    def allow(self, account, zone_number, state):
+        """Return True if an open/close event should wake the entities now"""
+        try:
+            key = (number_key(account), int(zone_number))
+        except (ValueError, TypeError):
+            return True
+        limit = self._limit(key)
+        if not limit and self._deglitch <= 0:
+            return True
+        entry = self._zones.get(key)
+        if entry is None:
+            entry = self._zones[key] = _ZoneFilterState(account, zone_number)
+        entry.state = state
+
+        if self._deglitch > 0:
+            if entry.glitch is not None:
+                if state == "O":
+                    return False
+                # Closed again before the open was delivered: drop the pulse
+                entry.glitch.cancel()
+                entry.glitch = None
+                entry.deglitched += 1
+                _LOGGER.debug("Dropped open/close pulse on zone %s", zone_number)
+                return False
+            if state == "O" and entry.delivered != "O":
+                entry.glitch = asyncio.get_running_loop().call_later(
+                    self._deglitch, self._glitch_timer_fired, key
+                )
+                return False
+
+        return self._rate_limit(key, entry, limit)
+
+    def _rate_limit(self, key, entry, limit):
+        now = time.monotonic()
+        if limit:
+            if entry.trailing is not None:
+                entry.rate_limited += 1
+                return False
+            if entry.last_wake is not None and now - entry.last_wake < limit:
+                entry.rate_limited += 1
+                entry.trailing = asyncio.get_running_loop().call_later(
+                    entry.last_wake + limit - now, self._trailing_timer_fired, key
+                )
+                return False
+        entry.last_wake = now
+        entry.delivered = entry.state
+        return True
+
+    def _glitch_timer_fired(self, key):
+        entry = self._zones[key]
+        entry.glitch = None
+        if self._rate_limit(key, entry, self._limit(key)):
+            self._wake(entry.account, entry.zone_number)
+
+    def _trailing_timer_fired(self, key):
+        entry = self._zones[key]
+        entry.trailing = None
+        if entry.glitch is not None:
+            # The open is still being deglitched; it wakes the zone itself
+            return
+        if entry.delivered == entry.state:
+            return
+        entry.last_wake = time.monotonic()
+        entry.delivered = entry.state
+        self._wake(entry.account, entry.zone_number)
+
+    def cancel(self):
+        """Stop all pending wake-ups"""
+        for entry in self._zones.values():
+            for timer in (entry.trailing, entry.glitch):
+                if timer is not None:
+                    timer.cancel()
+            entry.trailing = None
+            entry.glitch = None
+
+    def getStats(self):
+        zones = {
+            "%s-%s" % (entry.account, entry.zone_number): {
+                "rate_limited": entry.rate_limited,
+                "deglitched": entry.deglitched,
+            }
+            for entry in self._zones.values()
+            if entry.rate_limited or entry.deglitched
+        }
+        return {
+            "rate_limited": sum(zone["rate_limited"] for zone in zones.values()),
+            "deglitched": sum(zone["deglitched"] for zone in zones.values()),
+            "zones": zones,
+        }
+
+    def getZoneStats(self, account, zone_number):
+        """Return the suppressed transition counts of one zone"""
+        try:
+            entry = self._zones.get((number_key(account), int(zone_number)))
+        except (ValueError, TypeError):
+            entry = None
+        if entry is None:
+            return {"rate_limited": 0, "deglitched": 0}
+        return {"rate_limited": entry.rate_limited, "deglitched": entry.deglitched}
@@ -1,12 +1,13 @@
 import pytest
-from custom_components.dmp.const import DOMAIN, LISTENER
+from custom_components.dmp import DMPRuntimeData
+from custom_components.dmp.const import DOMAIN
 
 
 @pytest.fixture
 def init_integration(hass, request):
     """
     Initialize hass.data for DMP integration based on provided fixtures.
-    Sets up DOMAIN entry with listener and config entry data.
+    Sets up the entry's runtime data with the listener and the config data.
     """
     # Only initialize if a mock_config_entry fixture is used
     if "mock_config_entry" not in request.fixturenames:
@@ -22,5 +23,5 @@ def init_integration(hass, request):
     # Populate hass.data
     hass.data.setdefault(DOMAIN, {})
     if listener is not None:
-        hass.data[DOMAIN][LISTENER] = listener
+        cfg.runtime_data = DMPRuntimeData(listener, None, None)
     hass.data[DOMAIN][cfg.entry_id] = cfg.data
@@ -7,9 +7,9 @@ from homeassistant.components.alarm_control_panel import AlarmControlPanelState
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.dmp.alarm_control_panel import DMPArea, async_setup_entry
+from custom_components.dmp import DMPRuntimeData
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
     CONF_PANEL_ACCOUNT_NUMBER,
     CONF_HOME_AREA,
     CONF_AWAY_AREA,
@@ -26,9 +26,8 @@ def mock_listener_panel():
     panel.updateArea = Mock()
     panel.getArea = Mock(return_value={"areaState": AlarmControlPanelState.DISARMED})
     panel.getContactTime = Mock()
-    panel._pydmp_panel = AsyncMock()
-    panel._pydmp_panel.arm_areas = AsyncMock()
-    panel._pydmp_panel.disarm_areas = AsyncMock()
+    panel.arm_areas = AsyncMock()
+    panel.disarm_areas = AsyncMock()
     listener.getPanels.return_value = {"12345": panel}
     listener.register_callback = Mock()
     listener.remove_callback = Mock()
@@ -57,8 +56,8 @@ async def test_async_setup_entry_creates_area_entity(
     """Test that async_setup_entry adds a DMPArea entity."""
     listener, panel = mock_listener_panel
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][LISTENER] = listener
     hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
     entities = []
 
     def async_add(ents, update_before_add=True):
@@ -76,8 +75,8 @@ def test_dmparea_initialization(
     """Verify DMPArea initializes with expected values."""
     listener, panel = mock_listener_panel
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][LISTENER] = listener
     hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
     area = DMPArea(listener, mock_config_entry.data)
     assert area._name == "Test Panel Arming Control"
     assert area._home_zone == "01"
@@ -88,40 +87,53 @@ def test_dmparea_initialization(
     )
 
 
+def test_dmparea_keeps_restored_state(mock_config_entry, mock_listener_panel):
+    """DMPArea keeps an area state restored from the snapshot."""
+    listener, panel = mock_listener_panel
+    panel.getArea.return_value = {
+        "areaName": "",
+        "areaState": AlarmControlPanelState.ARMED_AWAY,
+    }
+    area = DMPArea(listener, mock_config_entry.data)
+    panel.updateArea.assert_called_once_with(
+        {"areaName": area.name, "areaState": AlarmControlPanelState.ARMED_AWAY}
+    )
+
+
 @pytest.mark.asyncio
 async def test_alarm_disarm(mock_config_entry, mock_listener_panel):
-    """Verify disarm calls pydmp_panel.disarm_areas."""
+    """Verify disarm calls panel.disarm_areas."""
     listener, panel = mock_listener_panel
     area = DMPArea(listener, mock_config_entry.data)
     await area.async_alarm_disarm()
-    panel._pydmp_panel.disarm_areas.assert_awaited_once_with([1, 2, 3])
+    panel.disarm_areas.assert_awaited_once_with([1, 2, 3])
 
 
 @pytest.mark.asyncio
 async def test_alarm_arm_away(mock_config_entry, mock_listener_panel):
-    """Verify arm away calls pydmp_panel.arm_areas with all areas."""
+    """Verify arm away calls panel.arm_areas with all areas."""
     listener, panel = mock_listener_panel
     area = DMPArea(listener, mock_config_entry.data)
     await area.async_alarm_arm_away()
-    panel._pydmp_panel.arm_areas.assert_awaited_once_with([1, 2, 3])
+    panel.arm_areas.assert_awaited_once_with([1, 2, 3])
 
 
 @pytest.mark.asyncio
 async def test_alarm_arm_home(mock_config_entry, mock_listener_panel):
-    """Verify arm home calls pydmp_panel.arm_areas with home area."""
+    """Verify arm home calls panel.arm_areas with home area."""
     listener, panel = mock_listener_panel
     area = DMPArea(listener, mock_config_entry.data)
     await area.async_alarm_arm_home()
-    panel._pydmp_panel.arm_areas.assert_awaited_once_with([1])
+    panel.arm_areas.assert_awaited_once_with([1])
 
 
 @pytest.mark.asyncio
 async def test_alarm_arm_night(mock_config_entry, mock_listener_panel):
-    """Verify arm night calls pydmp_panel.arm_areas with instant=True."""
+    """Verify arm night calls panel.arm_areas with instant=True."""
     listener, panel = mock_listener_panel
     area = DMPArea(listener, mock_config_entry.data)
     await area.async_alarm_arm_night()
-    panel._pydmp_panel.arm_areas.assert_awaited_once_with([1], instant=True)
+    panel.arm_areas.assert_awaited_once_with([1], instant=True)
 
 
 @pytest.fixture
@@ -159,7 +171,7 @@ async def test_callbacks_and_properties(setup_area, mock_listener_panel):
     listener.register_callback.assert_called_with(area.process_area_callback)
 
     area.async_write_ha_state = Mock()
-    await area.process_area_callback()
+    area.process_area_callback()
     area.async_write_ha_state.assert_called_once()
 
     assert area.state == "armed"
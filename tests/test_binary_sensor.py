@@ -9,11 +9,10 @@ from custom_components.dmp.binary_sensor import (
     DMPZoneBattery,
     DMPZoneTrouble,
     DMPZoneAlarm,
-    DMPZoneBypass,
 )
+from custom_components.dmp import DMPRuntimeData
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
     CONF_ZONE_NAME,
     CONF_ZONE_NUMBER,
     CONF_ZONE_CLASS,
@@ -61,6 +60,8 @@ def mock_listener():
     listener.getPanels = Mock(return_value={"12345": panel})
     listener.register_callback = Mock()
     listener.remove_callback = Mock()
+    listener.register_zone_callback = Mock()
+    listener.remove_zone_callback = Mock()
     return listener
 
 
@@ -118,7 +119,7 @@ def test_device_class_mapping(
         CONF_ZONE_CLASS: zone_class,
     }
     sensor = DMPZoneOpenClose(hass, mock_config_entry, zone_config)
-    assert sensor._device_class == expected_device_class
+    assert sensor.device_class == expected_device_class
 
 
 @pytest.mark.parametrize(
@@ -164,7 +165,7 @@ def test_battery_sensor_initialization(setup_battery_sensor, mock_config_entry):
         CONF_ZONE_CLASS: "battery_window",
     }
     sensor = DMPZoneBattery(hass, mock_config_entry, zone_config)
-    assert sensor._device_class == "battery"
+    assert sensor.device_class == "battery"
     assert sensor.name == "Test Battery Battery"
     assert sensor.is_on is False
     panel.ensure_zone.assert_called()
@@ -192,8 +193,8 @@ def setup_trouble_sensor(hass: HomeAssistant, mock_config_entry, mock_listener):
     hass.data.setdefault(DOMAIN, {})
     panel = mock_listener.getPanels()["12345"]
     panel.getContactTime = Mock(return_value="t1")
-    hass.data[DOMAIN][LISTENER] = mock_listener
     hass.data[DOMAIN][mock_config_entry.entry_id] = {CONF_PANEL_ACCOUNT_NUMBER: "12345"}
+    mock_config_entry.runtime_data = DMPRuntimeData(mock_listener, None, None)
     return hass, panel
 
 
@@ -206,7 +207,7 @@ def test_trouble_sensor_initialization(setup_trouble_sensor, mock_config_entry):
         CONF_ZONE_CLASS: "wired_motion",
     }
     sensor = DMPZoneTrouble(hass, mock_config_entry, zone_config)
-    assert sensor._device_class == "problem"
+    assert sensor.device_class == "problem"
     assert sensor.name == "Test Trouble Trouble"
     assert sensor.is_on is False
     panel.ensure_zone.assert_called()
@@ -228,56 +229,14 @@ def test_trouble_icon(setup_trouble_sensor, mock_config_entry, state, icon):
     assert sensor.icon == icon
 
 
-@pytest.fixture
-def setup_bypass_sensor(hass: HomeAssistant, mock_config_entry, mock_listener):
-    """Set up a bypass binary sensor with mocked dependencies."""
-    hass.data.setdefault(DOMAIN, {})
-    panel = mock_listener.getPanels()["12345"]
-    panel.getContactTime = Mock(return_value="t3")
-    hass.data[DOMAIN][LISTENER] = mock_listener
-    hass.data[DOMAIN][mock_config_entry.entry_id] = {CONF_PANEL_ACCOUNT_NUMBER: "12345"}
-    return hass, panel
-
-
-def test_bypass_sensor_initialization(setup_bypass_sensor, mock_config_entry):
-    """Validate bypass sensor initialization settings."""
-    hass, panel = setup_bypass_sensor
-    zone_config = {
-        CONF_ZONE_NAME: "Test Bypass",
-        CONF_ZONE_NUMBER: "013",
-        CONF_ZONE_CLASS: "wired_door",
-    }
-    sensor = DMPZoneBypass(hass, mock_config_entry, zone_config)
-    assert sensor._device_class == "problem"
-    assert sensor.name == "Test Bypass Bypass"
-    assert sensor.is_on is False
-    panel.ensure_zone.assert_called()
-
-
-@pytest.mark.parametrize(
-    "state,icon", [(False, "mdi:check"), (True, "mdi:alert-outline")]
-)
-def test_bypass_icon(setup_bypass_sensor, mock_config_entry, state, icon):
-    """Ensure bypass sensor icon reflects state."""
-    hass, panel = setup_bypass_sensor
-    zone_config = {
-        CONF_ZONE_NAME: "Test Bypass",
-        CONF_ZONE_NUMBER: "013",
-        CONF_ZONE_CLASS: "wired_door",
-    }
-    sensor = DMPZoneBypass(hass, mock_config_entry, zone_config)
-    sensor._state = state
-    assert sensor.icon == icon
-
-
 @pytest.fixture
 def setup_alarm_sensor(hass: HomeAssistant, mock_config_entry, mock_listener):
     """Set up an alarm binary sensor with mocked dependencies."""
     hass.data.setdefault(DOMAIN, {})
     panel = mock_listener.getPanels()["12345"]
     panel.getContactTime = Mock(return_value="t2")
-    hass.data[DOMAIN][LISTENER] = mock_listener
     hass.data[DOMAIN][mock_config_entry.entry_id] = {CONF_PANEL_ACCOUNT_NUMBER: "12345"}
+    mock_config_entry.runtime_data = DMPRuntimeData(mock_listener, None, None)
     return hass, panel
 
 
@@ -290,7 +249,7 @@ def test_alarm_sensor_initialization(setup_alarm_sensor, mock_config_entry):
         CONF_ZONE_CLASS: "wired_motion",
     }
     sensor = DMPZoneAlarm(hass, mock_config_entry, zone_config)
-    assert sensor._device_class == "problem"
+    assert sensor.device_class == "problem"
     assert sensor.name == "Test Alarm Alarm"
     assert sensor.is_on is False
 
@@ -322,7 +281,6 @@ def test_alarm_icon(setup_alarm_sensor, mock_config_entry, state, icon):
             "battery_window",
         ),
         ("setup_trouble_sensor", DMPZoneTrouble, "Test Trouble", "011", "wired_motion"),
-        ("setup_bypass_sensor", DMPZoneBypass, "Test Bypass", "013", "wired_door"),
         ("setup_alarm_sensor", DMPZoneAlarm, "Test Alarm", "012", "wired_motion"),
     ],
 )
@@ -353,22 +311,24 @@ async def test_sensor_callbacks_general(
         sensor._zone.state = "L"
     elif sensor_cls == DMPZoneTrouble:
         sensor._zone.has_fault = True
-    elif sensor_cls == DMPZoneBypass:
-        sensor._zone.is_bypassed = True
     elif sensor_cls == DMPZoneAlarm:
         panel.get_alarm = Mock(return_value=True)
 
-    await sensor.process_zone_callback()
+    sensor.process_zone_callback()
     assert sensor._state is True
     sensor.async_write_ha_state.assert_called_once()
     await sensor.async_added_to_hass()
-    mock_listener.register_callback.assert_called_with(sensor.process_zone_callback)
+    mock_listener.register_zone_callback.assert_called_with(
+        "12345", zone_number, sensor.process_zone_callback
+    )
     await sensor.async_will_remove_from_hass()
-    mock_listener.remove_callback.assert_called_with(sensor.process_zone_callback)
+    mock_listener.remove_zone_callback.assert_called_with(
+        "12345", zone_number, sensor.process_zone_callback
+    )
 
 
 @pytest.mark.parametrize(
-    "setup_fixture,sensor_cls,zone_name,zone_number,zone_class,attr_time,device_class,name_suffix,unique_suffix,info_name",
+    "setup_fixture,sensor_cls,zone_name,zone_number,zone_class,attr_time,device_class,name_suffix,unique_suffix",
     [
         (
             "setup_sensor",
@@ -380,7 +340,6 @@ async def test_sensor_callbacks_general(
             "door",
             "",
             "openclose",
-            "Front Door",
         ),
         (
             "setup_battery_sensor",
@@ -392,7 +351,6 @@ async def test_sensor_callbacks_general(
             "battery",
             " Battery",
             "battery",
-            "Test Battery Battery",
         ),
         (
             "setup_trouble_sensor",
@@ -404,7 +362,6 @@ async def test_sensor_callbacks_general(
             "problem",
             " Trouble",
             "trouble",
-            "Test Trouble Trouble",
         ),
         (
             "setup_alarm_sensor",
@@ -416,19 +373,6 @@ async def test_sensor_callbacks_general(
             "problem",
             " Alarm",
             "alarm",
-            "Test Alarm",
-        ),
-        (
-            "setup_bypass_sensor",
-            DMPZoneBypass,
-            "Test Bypass",
-            "013",
-            "wired_door",
-            "t3",
-            "problem",
-            " Bypass",
-            "bypass",
-            "Test Bypass Bypass",
         ),
     ],
 )
@@ -443,7 +387,6 @@ def test_sensor_properties_general(
     device_class,
     name_suffix,
     unique_suffix,
-    info_name,
     mock_config_entry,
     mock_listener,
 ):
@@ -460,8 +403,10 @@ def test_sensor_properties_general(
     assert sensor.name == f"{zone_name}{name_suffix}"
     assert sensor.should_poll is False
     assert sensor.device_class == device_class
-    assert sensor.extra_state_attributes == {"last_contact": attr_time}
+    # last contact lives on the panel sensor, not on every zone entity
+    assert sensor.extra_state_attributes is None
     assert sensor.unique_id == f"dmp-12345-zone-{zone_number}-{unique_suffix}"
     info = sensor.device_info
     assert info["identifiers"] == {(DOMAIN, f"dmp-12345-zone-{zone_number}")}
-    assert info["name"] == info_name
+    # every entity of a zone shares the zone device
+    assert info["name"] == zone_name
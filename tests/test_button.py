@@ -67,14 +67,26 @@ async def test_async_press_and_callbacks(hass: HomeAssistant, mock_config_entry,
     await btn.async_will_remove_from_hass()
     mock_listener.remove_callback.assert_called_once_with(btn.process_zone_callback)
 
+    btn.async_write_ha_state = Mock()
     await btn.async_press()
     mock_listener.updateStatus.assert_awaited_once()
+    # The refreshed attributes are written even when nothing changed
+    btn.async_write_ha_state.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_process_zone_callback(hass: HomeAssistant, mock_config_entry, mock_listener):
     """Confirm process_zone_callback writes state."""
     btn = DMPRefreshStatusButton(hass, mock_config_entry)
     btn.async_write_ha_state = Mock()
-    await btn.process_zone_callback()
+    btn.process_zone_callback()
     btn.async_write_ha_state.assert_called_once()
 
+
+
+def test_button_available_follows_connection(hass: HomeAssistant, mock_config_entry, mock_listener):
+    """The refresh button is unavailable while the panel is not connected."""
+    btn = DMPRefreshStatusButton(hass, mock_config_entry)
+    mock_listener.isConnected.return_value = False
+    assert btn.available is False
+    mock_listener.isConnected.return_value = True
+    assert btn.available is True
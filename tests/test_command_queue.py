@@ -0,0 +1,176 @@
+"""Tests for the serialized panel command queue."""
+
+import asyncio
+import pytest
+
+from custom_components.dmp import command_queue
+from custom_components.dmp.command_queue import DMPCommandQueue
+from custom_components.dmp.const import (
+    COMMAND_PRIORITY_ARMING,
+    COMMAND_PRIORITY_BYPASS,
+    COMMAND_PRIORITY_STATUS,
+)
+
+
+def _recorder(order, name, gate=None):
+    async def command():
+        if gate is not None:
+            await gate.wait()
+        order.append(name)
+        return name
+
+    command.__name__ = name
+    return command
+
+
+@pytest.mark.asyncio
+async def test_commands_run_one_at_a_time_by_priority():
+    """Queued commands run serially, arming before bypass before status."""
+    queue = DMPCommandQueue()
+    order = []
+    gate = asyncio.Event()
+
+    first = asyncio.ensure_future(
+        queue.submit(COMMAND_PRIORITY_STATUS, _recorder(order, "first", gate))
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.ensure_future(
+            queue.submit(COMMAND_PRIORITY_BYPASS, _recorder(order, "bypass"))
+        ),
+        asyncio.ensure_future(
+            queue.submit(COMMAND_PRIORITY_STATUS, _recorder(order, "status"))
+        ),
+        asyncio.ensure_future(
+            queue.submit(COMMAND_PRIORITY_ARMING, _recorder(order, "disarm"))
+        ),
+    ]
+    await asyncio.sleep(0)
+    assert queue.getStats()["depth"] == 3
+
+    gate.set()
+    results = await asyncio.gather(first, *waiting)
+
+    assert order == ["first", "disarm", "bypass", "status"]
+    assert results == ["first", "bypass", "status", "disarm"]
+    stats = queue.getStats()
+    assert stats["depth"] == 0
+    assert stats["wait"]["arming"]["commands"] == 1
+    assert stats["wait"]["status"]["commands"] == 2
+    assert queue._worker is None
+
+
+@pytest.mark.asyncio
+async def test_waiting_status_query_supersedes_new_ones():
+    """A status query joins the one already waiting in the queue."""
+    queue = DMPCommandQueue()
+    order = []
+    gate = asyncio.Event()
+
+    busy = asyncio.ensure_future(
+        queue.submit(COMMAND_PRIORITY_BYPASS, _recorder(order, "bypass", gate))
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    statuses = [
+        asyncio.ensure_future(
+            queue.submit(COMMAND_PRIORITY_STATUS, _recorder(order, "status"))
+        )
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    gate.set()
+    await asyncio.gather(busy, *statuses)
+
+    assert order == ["bypass", "status"]
+    assert queue.getStats()["superseded_status"] == 2
+
+
+@pytest.mark.asyncio
+async def test_command_timeout(monkeypatch):
+    """A command exceeding its timeout fails and is counted."""
+    monkeypatch.setitem(command_queue.COMMAND_TIMEOUTS, COMMAND_PRIORITY_BYPASS, 0.01)
+    queue = DMPCommandQueue()
+
+    async def stuck():
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        await queue.submit(COMMAND_PRIORITY_BYPASS, stuck)
+    assert queue.getStats()["wait"]["bypass"]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_command_errors_reach_the_caller():
+    """Errors are raised to the caller and do not stop the queue."""
+    queue = DMPCommandQueue()
+
+    async def failing():
+        raise ConnectionError("panel offline")
+
+    async def working(value):
+        return value
+
+    with pytest.raises(ConnectionError):
+        await queue.submit(COMMAND_PRIORITY_ARMING, failing)
+    assert await queue.submit(COMMAND_PRIORITY_ARMING, working, 5) == 5
+
+
+@pytest.mark.asyncio
+async def test_command_timeout_override():
+    """An explicit timeout replaces the per-priority default."""
+    queue = DMPCommandQueue()
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    with pytest.raises(TimeoutError):
+        await queue.submit(COMMAND_PRIORITY_ARMING, slow, timeout=0.01)
+    assert queue.getStats()["wait"]["arming"]["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_command_does_not_stop_the_queue():
+    """A command cancelled inside pyDMP only fails that command."""
+    queue = DMPCommandQueue()
+
+    async def cancelled():
+        raise asyncio.CancelledError
+
+    async def working(value):
+        return value
+
+    first = asyncio.ensure_future(queue.submit(COMMAND_PRIORITY_BYPASS, cancelled))
+    second = asyncio.ensure_future(queue.submit(COMMAND_PRIORITY_BYPASS, working, 3))
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert await second == 3
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_running_and_queued_commands():
+    """Closing the queue releases every caller and stops the worker."""
+    queue = DMPCommandQueue()
+    order = []
+    gate = asyncio.Event()
+
+    running = asyncio.ensure_future(
+        queue.submit(COMMAND_PRIORITY_BYPASS, _recorder(order, "running", gate))
+    )
+    await asyncio.sleep(0)
+    queued = asyncio.ensure_future(
+        queue.submit(COMMAND_PRIORITY_ARMING, _recorder(order, "queued"))
+    )
+    await asyncio.sleep(0)
+
+    queue.close()
+    results = await asyncio.wait_for(
+        asyncio.gather(running, queued, return_exceptions=True), 1
+    )
+
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert order == []
+    assert queue.getStats()["depth"] == 0
@@ -1,6 +1,7 @@
 """Test config flow for DMP integration."""
 
 import pytest
+import voluptuous as vol
 from unittest.mock import patch, PropertyMock, Mock
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
@@ -15,6 +16,18 @@ from custom_components.dmp.const import (
     CONF_HOME_AREA,
     CONF_AWAY_AREA,
     CONF_ADD_ANOTHER,
+    CONF_ZONE_DEGLITCH,
+    CONF_ZONE_RATE_LIMITS,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_INGEST_QUEUE_SIZE,
+    CONF_INGEST_OVERFLOW,
+    CONF_DUPLICATE_WINDOW,
+    CONF_LAST_CONTACT_THROTTLE,
+    CONF_RECONCILE_MIN_INTERVAL,
+    CONF_RECONCILE_MAX_INTERVAL,
+    CONF_COMPACT_ZONES,
+    DEFAULT_EVENT_BATCH_WINDOW,
+    INGEST_OVERFLOW_DROP_OLDEST,
 )
 
 pytestmark = pytest.mark.asyncio
@@ -305,6 +318,185 @@ async def test_options_flow_no_changes(
             assert len(call_args.kwargs["data"][CONF_ZONES]) == 2
 
 
+async def test_options_flow_zone_filters(
+    hass: HomeAssistant, options_flow, mock_entity_registry
+):
+    """Test setting the chattering zone rate limits and deglitch time."""
+    user_input = {
+        CONF_ZONES: ["001", "002"],
+        CONF_ZONE_NAME: "",
+        CONF_ZONE_NUMBER: "",
+        CONF_ZONE_CLASS: "default",
+        "zone_rate_limits_motion": 5.0,
+        "zone_rate_limits_door": 0.0,
+        CONF_ZONE_DEGLITCH: 250,
+    }
+
+    with patch(
+        "homeassistant.helpers.entity_registry.async_entries_for_config_entry"
+    ) as mock_entries:
+        mock_entries.return_value = []
+
+        with patch.object(
+            options_flow, "async_create_entry", return_value=None
+        ) as mock_create:
+            await options_flow.async_step_init(user_input)
+            data = mock_create.call_args.kwargs["data"]
+            # Limits left at 0 are off and not stored
+            assert data[CONF_ZONE_RATE_LIMITS] == {"motion": 5.0}
+            assert data[CONF_ZONE_DEGLITCH] == 250
+            # Settings left out of the form keep their current value
+            assert data[CONF_EVENT_BATCH_WINDOW] == DEFAULT_EVENT_BATCH_WINDOW
+
+
+async def test_options_flow_last_contact_throttle(
+    hass: HomeAssistant, options_flow, mock_entity_registry
+):
+    """Test setting the last contact throttle."""
+    user_input = {
+        CONF_ZONES: ["001", "002"],
+        CONF_ZONE_CLASS: "default",
+        CONF_LAST_CONTACT_THROTTLE: 30.0,
+    }
+
+    with patch(
+        "homeassistant.helpers.entity_registry.async_entries_for_config_entry"
+    ) as mock_entries:
+        mock_entries.return_value = []
+
+        with patch.object(
+            options_flow, "async_create_entry", return_value=None
+        ) as mock_create:
+            await options_flow.async_step_init(user_input)
+            data = mock_create.call_args.kwargs["data"]
+            assert data[CONF_LAST_CONTACT_THROTTLE] == 30.0
+
+
+async def test_options_flow_event_windows(
+    hass: HomeAssistant, options_flow, mock_entity_registry
+):
+    """Test setting the event coalescing and duplicate windows."""
+    user_input = {
+        CONF_ZONES: ["001", "002"],
+        CONF_ZONE_CLASS: "default",
+        CONF_EVENT_BATCH_WINDOW: 0.2,
+        CONF_DUPLICATE_WINDOW: 5.0,
+    }
+
+    with patch(
+        "homeassistant.helpers.entity_registry.async_entries_for_config_entry"
+    ) as mock_entries:
+        mock_entries.return_value = []
+
+        result = await options_flow.async_step_init()
+        assert CONF_EVENT_BATCH_WINDOW in result["data_schema"].schema
+
+        with patch.object(
+            options_flow, "async_create_entry", return_value=None
+        ) as mock_create:
+            await options_flow.async_step_init(user_input)
+            data = mock_create.call_args.kwargs["data"]
+            assert data[CONF_EVENT_BATCH_WINDOW] == 0.2
+            assert data[CONF_DUPLICATE_WINDOW] == 5.0
+
+
+async def test_options_flow_ingest_queue(
+    hass: HomeAssistant, options_flow, mock_entity_registry
+):
+    """Test the ingest queue size and overflow policy fields."""
+    with patch(
+        "homeassistant.helpers.entity_registry.async_entries_for_config_entry"
+    ) as mock_entries:
+        mock_entries.return_value = []
+
+        result = await options_flow.async_step_init()
+        schema = result["data_schema"]
+        valid = schema(
+            {
+                CONF_ZONES: ["001"],
+                CONF_INGEST_QUEUE_SIZE: "64",
+                CONF_INGEST_OVERFLOW: INGEST_OVERFLOW_DROP_OLDEST,
+            }
+        )
+        assert valid[CONF_INGEST_QUEUE_SIZE] == 64
+        assert valid[CONF_INGEST_OVERFLOW] == INGEST_OVERFLOW_DROP_OLDEST
+        with pytest.raises(vol.Invalid):
+            schema({CONF_ZONES: ["001"], CONF_INGEST_QUEUE_SIZE: 0})
+        with pytest.raises(vol.Invalid):
+            schema({CONF_ZONES: ["001"], CONF_INGEST_OVERFLOW: "drop_newest"})
+
+        with patch.object(
+            options_flow, "async_create_entry", return_value=None
+        ) as mock_create:
+            await options_flow.async_step_init(valid)
+            data = mock_create.call_args.kwargs["data"]
+            assert data[CONF_INGEST_QUEUE_SIZE] == 64
+            assert data[CONF_INGEST_OVERFLOW] == INGEST_OVERFLOW_DROP_OLDEST
+
+
+async def test_options_flow_reconcile_intervals(
+    hass: HomeAssistant, options_flow, mock_entity_registry
+):
+    """Test the reconciliation poll bounds."""
+    user_input = {
+        CONF_ZONES: ["001", "002"],
+        CONF_ZONE_CLASS: "default",
+        CONF_RECONCILE_MIN_INTERVAL: 300,
+        CONF_RECONCILE_MAX_INTERVAL: 120,
+    }
+
+    with patch(
+        "homeassistant.helpers.entity_registry.async_entries_for_config_entry"
+    ) as mock_entries:
+        mock_entries.return_value = []
+
+        # The longest interval may not be shorter than the shortest one
+        result = await options_flow.async_step_init(user_input)
+        assert result["type"] == FlowResultType.FORM
+        assert result["errors"] == {CONF_RECONCILE_MAX_INTERVAL: "reconcile_interval"}
+
+        # 0 turns the poll off
+        user_input[CONF_RECONCILE_MAX_INTERVAL] = 0
+        with patch.object(
+            options_flow, "async_create_entry", return_value=None
+        ) as mock_create:
+            await options_flow.async_step_init(user_input)
+            data = mock_create.call_args.kwargs["data"]
+            assert data[CONF_RECONCILE_MIN_INTERVAL] == 300
+            assert data[CONF_RECONCILE_MAX_INTERVAL] == 0
+
+
+async def test_options_flow_compact_zones(
+    hass: HomeAssistant, options_flow, mock_entity_registry, mock_config_entry
+):
+    """Test switching an existing entry to compact zones."""
+    user_input = {
+        CONF_ZONES: ["001", "002"],
+        CONF_ZONE_CLASS: "default",
+        CONF_COMPACT_ZONES: True,
+    }
+
+    with patch(
+        "homeassistant.helpers.entity_registry.async_entries_for_config_entry"
+    ) as mock_entries:
+        mock_entries.return_value = []
+
+        result = await options_flow.async_step_init()
+        assert result["data_schema"]({CONF_ZONES: []})[CONF_COMPACT_ZONES] is False
+
+        with patch.object(
+            options_flow, "async_create_entry", return_value=None
+        ) as mock_create:
+            await options_flow.async_step_init(user_input)
+            data = mock_create.call_args.kwargs["data"]
+            assert data[CONF_COMPACT_ZONES] is True
+
+        # The form starts from the entry's current mode
+        mock_config_entry.data[CONF_COMPACT_ZONES] = True
+        result = await options_flow.async_step_init()
+        assert result["data_schema"]({CONF_ZONES: []})[CONF_COMPACT_ZONES] is True
+
+
 async def test_options_flow_zone_dict_creation(
     hass: HomeAssistant, options_flow, mock_entity_registry
 ):
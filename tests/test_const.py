@@ -8,7 +8,6 @@ import custom_components.dmp.const as const
     "const_name,expected",
     [
         ("DOMAIN", "dmp"),
-        ("LISTENER", "dmp_listener"),
     ],
 )
 def test_component_constants(const_name, expected):
@@ -26,6 +25,14 @@ def test_component_constants(const_name, expected):
         ("CONF_PANEL_REMOTE_PORT", "remote_port"),
         ("CONF_PANEL_ACCOUNT_NUMBER", "account_number"),
         ("CONF_PANEL_REMOTE_KEY", "remote_key"),
+        ("CONF_EVENT_BATCH_WINDOW", "event_batch_window"),
+        ("CONF_INGEST_QUEUE_SIZE", "ingest_queue_size"),
+        ("CONF_INGEST_OVERFLOW", "ingest_overflow"),
+        ("CONF_FAST_S3_PARSER", "fast_s3_parser"),
+        ("CONF_DUPLICATE_WINDOW", "duplicate_window"),
+        ("CONF_LAST_CONTACT_THROTTLE", "last_contact_throttle"),
+        ("CONF_RECONCILE_MIN_INTERVAL", "reconcile_min_interval"),
+        ("CONF_RECONCILE_MAX_INTERVAL", "reconcile_max_interval"),
         ("CONF_HOME_AREA", "home_zone"),
         ("CONF_AWAY_AREA", "away_zone"),
         ("CONF_LOCK_NAME", "door_name"),
@@ -82,8 +89,40 @@ def test_attribute_constants(const_name, expected):
     "const_name,expected",
     [
         ("PANEL_ALL_AREAS", "010203"),
-        ("PYDMP_PANEL", "pydmp_panel"),
-        ("STATUS_SERVER", "status_server"),
+        ("DEFAULT_EVENT_BATCH_WINDOW", 0.05),
+        ("DEFAULT_INGEST_QUEUE_SIZE", 256),
+        ("INGEST_OVERFLOW_BLOCK", "block"),
+        ("INGEST_OVERFLOW_DROP_OLDEST", "drop_oldest"),
+        ("DEFAULT_INGEST_OVERFLOW", "block"),
+        ("DEFAULT_DUPLICATE_WINDOW", 2.0),
+        ("DUPLICATE_CACHE_SIZE", 512),
+        ("DEFAULT_LAST_CONTACT_THROTTLE", 0),
+        ("DEFAULT_RECONCILE_MIN_INTERVAL", 60),
+        ("DEFAULT_RECONCILE_MAX_INTERVAL", 900),
+        ("SNAPSHOT_STORAGE_VERSION", 1),
+        ("SNAPSHOT_STORAGE_KEY", "dmp.snapshot.%s"),
+        ("SNAPSHOT_SAVE_DELAY", 10),
+        ("CONNECTION_CONNECTING", "connecting"),
+        ("CONNECTION_CONNECTED", "connected"),
+        ("CONNECTION_DEGRADED", "degraded"),
+        ("CONNECTION_OFFLINE", "offline"),
+        ("RECONNECT_BASE_DELAY", 5),
+        ("RECONNECT_MAX_DELAY", 300),
+        ("RECONNECT_OFFLINE_AFTER", 3),
+        ("CONNECTION_CHECK_INTERVAL", 10),
+        ("COMMAND_PRIORITY_ARMING", 0),
+        ("COMMAND_PRIORITY_BYPASS", 1),
+        ("COMMAND_PRIORITY_STATUS", 2),
+        ("COMMAND_TIMEOUTS", {0: 15, 1: 15, 2: 60}),
+        ("SERVICE_BYPASS_ZONES", "bypass_zones"),
+        ("SERVICE_RESTORE_ZONES", "restore_zones"),
+        ("ATTR_ZONES", "zones"),
+        ("SERVICE_ARM_WITH_BYPASS", "arm_with_bypass"),
+        ("ATTR_MODE", "mode"),
+        ("ARM_MODE_AWAY", "away"),
+        ("ARM_MODE_HOME", "home"),
+        ("ARM_MODE_NIGHT", "night"),
+        ("STATUS_SERVERS", "status_servers"),
     ],
 )
 def test_other_constants(const_name, expected):
@@ -0,0 +1,60 @@
+"""Tests for DMP config entry diagnostics."""
+
+import pytest
+from unittest.mock import Mock
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dmp.diagnostics import async_get_config_entry_diagnostics
+from custom_components.dmp.const import DOMAIN
+
+pytestmark = pytest.mark.usefixtures("init_integration")
+
+
+@pytest.fixture
+def mock_config_entry():
+    """Create a mock config entry."""
+    return MockConfigEntry(domain=DOMAIN, data={}, entry_id="test_entry_id")
+
+
+@pytest.fixture
+def mock_listener():
+    """Create a mock listener with diagnostic counters."""
+    listener = Mock()
+    listener.getConnectionState = Mock(return_value="connected")
+    listener.getSuppressedWrites = Mock(return_value=7)
+    listener.getIngestStats = Mock(return_value={"enqueued": 3, "dropped": 0})
+    listener.getPanelIngestStats = Mock(return_value={"12345": {"enqueued": 3}})
+    listener.getDuplicateCount = Mock(return_value=2)
+    listener.getZoneFilterStats = Mock(
+        return_value={"rate_limited": 6, "deglitched": 1, "zones": {}}
+    )
+    listener.getCoalescedStatusRequests = Mock(return_value=5)
+    listener.getReconcileStats = Mock(return_value={"polls": 4, "corrections": 1})
+    listener.getStartupStats = Mock(return_value={"restored_zones": 12})
+    panel = Mock()
+    panel.getCommandStats = Mock(return_value={"depth": 0})
+    listener.getPanels = Mock(return_value={"12345": panel})
+    return listener
+
+
+@pytest.mark.asyncio
+async def test_diagnostics(hass: HomeAssistant, mock_config_entry, mock_listener):
+    """Diagnostics report listener counters."""
+    status_server = Mock()
+    status_server.getStats.return_value = {"port": 40001, "accounts": 2}
+    mock_config_entry.runtime_data.status_server = status_server
+    result = await async_get_config_entry_diagnostics(hass, mock_config_entry)
+    assert result == {
+        "connection": "connected",
+        "suppressed_writes": 7,
+        "ingest": {"enqueued": 3, "dropped": 0},
+        "panel_ingest": {"12345": {"enqueued": 3}},
+        "duplicates": 2,
+        "zone_filter": {"rate_limited": 6, "deglitched": 1, "zones": {}},
+        "coalesced_status_requests": 5,
+        "reconcile": {"polls": 4, "corrections": 1},
+        "startup": {"restored_zones": 12},
+        "status_server": {"port": 40001, "accounts": 2},
+        "commands": {"12345": {"depth": 0}},
+    }
@@ -0,0 +1,207 @@
+"""Tests for the shared DMPZoneEntity base."""
+
+import pytest
+from unittest.mock import Mock
+from homeassistant.components.binary_sensor import BinarySensorEntityDescription
+from homeassistant.components.sensor import SensorEntityDescription
+from homeassistant.components.switch import SwitchEntityDescription
+from homeassistant.core import HomeAssistant
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dmp import DMPPanel, DMPRuntimeData
+from custom_components.dmp.binary_sensor import (
+    ZONE_BINARY_SENSORS,
+    DMPZoneBattery,
+    DMPZoneOpenClose,
+)
+from custom_components.dmp.entity import create_zone_entities, zone_kind
+from custom_components.dmp.sensor import DMPCompactZoneStatus, DMPZoneStatus
+from custom_components.dmp.switch import DMPZoneBypassSwitch
+from custom_components.dmp.const import (
+    DOMAIN,
+    CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_ZONE_NAME,
+    CONF_ZONE_NUMBER,
+    CONF_ZONE_CLASS,
+)
+
+pytestmark = pytest.mark.usefixtures("init_integration")
+
+
+@pytest.fixture
+def mock_config_entry():
+    """Create a mock config entry."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        data={CONF_PANEL_ACCOUNT_NUMBER: "12345"},
+        entry_id="test_entry_id",
+    )
+
+
+@pytest.fixture
+def mock_listener():
+    """Create a mock listener with a single panel and zone."""
+    listener = Mock()
+    panel = Mock()
+    zone = Mock()
+    zone.is_open = False
+    panel.ensure_zone = Mock(return_value=zone)
+    listener.getPanels = Mock(return_value={"12345": panel})
+    return listener
+
+
+@pytest.fixture
+def sensor(hass: HomeAssistant, mock_config_entry, mock_listener):
+    """Create an open/close sensor with a mocked state writer."""
+    entity = DMPZoneOpenClose(
+        hass,
+        mock_config_entry,
+        {
+            CONF_ZONE_NAME: "Front Door",
+            CONF_ZONE_NUMBER: "001",
+            CONF_ZONE_CLASS: "wired_door",
+        },
+    )
+    entity.async_write_ha_state = Mock()
+    return entity
+
+
+@pytest.mark.asyncio
+async def test_unchanged_state_is_not_written(sensor, mock_listener):
+    """Repeated callbacks with no change only write once."""
+    sensor.process_zone_callback()
+    sensor.process_zone_callback()
+    sensor.process_zone_callback()
+
+    sensor.async_write_ha_state.assert_called_once()
+    assert sensor.suppressed_writes == 2
+    assert mock_listener.record_suppressed_write.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_state_transition_is_written(sensor):
+    """A real transition is always written."""
+    sensor.process_zone_callback()
+    sensor._zone.is_open = True
+    sensor.process_zone_callback()
+
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.suppressed_writes == 0
+
+
+def test_zone_entities_share_device_info(
+    hass: HomeAssistant, mock_config_entry, sensor
+):
+    """Every entity of a zone reuses one DeviceInfo named after the zone."""
+    zone_config = {
+        CONF_ZONE_NAME: "Front Door",
+        CONF_ZONE_NUMBER: "001",
+        CONF_ZONE_CLASS: "wired_door",
+    }
+    battery = DMPZoneBattery(hass, mock_config_entry, zone_config)
+    switch = DMPZoneBypassSwitch(hass, mock_config_entry, zone_config)
+
+    assert battery.device_info is sensor.device_info
+    assert switch.device_info is sensor.device_info
+    assert sensor.device_info["name"] == "Front Door"
+    assert battery.name == "Front Door Battery"
+    assert battery.unique_id == "dmp-12345-zone-001-battery"
+    assert not hasattr(sensor, "_name")
+
+
+@pytest.mark.parametrize(
+    "zone_class,expected",
+    [
+        ("battery_window", ("window", True)),
+        ("wired_glassbreak", ("glassbreak", False)),
+        ("default", ("default", False)),
+        (None, ("default", False)),
+    ],
+)
+def test_zone_kind(zone_class, expected):
+    """Zone classes split into kind and battery power."""
+    assert zone_kind(zone_class) == expected
+
+
+def test_create_zone_entities_single_pass(
+    hass: HomeAssistant, mock_config_entry, mock_listener
+):
+    """Descriptions are matched per zone class and created in table order."""
+    zones = [
+        {
+            CONF_ZONE_NAME: "Door",
+            CONF_ZONE_NUMBER: "001",
+            CONF_ZONE_CLASS: "wired_door",
+        },
+        {
+            CONF_ZONE_NAME: "Window",
+            CONF_ZONE_NUMBER: "002",
+            CONF_ZONE_CLASS: "battery_window",
+        },
+        {
+            CONF_ZONE_NAME: "Smoke",
+            CONF_ZONE_NUMBER: "003",
+            CONF_ZONE_CLASS: "wired_smoke",
+        },
+    ]
+    entities = create_zone_entities(hass, mock_config_entry, zones, ZONE_BINARY_SENSORS)
+
+    assert [(type(e).__name__, e.unique_id) for e in entities] == [
+        ("DMPZoneOpenClose", "dmp-12345-zone-001-openclose"),
+        ("DMPZoneTrouble", "dmp-12345-zone-001-trouble"),
+        ("DMPZoneAlarm", "dmp-12345-zone-001-alarm"),
+        ("DMPZoneOpenClose", "dmp-12345-zone-002-openclose"),
+        ("DMPZoneBattery", "dmp-12345-zone-002-battery"),
+        ("DMPZoneTrouble", "dmp-12345-zone-002-trouble"),
+        ("DMPZoneAlarm", "dmp-12345-zone-002-alarm"),
+        ("DMPZoneTrouble", "dmp-12345-zone-003-trouble"),
+    ]
+    window = entities[3]
+    assert window.device_class == "window"
+    assert window.icon == "mdi:window-closed"
+
+
+@pytest.mark.parametrize(
+    "entity_classes,description_cls",
+    [
+        (ZONE_BINARY_SENSORS, BinarySensorEntityDescription),
+        ((DMPZoneStatus,), SensorEntityDescription),
+        ((DMPZoneBypassSwitch,), SwitchEntityDescription),
+    ],
+)
+def test_descriptions_match_platform(entity_classes, description_cls):
+    """Platform base classes read platform fields from the description."""
+    for entity_cls in entity_classes:
+        for description in entity_cls.zone_descriptions:
+            assert isinstance(description, description_cls)
+
+
+def test_entities_start_from_restored_snapshot(hass: HomeAssistant, mock_config_entry):
+    """Zone entities created after a snapshot restore show the restored state."""
+    pydmp_panel = Mock()
+    pydmp_panel._zones = {}
+    panel = DMPPanel(hass, {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, pydmp_panel)
+    panel.restoreSnapshot({"zones": {"1": "O", "2": "N"}, "alarms": ["2"]})
+    listener = Mock()
+    listener.getPanels = Mock(return_value={"12345": panel})
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, pydmp_panel, None)
+    hass.data.setdefault(DOMAIN, {})[mock_config_entry.entry_id] = {
+        CONF_PANEL_ACCOUNT_NUMBER: "12345"
+    }
+    door = {
+        CONF_ZONE_NAME: "Front Door",
+        CONF_ZONE_NUMBER: "001",
+        CONF_ZONE_CLASS: "wired_door",
+    }
+    window = {
+        CONF_ZONE_NAME: "Window",
+        CONF_ZONE_NUMBER: "002",
+        CONF_ZONE_CLASS: "wired_window",
+    }
+
+    assert DMPZoneOpenClose(hass, mock_config_entry, door).is_on is True
+    assert DMPZoneStatus(hass, mock_config_entry, door).state == "Open"
+    compact = DMPCompactZoneStatus(hass, mock_config_entry, window)
+    assert compact.state == "Alarm"
+    # The restored flags are the baseline, not a transition to report
+    assert compact._last_flags["alarm"] is True
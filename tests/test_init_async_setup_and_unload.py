@@ -5,16 +5,17 @@ from unittest.mock import Mock, AsyncMock, patch
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 import custom_components.dmp as dmp_module
+import custom_components.dmp.status_server as status_server_module
 from custom_components.dmp import (
+    DMPRuntimeData,
+    async_remove_entry,
     async_setup_entry,
     async_unload_entry,
     options_update_listener,
 )
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
-    PYDMP_PANEL,
-    STATUS_SERVER,
+    STATUS_SERVERS,
     CONF_PANEL_NAME,
     CONF_PANEL_IP,
     CONF_PANEL_LISTEN_PORT,
@@ -75,11 +76,17 @@ async def test_async_setup_entry_success(monkeypatch, hass):
         def getPanels(self):
             return {}
 
-        async def updateStatus(self):
-            calls.append(("updateStatus",))
+        async def restoreSnapshot(self, store):
+            calls.append(("restoreSnapshot", store.key))
+
+        def start(self):
+            calls.append(("listener_start",))
+
+        def startConnection(self, host, account, remote_key):
+            calls.append(("startConnection", host, account, remote_key))
 
     monkeypatch.setattr(dmp_module, "PyDMPPanel", fake_pydmp_panel)
-    monkeypatch.setattr(dmp_module, "DMPStatusServer", fake_status_server)
+    monkeypatch.setattr(status_server_module, "DMPStatusServer", fake_status_server)
     monkeypatch.setattr(dmp_module, "DMPPanel", FakePanel)
     monkeypatch.setattr(dmp_module, "DMPListener", FakeListener)
 
@@ -111,25 +118,71 @@ async def test_async_setup_entry_success(monkeypatch, hass):
     assert ("panel_init", entry.data) in calls
     assert ("listener_init", entry.data) in calls
     assert any(c[0] == "addPanel" for c in calls)
-
-    mock_pydmp_panel.connect.assert_awaited_once_with(
-        "192.168.1.100", "12345", "testkey"
+    assert ("restoreSnapshot", "dmp.snapshot.test_entry") in calls
+    assert calls.index(("restoreSnapshot", "dmp.snapshot.test_entry")) < calls.index(
+        ("listener_start",)
     )
-    mock_pydmp_panel.start_keepalive.assert_awaited_once()
+    assert ("listener_start",) in calls
+
+    # The panel is connected in the background, not during setup
+    mock_pydmp_panel.connect.assert_not_awaited()
+    assert calls[-1] == ("startConnection", "192.168.1.100", "12345", "testkey")
     mock_status_server.start.assert_awaited_once()
 
     entry.add_update_listener.assert_called_once_with(options_update_listener)
     fwd.assert_called_once()
 
-    assert LISTENER in hass.data[DOMAIN]
-    assert PYDMP_PANEL in hass.data[DOMAIN]
-    assert STATUS_SERVER in hass.data[DOMAIN]
+    # Runtime objects live on the entry, not in a shared hass.data slot
+    assert entry.runtime_data.pydmp_panel is mock_pydmp_panel
+    assert entry.runtime_data.status_server is hass.data[DOMAIN][STATUS_SERVERS][40001]
+    assert isinstance(entry.runtime_data.listener, FakeListener)
     assert entry.entry_id in hass.data[DOMAIN]
 
 
 @pytest.mark.asyncio
-async def test_async_unload_entry_success(hass):
+async def test_async_setup_entry_failure_releases_status_server(monkeypatch, hass):
+    """A failed setup gives back its status server reference."""
+    status_server = Mock()
+    acquire = AsyncMock(return_value=status_server)
+    release = AsyncMock()
+    monkeypatch.setattr(dmp_module, "async_acquire_status_server", acquire)
+    monkeypatch.setattr(dmp_module, "async_release_status_server", release)
+    monkeypatch.setattr(dmp_module, "PyDMPPanel", Mock())
+    listener = Mock()
+    listener.restoreSnapshot = AsyncMock()
+    listener.stop = AsyncMock()
+    monkeypatch.setattr(dmp_module, "DMPListener", Mock(return_value=listener))
+    monkeypatch.setattr(
+        hass.config_entries,
+        "async_forward_entry_setups",
+        AsyncMock(side_effect=RuntimeError("platform failed")),
+    )
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_PANEL_IP: "192.168.1.100",
+            CONF_PANEL_LISTEN_PORT: 40001,
+            CONF_PANEL_ACCOUNT_NUMBER: "12345",
+            CONF_HOME_AREA: "01",
+            CONF_AWAY_AREA: "02",
+        },
+        entry_id="test_entry",
+    )
+
+    with pytest.raises(RuntimeError):
+        await async_setup_entry(hass, entry)
+
+    listener.stop.assert_awaited_once()
+    release.assert_awaited_once_with(hass, status_server)
+    assert "test_entry" not in hass.data[DOMAIN]
+    listener.startConnection.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_async_unload_entry_success(monkeypatch, hass):
     """Test successful unload of integration."""
+    release = AsyncMock()
+    monkeypatch.setattr(dmp_module, "async_release_status_server", release)
     mock_pydmp_panel = AsyncMock()
     mock_pydmp_panel.stop_keepalive = AsyncMock()
     mock_pydmp_panel.disconnect = AsyncMock()
@@ -137,12 +190,16 @@ async def test_async_unload_entry_success(hass):
     mock_status_server = AsyncMock()
     mock_status_server.stop = AsyncMock()
 
+    mock_listener = Mock()
+    mock_listener.stop = AsyncMock()
+
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][PYDMP_PANEL] = mock_pydmp_panel
-    hass.data[DOMAIN][STATUS_SERVER] = mock_status_server
     hass.data[DOMAIN]["test_entry"] = {"test": "data"}
 
     entry = MockConfigEntry(domain=DOMAIN, entry_id="test_entry")
+    entry.runtime_data = DMPRuntimeData(
+        mock_listener, mock_pydmp_panel, mock_status_server
+    )
 
     with patch.object(
         hass.config_entries, "async_unload_platforms", return_value=True
@@ -150,16 +207,19 @@ async def test_async_unload_entry_success(hass):
         result = await async_unload_entry(hass, entry)
 
     assert result is True
-    mock_status_server.stop.assert_awaited_once()
+    release.assert_awaited_once_with(hass, mock_status_server)
+    mock_listener.stop.assert_awaited_once()
     mock_pydmp_panel.stop_keepalive.assert_awaited_once()
     mock_pydmp_panel.disconnect.assert_awaited_once()
+    mock_listener.releaseConnection.assert_called_once()
     mock_unload.assert_called_once()
     assert "test_entry" not in hass.data[DOMAIN]
 
 
 @pytest.mark.asyncio
-async def test_async_unload_entry_platform_failure(hass):
+async def test_async_unload_entry_platform_failure(monkeypatch, hass):
     """Test unload fails when platforms fail to unload."""
+    monkeypatch.setattr(dmp_module, "async_release_status_server", AsyncMock())
     mock_pydmp_panel = AsyncMock()
     mock_pydmp_panel.stop_keepalive = AsyncMock()
     mock_pydmp_panel.disconnect = AsyncMock()
@@ -167,12 +227,16 @@ async def test_async_unload_entry_platform_failure(hass):
     mock_status_server = AsyncMock()
     mock_status_server.stop = AsyncMock()
 
+    mock_listener = Mock()
+    mock_listener.stop = AsyncMock()
+
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][PYDMP_PANEL] = mock_pydmp_panel
-    hass.data[DOMAIN][STATUS_SERVER] = mock_status_server
     hass.data[DOMAIN]["test_entry"] = {"test": "data"}
 
     entry = MockConfigEntry(domain=DOMAIN, entry_id="test_entry")
+    entry.runtime_data = DMPRuntimeData(
+        mock_listener, mock_pydmp_panel, mock_status_server
+    )
 
     with patch.object(
         hass.config_entries, "async_unload_platforms", return_value=False
@@ -181,3 +245,18 @@ async def test_async_unload_entry_platform_failure(hass):
 
     assert result is False
     assert "test_entry" in hass.data[DOMAIN]
+
+
+@pytest.mark.asyncio
+async def test_async_remove_entry_deletes_snapshot(hass, hass_storage):
+    """Removing an entry deletes its state snapshot store."""
+    hass_storage["dmp.snapshot.test_entry"] = {
+        "version": 1,
+        "key": "dmp.snapshot.test_entry",
+        "data": {"panels": {}},
+    }
+    entry = MockConfigEntry(domain=DOMAIN, entry_id="test_entry")
+
+    await async_remove_entry(hass, entry)
+
+    assert "dmp.snapshot.test_entry" not in hass_storage
@@ -1,15 +1,34 @@
 """Complete tests for DMPListener class."""
 
+import asyncio
 import pytest
 from unittest.mock import Mock, AsyncMock
+from homeassistant.core import callback
 
-from pydmp import S3Message
+from pydmp import S3Message, parse_s3_message
 
-from custom_components.dmp import DMPListener
+import custom_components.dmp as dmp_module
+from custom_components.dmp import DMPListener, DMPPanel
+from custom_components.dmp.s3_parser import fast_parse_s3_message
 from custom_components.dmp.const import (
     CONF_HOME_AREA,
     CONF_AWAY_AREA,
+    CONF_DUPLICATE_WINDOW,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_FAST_S3_PARSER,
+    CONF_INGEST_OVERFLOW,
+    CONF_INGEST_QUEUE_SIZE,
+    CONF_PANEL_ACCOUNT_NUMBER,
     CONF_PANEL_LISTEN_PORT,
+    CONF_RECONCILE_MAX_INTERVAL,
+    CONF_RECONCILE_MIN_INTERVAL,
+    CONF_ZONE_DEGLITCH,
+    CONF_ZONES,
+    CONNECTION_CONNECTED,
+    CONNECTION_CONNECTING,
+    CONNECTION_DEGRADED,
+    CONNECTION_OFFLINE,
+    INGEST_OVERFLOW_DROP_OLDEST,
 )
 from homeassistant.components.alarm_control_panel import AlarmControlPanelState
 
@@ -57,7 +76,30 @@ def test_listener_initialization():
     assert listener._panels == {}
     assert listener.statusAttributes == {}
     assert len(listener._callbacks) == 0
-    mock_server.register_callback.assert_called_once_with(listener._handle_s3_event)
+    # Accounts are attached to the shared status server as panels are added
+    mock_server.attach.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_listener_attaches_panel_accounts_to_status_server():
+    """Added panels are routed to the listener and detached on stop."""
+    config = {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_PANEL_LISTEN_PORT: 40001}
+    mock_server = Mock()
+    listener = DMPListener(Mock(), config, status_server=mock_server)
+    panel = Mock()
+    panel.getAccountNumber.return_value = "12345"
+
+    listener.addPanel(panel)
+    mock_server.attach.assert_called_once_with("12345", listener._enqueue_s3_event)
+
+    await listener.stop()
+    mock_server.detach.assert_called_once_with("12345", listener._enqueue_s3_event)
+
+
+def _set_panels(listener, panels):
+    """Attach panels keyed by account number, as addPanel would."""
+    listener._panels = panels
+    listener._index_accounts()
 
 
 def _make_s3_msg(account, definition, type_code=None, fields=None, raw=""):
@@ -95,13 +137,15 @@ async def test_handle_s3_event_battery():
     """Parse battery event and update zone via pyDMP."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg("12345", "Zd", fields=['z 001"Zone1'], raw="test")
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     mock_zone.update_state.assert_called_once_with("L")
     listener.updateHASS.assert_awaited()
 
@@ -111,13 +155,15 @@ async def test_handle_s3_event_bypass():
     """Process bypass zone event message."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="test")
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     mock_zone.update_state.assert_called_once_with("X")
     listener.updateHASS.assert_awaited()
 
@@ -164,13 +210,15 @@ async def test_handle_s3_event_trouble():
     ]:
         listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
         panel, mock_zone = _make_panel_with_zone()
-        listener._panels = {"12345": panel}
+        _set_panels(listener, {"12345": panel})
         listener.updateHASS = AsyncMock()
 
         msg = _make_s3_msg("12345", event_code, fields=['z 003"Zone3'], raw="test")
 
         await listener._handle_s3_event(msg)
 
+        await listener.flushUpdates()
+
         mock_zone.update_state.assert_called_once_with(expected_state)
 
 
@@ -180,13 +228,15 @@ async def test_handle_s3_event_restore():
     for event_code in ["Zy", "Zr"]:
         listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
         panel, mock_zone = _make_panel_with_zone()
-        listener._panels = {"12345": panel}
+        _set_panels(listener, {"12345": panel})
         listener.updateHASS = AsyncMock()
 
         msg = _make_s3_msg("12345", event_code, fields=['z 004"Zone4'], raw="test")
 
         await listener._handle_s3_event(msg)
 
+        await listener.flushUpdates()
+
         mock_zone.update_state.assert_called_once_with("N")
         panel.clear_alarm.assert_called_once_with("004")
 
@@ -196,7 +246,7 @@ async def test_handle_s3_event_alarm():
     """Handle alarm event sets alarm flag and area to TRIGGERED."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg(
@@ -209,6 +259,8 @@ async def test_handle_s3_event_alarm():
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     panel.set_alarm.assert_called_once_with("005")
     panel.updateArea.assert_called_once_with(
         {"areaName": "Main", "areaState": AlarmControlPanelState.TRIGGERED}
@@ -220,7 +272,7 @@ async def test_handle_s3_event_arming_disarm():
     """Handle arming status disarm event."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
     listener._hass.async_create_task = Mock()
     listener.updateStatus = AsyncMock()
@@ -231,6 +283,8 @@ async def test_handle_s3_event_arming_disarm():
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     panel.updateArea.assert_called_once_with(
         {
             "areaName": "Main",
@@ -245,7 +299,7 @@ async def test_handle_s3_event_arming_arm_home():
     """Handle arming status CL event for home area."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg(
@@ -254,6 +308,8 @@ async def test_handle_s3_event_arming_arm_home():
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     panel.updateArea.assert_called_once_with(
         {
             "areaName": "Main",
@@ -267,7 +323,7 @@ async def test_handle_s3_event_arming_arm_away():
     """Handle arming status CL event for away area."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg(
@@ -276,6 +332,8 @@ async def test_handle_s3_event_arming_arm_away():
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     panel.updateArea.assert_called_once_with(
         {
             "areaName": "Main",
@@ -289,7 +347,7 @@ async def test_handle_s3_event_arming_unknown_type_code():
     """Unknown arming type codes should not change area state."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg(
@@ -298,6 +356,8 @@ async def test_handle_s3_event_arming_unknown_type_code():
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     panel.updateArea.assert_not_called()
 
 
@@ -306,7 +366,7 @@ async def test_handle_s3_event_device_status():
     """Handle device status (Zc) events for open/close."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     # Door Open
@@ -314,6 +374,7 @@ async def test_handle_s3_event_device_status():
         "12345", "Zc", type_code="DO", fields=["z 006", "t ADO"], raw="test"
     )
     await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
     mock_zone.update_state.assert_called_with("O")
 
     mock_zone.update_state.reset_mock()
@@ -323,6 +384,7 @@ async def test_handle_s3_event_device_status():
         "12345", "Zc", type_code="DC", fields=["z 006", "t ADC"], raw="test"
     )
     await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
     mock_zone.update_state.assert_called_with("N")
 
 
@@ -332,13 +394,15 @@ async def test_handle_s3_event_ignored_events():
     for event_code in ["Zs", "Zj", "Zl"]:
         listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
         panel, mock_zone = _make_panel_with_zone()
-        listener._panels = {"12345": panel}
+        _set_panels(listener, {"12345": panel})
         listener.updateHASS = AsyncMock()
 
         msg = _make_s3_msg("12345", event_code, raw="test")
 
         await listener._handle_s3_event(msg)
 
+        await listener.flushUpdates()
+
         # Should still update contact time and call updateHASS
         panel.updateContactTime.assert_called_once()
         listener.updateHASS.assert_awaited_once()
@@ -348,13 +412,15 @@ async def test_handle_s3_event_ignored_events():
 async def test_handle_s3_event_unknown_account():
     """Unknown account number should warn and return early."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
-    listener._panels = {}
+    _set_panels(listener, {})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg("99999", "Zd", fields=['z 001"Zone1'], raw="test")
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     listener.updateHASS.assert_not_awaited()
 
 
@@ -363,13 +429,15 @@ async def test_handle_s3_event_empty_account_fallback():
     """Empty account should fall back to single panel."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg("     ", "Zd", fields=['z 001"Zone1'], raw="test")
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     mock_zone.update_state.assert_called_once_with("L")
     listener.updateHASS.assert_awaited()
 
@@ -381,13 +449,15 @@ async def test_handle_s3_event_empty_account_no_fallback():
     panel1, _ = _make_panel_with_zone()
     panel2, _ = _make_panel_with_zone()
     panel2.getAccountNumber.return_value = "67890"
-    listener._panels = {"12345": panel1, "67890": panel2}
+    _set_panels(listener, {"12345": panel1, "67890": panel2})
     listener.updateHASS = AsyncMock()
 
     msg = _make_s3_msg("     ", "Zd", fields=['z 001"Zone1'], raw="test")
 
     await listener._handle_s3_event(msg)
 
+    await listener.flushUpdates()
+
     listener.updateHASS.assert_not_awaited()
 
 
@@ -429,10 +499,14 @@ def test_listener_panel_management():
 async def test_listener_updateStatus():
     """Test updateStatus reads from pyDMP zones and areas."""
     mock_pydmp = Mock()
-    mock_pydmp.update_status = AsyncMock()
+
+    async def update_status():
+        mock_zone_001.state = "S"
+
+    mock_pydmp.update_status = AsyncMock(side_effect=update_status)
 
     mock_zone_001 = Mock()
-    mock_zone_001.state = "S"  # Short
+    mock_zone_001.state = "N"  # Normal until the panel reports a short
     mock_zone_001.name = "Front Door"
     mock_zone_001.number = 1
 
@@ -448,10 +522,9 @@ async def test_listener_updateStatus():
         Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=mock_pydmp
     )
 
-    panel = Mock()
-    panel.getAccountNumber.return_value = "12345"
+    panel = DMPPanel(Mock(), {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, mock_pydmp)
 
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.setStatusAttributes = Mock()
     listener.updateHASS = AsyncMock()
 
@@ -462,12 +535,199 @@ async def test_listener_updateStatus():
     listener.updateHASS.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_listener_updateStatus_only_notifies_changes():
+    """Refreshes notify changed zones only and return the diff."""
+    mock_pydmp = Mock()
+    panel_states = {}
+
+    async def update_status():
+        for number, state in panel_states.items():
+            zones[number].state = state
+
+    mock_pydmp.update_status = AsyncMock(side_effect=update_status)
+    zones = {}
+    for number in range(1, 401):
+        zone = Mock()
+        zone.state = "N"
+        zone.name = "Zone %s" % number
+        zones[number] = zone
+    area = Mock()
+    area.state = "D"
+    area.name = "Main"
+    mock_pydmp._zones = zones
+    mock_pydmp._areas = {1: area}
+
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=mock_pydmp
+    )
+    _set_panels(listener, {
+        "12345": DMPPanel(Mock(), {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, mock_pydmp)
+    })
+    listener.updateHASS = AsyncMock()
+
+    # Panel agrees with what the entities show: no entity is woken
+    diff = await listener.updateStatus()
+    assert diff == {"zones": {}, "areas": {}}
+    listener.updateHASS.assert_not_awaited()
+    # The status attributes are still populated for the refresh button
+    assert listener.getStatusAttributes()["Zone: 007 - Zone 7"] == "Normal"
+
+    # One zone changed behind our back: only that zone is woken
+    panel_states[7] = "S"
+    diff = await listener.updateStatus()
+    assert diff == {"zones": {"007": ("Normal", "Short")}, "areas": {}}
+    listener.updateHASS.assert_awaited_once_with("12345", diff["zones"], True)
+    assert listener.getStatusAttributes()["Zone: 007 - Zone 7"] == "Short"
+
+    # A state already delivered by S3 is not reported again
+    listener.updateHASS.reset_mock()
+    zones[8].state = "O"
+    panel_states[8] = "O"
+    diff = await listener.updateStatus()
+    assert diff == {"zones": {}, "areas": {}}
+    listener.updateHASS.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_listener_updateStatus_ignores_name_changes():
+    """Names the panel fills in are not status changes."""
+    mock_pydmp = Mock()
+    zone = Mock()
+    zone.state = "N"
+    zone.name = ""
+    mock_pydmp._zones = {1: zone}
+    mock_pydmp._areas = {}
+
+    async def update_status():
+        zone.name = "Front Door"
+
+    mock_pydmp.update_status = AsyncMock(side_effect=update_status)
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=mock_pydmp
+    )
+    _set_panels(listener, {
+        "12345": DMPPanel(Mock(), {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, mock_pydmp)
+    })
+    listener.updateHASS = AsyncMock()
+
+    diff = await listener.updateStatus()
+
+    assert diff == {"zones": {}, "areas": {}}
+    listener.updateHASS.assert_not_awaited()
+    assert listener.getStartupStats()["refresh_corrections"] == 0
+    # The new name still reaches the status attributes
+    assert listener.getStatusAttributes()["Zone: 001 - Front Door"] == "Normal"
+
+
+@pytest.mark.asyncio
+async def test_refresh_after_disarm_uses_diff():
+    """The post-disarm refresh goes through updateStatus."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    listener.updateStatus = AsyncMock(
+        return_value={"zones": {"003": ("Bypassed", "Normal")}, "areas": {}}
+    )
+
+    await listener._refreshAfterDisarm()
+
+    listener.updateStatus.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_listener_updateStatus_single_flight():
+    """A burst of refresh requests costs at most two panel queries."""
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=Mock()
+    )
+    release = asyncio.Event()
+    calls = 0
+
+    async def refresh():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+
+    listener._refreshStatus = refresh
+
+    first = asyncio.ensure_future(listener.updateStatus())
+    # one tick to start the caller, one for the refresh task it spawns
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert calls == 1
+    followers = [asyncio.ensure_future(listener.updateStatus()) for _ in range(4)]
+    await asyncio.sleep(0)
+    assert calls == 1
+    assert not first.done()
+
+    release.set()
+    await asyncio.gather(first, *followers)
+
+    assert calls == 2
+    assert listener.getCoalescedStatusRequests() == 4
+    assert listener._status_task is None
+    assert listener._status_trailing is None
+
+    # An idle listener starts a fresh refresh
+    await listener.updateStatus()
+    assert calls == 3
+    assert listener.getCoalescedStatusRequests() == 4
+
+
+@pytest.mark.asyncio
+async def test_stop_releases_pending_updateStatus_callers():
+    """Callers waiting on a refresh are released when the listener stops."""
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=Mock()
+    )
+    listener._refreshStatus = AsyncMock(side_effect=asyncio.Event().wait)
+
+    first = asyncio.ensure_future(listener.updateStatus())
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(listener.updateStatus())
+    await asyncio.sleep(0)
+
+    await listener.stop()
+    results = await asyncio.wait_for(
+        asyncio.gather(first, follower, return_exceptions=True), 1
+    )
+
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+    assert listener._status_task is None
+    assert listener._status_trailing is None
+
+
+@pytest.mark.asyncio
+async def test_listener_updateStatus_propagates_errors():
+    """Refresh errors reach every caller sharing the refresh."""
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=Mock()
+    )
+    release = asyncio.Event()
+
+    async def refresh():
+        await release.wait()
+        raise ConnectionError("panel offline")
+
+    listener._refreshStatus = refresh
+
+    first = asyncio.ensure_future(listener.updateStatus())
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(listener.updateStatus())
+    await asyncio.sleep(0)
+    release.set()
+
+    results = await asyncio.gather(first, follower, return_exceptions=True)
+    assert all(isinstance(result, ConnectionError) for result in results)
+    assert listener._status_task is None
+
+
 @pytest.mark.asyncio
 async def test_handle_s3_event_held_open_and_forced_open():
     """Handle HO (held open) and FO (forced open) device status events."""
     listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
     panel, mock_zone = _make_panel_with_zone()
-    listener._panels = {"12345": panel}
+    _set_panels(listener, {"12345": panel})
     listener.updateHASS = AsyncMock()
 
     for type_code in ["HO", "FO"]:
@@ -480,4 +740,984 @@ async def test_handle_s3_event_held_open_and_forced_open():
             raw="test",
         )
         await listener._handle_s3_event(msg)
+        await listener.flushUpdates()
         mock_zone.update_state.assert_called_with("O")
+
+
+@pytest.mark.asyncio
+async def test_zone_callbacks_only_wake_named_zone():
+    """Zone-scoped updateHASS only wakes that zone's callbacks."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    zone1_cb = AsyncMock()
+    zone2_cb = AsyncMock()
+    panel_cb = AsyncMock()
+    listener.register_zone_callback("12345", "001", zone1_cb)
+    listener.register_zone_callback("12345", "002", zone2_cb)
+    listener.register_callback(panel_cb)
+
+    await listener.updateHASS("12345", ["1"], notify_panel=False)
+    zone1_cb.assert_awaited_once()
+    zone2_cb.assert_not_awaited()
+    panel_cb.assert_not_awaited()
+
+    await listener.updateHASS("12345", ["002"])
+    zone2_cb.assert_awaited_once()
+    panel_cb.assert_awaited_once()
+
+    await listener.updateHASS()
+    assert zone1_cb.await_count == 2
+    assert zone2_cb.await_count == 2
+    assert panel_cb.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_callbacks_run_inline_and_coroutines_are_awaited():
+    """Plain callbacks are called directly; coroutine functions are awaited."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    order = []
+
+    @callback
+    def zone_cb():
+        order.append("zone")
+
+    async def io_cb():
+        order.append("io")
+
+    panel_cb = Mock(side_effect=lambda: order.append("panel"))
+    listener.register_zone_callback("12345", "001", zone_cb)
+    listener.register_zone_callback("12345", "001", io_cb)
+    listener.register_callback(panel_cb)
+
+    await listener.updateHASS("12345", ["001"], notify_panel=True)
+
+    # @callback consumers first, then the coroutine consumers
+    assert sorted(order[:2]) == ["panel", "zone"]
+    assert order[2:] == ["io"]
+    assert io_cb in listener._zone_callbacks[(12345, 1)].coroutines
+    assert zone_cb in listener._zone_callbacks[(12345, 1)].callbacks
+
+
+def test_remove_zone_callback():
+    """Removing the last zone callback drops the zone key."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    cb = AsyncMock()
+    listener.register_zone_callback("12345", "001", cb)
+    assert list(listener._zone_callbacks) == [(12345, 1)]
+    assert cb in listener._zone_callbacks[(12345, 1)]
+    listener.remove_zone_callback("12345", "001", cb)
+    assert listener._zone_callbacks == {}
+    # Removing an unknown callback is a no-op
+    listener.remove_zone_callback("12345", "001", cb)
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_notifies_zone_and_panel():
+    """Zone events wake only the zone; arming events also wake the panel."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="test")
+    await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
+    listener.updateHASS.assert_awaited_once_with("12345", {"002"}, False)
+
+    listener.updateHASS.reset_mock()
+    msg = _make_s3_msg(
+        "12345", "Zq", type_code="CL", fields=['a 001"Main', "t SCL"], raw="test"
+    )
+    await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
+    listener.updateHASS.assert_awaited_once_with("12345", set(), True)
+
+
+def test_record_suppressed_write():
+    """Suppressed writes are counted on the listener."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    assert listener.getSuppressedWrites() == 0
+    listener.record_suppressed_write()
+    listener.record_suppressed_write()
+    assert listener.getSuppressedWrites() == 2
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_coalesces_burst():
+    """A burst of events is flushed as one deduplicated update."""
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_EVENT_BATCH_WINDOW: 0.05},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    for fields in (['z 001"Zone1'], ['z 002"Zone2'], ['z 001"Zone1']):
+        msg = _make_s3_msg("12345", "Zx", fields=fields, raw="test")
+        await listener._handle_s3_event(msg)
+    msg = _make_s3_msg(
+        "12345", "Zq", type_code="CL", fields=['a 001"Main', "t SCL"], raw="test"
+    )
+    await listener._handle_s3_event(msg)
+
+    listener.updateHASS.assert_not_awaited()
+    assert listener._flush_timer is not None
+
+    await listener.flushUpdates()
+
+    listener.updateHASS.assert_awaited_once_with("12345", {"001", "002"}, True)
+    assert listener._flush_timer is None
+    assert listener._pending_updates == {}
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_alarm_bypasses_window():
+    """Alarm events flush pending updates immediately."""
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_EVENT_BATCH_WINDOW: 0.05},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="test")
+    await listener._handle_s3_event(msg)
+    listener.updateHASS.assert_not_awaited()
+
+    msg = _make_s3_msg(
+        "12345",
+        "Za",
+        type_code="AA",
+        fields=['z 005"Zone5', 'a 001"Main', "t SAA"],
+        raw="test",
+    )
+    await listener._handle_s3_event(msg)
+
+    listener.updateHASS.assert_awaited_once_with("12345", {"002", "005"}, True)
+    assert listener._flush_timer is None
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_zero_window_updates_immediately():
+    """A zero batch window disables coalescing."""
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_EVENT_BATCH_WINDOW: 0},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="test")
+    await listener._handle_s3_event(msg)
+
+    listener.updateHASS.assert_awaited_once_with("12345", {"002"}, False)
+    assert listener._flush_timer is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_updates():
+    """Cancelling drops pending updates and the batch timer."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="test")
+    await listener._handle_s3_event(msg)
+    listener.cancel_pending_updates()
+
+    assert listener._flush_timer is None
+    assert listener._pending_updates == {}
+    await listener.flushUpdates()
+    listener.updateHASS.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_flush_updates_notifies_contact_callbacks_once():
+    """Contact callbacks fire once per flush, not once per event."""
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_EVENT_BATCH_WINDOW: 0.05},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+    contact_cb = AsyncMock()
+    listener.register_contact_callback(contact_cb)
+
+    for fields in (['z 001"Zone1'], ['z 002"Zone2']):
+        msg = _make_s3_msg("12345", "Zx", fields=fields, raw="test")
+        await listener._handle_s3_event(msg)
+    contact_cb.assert_not_awaited()
+
+    await listener.flushUpdates()
+    contact_cb.assert_awaited_once()
+
+    # Nothing pending, nothing to report
+    await listener.flushUpdates()
+    contact_cb.assert_awaited_once()
+
+    listener.remove_contact_callback(contact_cb)
+    assert contact_cb not in listener._contact_callbacks
+
+
+@pytest.mark.asyncio
+async def test_enqueue_s3_event_counts_and_high_water_mark():
+    """Enqueued messages update counters and the high-water mark."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+
+    for _ in range(3):
+        await listener._enqueue_s3_event(_make_s3_msg("12345", "Zc"))
+
+    stats = listener.getIngestStats()
+    assert stats["enqueued"] == 3
+    assert stats["high_water_mark"] == 3
+    assert stats["depth"] == 3
+    assert stats["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_s3_event_drop_oldest_keeps_alarms():
+    """Drop-oldest sheds the oldest non-alarm message when full."""
+    listener = DMPListener(
+        Mock(),
+        {
+            CONF_HOME_AREA: "01",
+            CONF_AWAY_AREA: "02",
+            CONF_INGEST_QUEUE_SIZE: 2,
+            CONF_INGEST_OVERFLOW: INGEST_OVERFLOW_DROP_OLDEST,
+        },
+    )
+    alarm = _make_s3_msg("12345", "Za", raw="alarm")
+    first = _make_s3_msg("12345", "Zc", raw="first")
+    second = _make_s3_msg("12345", "Zc", raw="second")
+
+    await listener._enqueue_s3_event(alarm)
+    await listener._enqueue_s3_event(first)
+    await listener._enqueue_s3_event(second)
+
+    queue = listener._workers["12345"].queue
+    queued = [queue.get_nowait()[0] for _ in range(2)]
+    assert queued == [alarm, second]
+    stats = listener.getIngestStats()
+    assert stats["dropped"] == 1
+    assert stats["enqueued"] == 3
+    assert stats["high_water_mark"] == 2
+
+
+@pytest.mark.asyncio
+async def test_consumer_processes_queued_events():
+    """The consumer task drains the queue through _handle_s3_event."""
+    hass = Mock()
+    tasks = []
+    hass.async_create_background_task = Mock(
+        side_effect=lambda coro, name: tasks.append(asyncio.create_task(coro))
+        or tasks[-1]
+    )
+    listener = DMPListener(hass, {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    handled = []
+
+    async def fake_handle(msg):
+        handled.append(msg)
+        if len(handled) == 1:
+            raise ValueError("boom")
+
+    listener._handle_s3_event = fake_handle
+    listener.start()
+    first = _make_s3_msg("12345", "Zc", raw="first")
+    second = _make_s3_msg("12345", "Zc", raw="second")
+    await listener._enqueue_s3_event(first)
+    await listener._enqueue_s3_event(second)
+    await listener._workers["12345"].queue.join()
+
+    assert handled == [first, second]
+    assert listener.getIngestStats()["processed"] == 2
+
+    await listener.stop()
+    assert listener._workers["12345"].task is None
+    assert tasks[0].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_busy_panel_does_not_block_other_panels():
+    """Each account has its own worker, so a stuck panel only delays itself."""
+    hass = Mock()
+    hass.async_create_background_task = Mock(
+        side_effect=lambda coro, name: asyncio.create_task(coro)
+    )
+    listener = DMPListener(hass, {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    release = asyncio.Event()
+    handled = []
+
+    async def fake_handle(msg):
+        if msg.account == "11111":
+            await release.wait()
+        handled.append(msg.raw)
+
+    listener._handle_s3_event = fake_handle
+    listener.start()
+    await listener._enqueue_s3_event(_make_s3_msg("11111", "Zc", raw="slow-1"))
+    await listener._enqueue_s3_event(_make_s3_msg("11111", "Zc", raw="slow-2"))
+    await listener._enqueue_s3_event(_make_s3_msg("22222", "Zc", raw="fast"))
+    await listener._workers["22222"].queue.join()
+
+    assert handled == ["fast"]
+    assert listener.getPanelIngestStats()["11111"]["depth"] == 1
+
+    release.set()
+    await listener._workers["11111"].queue.join()
+    # Order is kept within a panel
+    assert handled == ["fast", "slow-1", "slow-2"]
+
+    stats = listener.getPanelIngestStats()
+    assert stats["11111"]["processed"] == 2
+    assert stats["11111"]["high_water_mark"] == 2
+    assert stats["22222"]["processed"] == 1
+    assert stats["11111"]["max_latency"] >= stats["11111"]["mean_latency"]
+    assert listener.getIngestStats()["processed"] == 3
+
+    await listener.stop()
+
+
+@pytest.mark.asyncio
+async def test_blank_account_uses_single_panel_worker():
+    """Messages without an account are queued for the only panel."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    _set_panels(listener, {"12345": Mock()})
+
+    await listener._enqueue_s3_event(_make_s3_msg("     ", "Zc"))
+
+    assert list(listener._workers) == ["12345"]
+    assert listener.getIngestStats()["depth"] == 1
+
+
+@pytest.mark.asyncio
+async def test_register_s3_handler_extends_dispatch():
+    """Custom handlers take over a category, preferring exact type codes."""
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_EVENT_BATCH_WINDOW: 0},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+    category_handler = Mock(return_value=True)
+    type_handler = Mock(return_value=None)
+    listener.register_s3_handler("Zj", category_handler)
+    listener.register_s3_handler("Zj", type_handler, "DA")
+
+    msg = _make_s3_msg("12345", "Zj", type_code="DO", fields=["t DO"], raw="test")
+    await listener._handle_s3_event(msg)
+    category_handler.assert_called_once()
+    listener.updateHASS.assert_awaited_once_with("12345", set(), True)
+
+    # Returning None discards the event
+    msg = _make_s3_msg("12345", "Zj", type_code="DA", fields=["t DA"], raw="test")
+    await listener._handle_s3_event(msg)
+    type_handler.assert_called_once()
+    assert category_handler.call_count == 1
+    assert listener.updateHASS.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_unhandled_category():
+    """Unhandled categories still update contact time."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg("12345", "Zu", type_code="UA", fields=["t UA"], raw="test")
+    await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
+
+    panel.updateContactTime.assert_called_once()
+    listener.updateHASS.assert_awaited_once()
+
+
+def test_listener_fast_s3_parser_option():
+    """The fast S3 parser is used unless turned off in config."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    assert listener._parse_s3_message is fast_parse_s3_message
+
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_FAST_S3_PARSER: False},
+    )
+    assert listener._parse_s3_message is parse_s3_message
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_drops_duplicates_within_window(monkeypatch):
+    """Retransmits inside the window are dropped, later repeats are not."""
+    now = [100.0]
+    monkeypatch.setattr(dmp_module.time, "monotonic", lambda: now[0])
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_DUPLICATE_WINDOW: 2.0},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+    door_open = _make_s3_msg(
+        "12345", "Zc", type_code="DO", fields=["z 006", "t DO"], raw="Zc DO 006"
+    )
+
+    await listener._handle_s3_event(door_open)
+    now[0] += 1.0
+    await listener._handle_s3_event(door_open)
+    assert mock_zone.update_state.call_count == 1
+    assert panel.updateContactTime.call_count == 1
+    assert listener.getDuplicateCount() == 1
+
+    now[0] += 2.5
+    await listener._handle_s3_event(door_open)
+    assert mock_zone.update_state.call_count == 2
+    assert listener.getDuplicateCount() == 1
+    listener.cancel_pending_updates()
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_keeps_repeated_transitions(monkeypatch):
+    """Open/close/open inside the window is never treated as a duplicate."""
+    monkeypatch.setattr(dmp_module.time, "monotonic", lambda: 100.0)
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+    door_open = _make_s3_msg(
+        "12345", "Zc", type_code="DO", fields=["z 006", "t DO"], raw="Zc DO 006"
+    )
+    door_closed = _make_s3_msg(
+        "12345", "Zc", type_code="DC", fields=["z 006", "t DC"], raw="Zc DC 006"
+    )
+
+    for msg in (door_open, door_closed, door_open):
+        await listener._handle_s3_event(msg)
+
+    assert [c.args[0] for c in mock_zone.update_state.call_args_list] == [
+        "O",
+        "N",
+        "O",
+    ]
+    assert listener.getDuplicateCount() == 0
+    listener.cancel_pending_updates()
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_duplicate_window_disabled():
+    """A zero duplicate window processes every message."""
+    listener = DMPListener(
+        Mock(),
+        {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02", CONF_DUPLICATE_WINDOW: 0},
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+    msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="Zx 002")
+
+    await listener._handle_s3_event(msg)
+    await listener._handle_s3_event(msg)
+
+    assert mock_zone.update_state.call_count == 2
+    assert listener._recent_messages == {}
+    listener.cancel_pending_updates()
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_deglitches_zone_pulses():
+    """Short open/close pulses are counted but never wake the zone."""
+    hass = Mock()
+    hass.async_create_task = asyncio.ensure_future
+    listener = DMPListener(
+        hass,
+        {
+            CONF_HOME_AREA: "01",
+            CONF_AWAY_AREA: "02",
+            CONF_EVENT_BATCH_WINDOW: 0,
+            CONF_DUPLICATE_WINDOW: 0,
+            CONF_ZONE_DEGLITCH: 20,
+            CONF_ZONES: [{"zone_number": "006", "zone_class": "wired_motion"}],
+        },
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    mock_zone.update_state.side_effect = lambda state, *args: setattr(
+        mock_zone, "state", state
+    )
+    listener.addPanel(panel)
+    listener.updateHASS = AsyncMock()
+    contact = AsyncMock()
+    listener.register_contact_callback(contact)
+    motion = _make_s3_msg(
+        "12345", "Zc", type_code="DO", fields=["z 006", "t DO"], raw="Zc DO 006"
+    )
+    clear = _make_s3_msg(
+        "12345", "Zc", type_code="DC", fields=["z 006", "t DC"], raw="Zc DC 006"
+    )
+
+    await listener._handle_s3_event(motion)
+    await listener._handle_s3_event(clear)
+    await asyncio.sleep(0.05)
+
+    # The panel still reports in, but the zone itself is never woken
+    assert all(not call.args[1] for call in listener.updateHASS.await_args_list)
+    assert contact.await_count == 2
+    assert listener.getZoneFilterStats("12345", "006") == {
+        "rate_limited": 0,
+        "deglitched": 1,
+    }
+    assert listener.getZoneFilterStats()["deglitched"] == 1
+
+    # An open that lasts wakes the zone once the deglitch time has passed
+    await listener._handle_s3_event(motion)
+    await asyncio.sleep(0.05)
+    listener.updateHASS.assert_awaited_with("12345", {"006"}, False)
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_filters_only_zone_transitions():
+    """Zc type codes that are not opens or closes never reach the filter."""
+    listener = DMPListener(
+        Mock(),
+        {
+            CONF_HOME_AREA: "01",
+            CONF_AWAY_AREA: "02",
+            CONF_EVENT_BATCH_WINDOW: 0,
+            CONF_DUPLICATE_WINDOW: 0,
+            CONF_ZONE_DEGLITCH: 20,
+            CONF_ZONES: [{"zone_number": "006", "zone_class": "wired_motion"}],
+        },
+    )
+    panel, mock_zone = _make_panel_with_zone()
+    listener.addPanel(panel)
+    listener.updateHASS = AsyncMock()
+    listener._zone_filter.allow = Mock(return_value=False)
+    other = _make_s3_msg(
+        "12345", "Zc", type_code="XX", fields=["z 006", "t XX"], raw="Zc XX 006"
+    )
+
+    await listener._handle_s3_event(other)
+
+    listener._zone_filter.allow.assert_not_called()
+    assert listener.getZoneFilterStats()["zones"] == {}
+
+
+def _make_reconcile_listener():
+    listener = DMPListener(
+        Mock(),
+        {
+            CONF_HOME_AREA: "01",
+            CONF_AWAY_AREA: "02",
+            CONF_RECONCILE_MIN_INTERVAL: 60,
+            CONF_RECONCILE_MAX_INTERVAL: 300,
+        },
+    )
+    listener._connection_state = CONNECTION_CONNECTED
+    panel = Mock()
+    panel.commandInFlight.return_value = False
+    _set_panels(listener, {"12345": panel})
+    listener.updateStatus = AsyncMock(return_value={"zones": {}, "areas": {}})
+    return listener, panel
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_running_reconcile():
+    """A poll running at unload is cancelled and never re-arms the timer."""
+    listener, panel = _make_reconcile_listener()
+    release = asyncio.Event()
+
+    async def slow_update():
+        await release.wait()
+        return {"zones": {}, "areas": {}}
+
+    listener.updateStatus = AsyncMock(side_effect=slow_update)
+    listener._hass.async_create_task = asyncio.ensure_future
+    listener._reconcile_timer_fired()
+    poll = listener._reconcile_task
+    await asyncio.sleep(0)
+
+    await listener.stop()
+    await asyncio.sleep(0)
+    assert poll.cancelled()
+    panel.close.assert_called_once()
+    assert listener._reconcile_timer is None
+
+    # A poll that still completes after stop() does not schedule another
+    release.set()
+    await listener._reconcile()
+    assert listener._reconcile_timer is None
+
+
+@pytest.mark.asyncio
+async def test_reconcile_backs_off_while_traffic_agrees():
+    """Clean polls with S3 traffic double the interval up to the maximum."""
+    listener, panel = _make_reconcile_listener()
+
+    for expected in (120, 240, 300, 300):
+        listener._ingest_stats["processed"] += 5
+        await listener._reconcile()
+        assert listener.getReconcileStats()["interval"] == expected
+
+    # No S3 traffic: hold the interval rather than back off further
+    listener._reconcile_interval = 120
+    await listener._reconcile()
+    assert listener.getReconcileStats()["interval"] == 120
+    assert listener.getReconcileStats()["polls"] == 5
+    listener._cancel_reconcile()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_drift_resets_interval():
+    """Corrections found by a poll are counted and shorten the interval."""
+    listener, panel = _make_reconcile_listener()
+    listener._reconcile_interval = 300
+    listener.updateStatus.return_value = {
+        "zones": {"003": ("Normal", "Open"), "004": ("Open", "Normal")},
+        "areas": {},
+    }
+
+    await listener._reconcile()
+
+    stats = listener.getReconcileStats()
+    assert stats["interval"] == 60
+    assert stats["corrections"] == 2
+    assert stats["last_corrections"] == 2
+    assert listener._reconcile_timer is not None
+    listener._cancel_reconcile()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_suspended_during_command():
+    """Polls are deferred while a panel command is in flight."""
+    listener, panel = _make_reconcile_listener()
+    panel.commandInFlight.return_value = True
+
+    await listener._reconcile()
+
+    listener.updateStatus.assert_not_awaited()
+    assert listener.getReconcileStats()["suspended"] == 1
+    assert listener._reconcile_timer is not None
+    listener._cancel_reconcile()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_failure_resets_interval():
+    """A failed poll retries at the minimum interval."""
+    listener, panel = _make_reconcile_listener()
+    listener._reconcile_interval = 300
+    listener.updateStatus.side_effect = ConnectionError("panel offline")
+
+    await listener._reconcile()
+
+    assert listener.getReconcileStats()["interval"] == 60
+    assert listener.getReconcileStats()["polls"] == 0
+    listener._cancel_reconcile()
+
+
+@pytest.mark.asyncio
+async def test_reset_reconcile_interval_and_disable():
+    """Reconnects shorten the interval and a zero maximum disables polling."""
+    listener, panel = _make_reconcile_listener()
+    listener._reconcile_interval = 300
+    listener._schedule_reconcile()
+    listener.resetReconcileInterval()
+    assert listener.getReconcileStats()["interval"] == 60
+    assert listener._reconcile_timer is not None
+    listener._cancel_reconcile()
+
+    listener._reconcile_max_interval = 0
+    listener._schedule_reconcile()
+    assert listener._reconcile_timer is None
+
+
+@pytest.mark.asyncio
+async def test_restore_snapshot_and_save_on_flush():
+    """The snapshot is restored at setup and saved after flushed events."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    panel.restoreSnapshot = Mock(return_value=3)
+    panel.getSnapshot = Mock(return_value={"zones": {"2": "O"}})
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+    store = Mock()
+    store.async_load = AsyncMock(
+        return_value={"panels": {"12345": {"zones": {"2": "O"}}, "99999": {}}}
+    )
+    store.async_save = AsyncMock()
+
+    await listener.restoreSnapshot(store)
+
+    panel.restoreSnapshot.assert_called_once_with({"zones": {"2": "O"}})
+    stats = listener.getStartupStats()
+    assert stats["restored_zones"] == 3
+    assert stats["restore_seconds"] is not None
+
+    msg = _make_s3_msg("12345", "Zx", fields=['z 002"Zone2'], raw="test")
+    await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
+
+    store.async_delay_save.assert_called_once()
+    data_func = store.async_delay_save.call_args[0][0]
+    assert data_func() == {"panels": {"12345": {"zones": {"2": "O"}}}}
+
+    await listener.stop()
+    store.async_save.assert_awaited_once_with(
+        {"panels": {"12345": {"zones": {"2": "O"}}}}
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_refresh_records_startup_stats():
+    """The first refresh records time to correct state and corrections."""
+    mock_pydmp = Mock()
+    zone = Mock()
+    zone.state = "O"
+    zone.name = "Zone 1"
+    mock_pydmp._zones = {1: zone}
+    mock_pydmp._areas = {}
+
+    async def update_status():
+        zone.state = "N"
+
+    mock_pydmp.update_status = AsyncMock(side_effect=update_status)
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=mock_pydmp
+    )
+    _set_panels(listener, {
+        "12345": DMPPanel(Mock(), {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, mock_pydmp)
+    })
+    listener.updateHASS = AsyncMock()
+
+    await listener.updateStatus()
+
+    stats = listener.getStartupStats()
+    assert stats["refresh_seconds"] is not None
+    assert stats["refresh_corrections"] == 1
+
+
+class _FakeLinkPanel:
+    """pyDMP panel stand-in whose connect() fails a set number of times."""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.is_connected = False
+        self.connect_calls = 0
+        self._active_key = None
+        self._connection = None
+        self.start_keepalive = AsyncMock()
+        self.stop_keepalive = AsyncMock()
+
+    async def connect(self, host, account, remote_key):
+        self.connect_calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("panel offline")
+        self.is_connected = True
+
+
+def test_release_connection_after_dropped_link():
+    """A dropped link's guard and socket are released for the next panel."""
+    pydmp_panel = _FakeLinkPanel()
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=pydmp_panel
+    )
+    stale_key = ("1.2.3.4", 2001, "12345")
+    dmp_module.pydmp_panel_module._ACTIVE_CONNECTIONS.add(stale_key)
+    pydmp_panel._active_key = stale_key
+    transport = Mock()
+    writer = transport._writer
+    pydmp_panel._connection = transport
+
+    listener.releaseConnection()
+
+    assert stale_key not in dmp_module.pydmp_panel_module._ACTIVE_CONNECTIONS
+    assert pydmp_panel._active_key is None
+    assert pydmp_panel._connection is None
+    writer.close.assert_called_once()
+    assert transport._writer is None
+
+
+def _make_supervised_listener(pydmp_panel):
+    listener = DMPListener(
+        Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"}, pydmp_panel=pydmp_panel
+    )
+    listener.updateHASS = AsyncMock()
+    states = []
+
+    async def refreshed():
+        states.append(listener.getConnectionState())
+        connected.set()
+
+    connected = asyncio.Event()
+    listener.updateStatus = AsyncMock(side_effect=refreshed)
+    return listener, connected, states
+
+
+@pytest.mark.asyncio
+async def test_supervisor_connects_and_refreshes():
+    """The supervisor connects, starts keepalive and refreshes status."""
+    pydmp_panel = _FakeLinkPanel()
+    listener, connected, states = _make_supervised_listener(pydmp_panel)
+    assert listener.getConnectionState() == CONNECTION_CONNECTING
+    assert listener.isConnected() is False
+
+    task = asyncio.ensure_future(listener._supervise_connection("1.2.3.4", "12345", "key"))
+    await asyncio.wait_for(connected.wait(), 1)
+    task.cancel()
+
+    assert states == [CONNECTION_CONNECTED]
+    assert listener.isConnected() is True
+    pydmp_panel.start_keepalive.assert_awaited_once()
+    # Command entities are woken to pick up their availability
+    listener.updateHASS.assert_awaited_once_with()
+
+
+@pytest.mark.asyncio
+async def test_supervisor_backoff_goes_offline_then_recovers(monkeypatch):
+    """Repeated failures mark the panel offline until a retry succeeds."""
+    monkeypatch.setattr(dmp_module, "RECONNECT_BASE_DELAY", 0)
+    pydmp_panel = _FakeLinkPanel(failures=3)
+    listener, connected, states = _make_supervised_listener(pydmp_panel)
+    seen = []
+
+    async def record():
+        seen.append(listener.getConnectionState())
+
+    listener.updateHASS = AsyncMock(side_effect=record)
+
+    task = asyncio.ensure_future(listener._supervise_connection("1.2.3.4", "12345", "key"))
+    await asyncio.wait_for(connected.wait(), 1)
+    task.cancel()
+
+    assert pydmp_panel.connect_calls == 4
+    assert seen == [CONNECTION_OFFLINE, CONNECTION_CONNECTED]
+    assert listener._connection_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_supervisor_reconnects_after_drop(monkeypatch):
+    """A dropped link is degraded, released and reconnected."""
+    monkeypatch.setattr(dmp_module, "CONNECTION_CHECK_INTERVAL", 0)
+    pydmp_panel = _FakeLinkPanel()
+    listener, connected, states = _make_supervised_listener(pydmp_panel)
+    seen = []
+
+    async def record():
+        seen.append(listener.getConnectionState())
+
+    listener.updateHASS = AsyncMock(side_effect=record)
+
+    task = asyncio.ensure_future(listener._supervise_connection("1.2.3.4", "12345", "key"))
+    await asyncio.wait_for(connected.wait(), 1)
+    connected.clear()
+    stale_key = ("1.2.3.4", 2001, "12345")
+    dmp_module.pydmp_panel_module._ACTIVE_CONNECTIONS.add(stale_key)
+    pydmp_panel._active_key = stale_key
+    pydmp_panel.is_connected = False
+    await asyncio.wait_for(connected.wait(), 1)
+    task.cancel()
+
+    assert seen == [CONNECTION_CONNECTED, CONNECTION_DEGRADED, CONNECTION_CONNECTED]
+    assert stale_key not in dmp_module.pydmp_panel_module._ACTIVE_CONNECTIONS
+    assert pydmp_panel._active_key is None
+    assert pydmp_panel.connect_calls == 2
+
+
+def test_reconnect_delay_bounds(monkeypatch):
+    """Backoff doubles per failure, is capped, and is jittered downwards."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    monkeypatch.setattr(dmp_module.random, "uniform", lambda low, high: (low, high))
+
+    listener._connection_failures = 1
+    assert listener._reconnect_delay() == (2.5, 5)
+    listener._connection_failures = 3
+    assert listener._reconnect_delay() == (10, 20)
+    listener._connection_failures = 20
+    assert listener._reconnect_delay() == (150, 300)
+
+
+@pytest.mark.asyncio
+async def test_reconcile_suspended_while_disconnected():
+    """No reconciliation poll is sent while the panel is not connected."""
+    listener, panel = _make_reconcile_listener()
+    listener._connection_state = CONNECTION_DEGRADED
+
+    await listener._reconcile()
+
+    listener.updateStatus.assert_not_awaited()
+    assert listener.getReconcileStats()["suspended"] == 1
+    listener._cancel_reconcile()
+
+
+@pytest.mark.asyncio
+async def test_stop_cancels_connection_supervisor():
+    """stop() cancels the background connection supervisor."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    listener._connection_task = asyncio.ensure_future(asyncio.sleep(3600))
+
+    await listener.stop()
+
+    assert listener._connection_task is None
+
+
+@pytest.mark.asyncio
+async def test_handle_s3_event_updates_fault_index():
+    """Zone events feed the panel's fault and zone area indexes."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    mock_zone.state = "O"
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg(
+        "12345", "Zc", type_code="DO", fields=['z 004"Zone4', 'a 001"Main', "t DO"]
+    )
+    await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
+
+    panel.noteZone.assert_called_once_with("004", "O", "001")
+
+
+@pytest.mark.asyncio
+async def test_padded_numbers_match_configured_numbers():
+    """Zero-padded accounts, areas and zones resolve to the configured ones."""
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "1", CONF_AWAY_AREA: "02"})
+    panel, mock_zone = _make_panel_with_zone()
+    panel.getArea.return_value = {"areaState": AlarmControlPanelState.DISARMED}
+    _set_panels(listener, {"123": panel})
+    zone_cb = AsyncMock()
+    listener.register_zone_callback("123", "4", zone_cb)
+
+    msg = _make_s3_msg(
+        "00123", "Zq", type_code="CL", fields=['a 001"Main', "t SCL"], raw="test"
+    )
+    await listener._handle_s3_event(msg)
+    panel.updateArea.assert_called_once_with(
+        {"areaName": "Main", "areaState": AlarmControlPanelState.ARMED_HOME}
+    )
+
+    msg = _make_s3_msg("  123", "Zc", type_code="DO", fields=['z 004"Zone4'])
+    await listener._handle_s3_event(msg)
+    await listener.flushUpdates()
+    zone_cb.assert_awaited_once()
+    assert listener._resolve_account("99999") is None
+
+
+@pytest.mark.asyncio
+async def test_padded_alarm_matches_configured_zone():
+    """An alarm for zone 005 is seen by the entities of configured zone 5."""
+    mock_pydmp = Mock()
+    mock_pydmp._zones = {}
+    listener = DMPListener(Mock(), {CONF_HOME_AREA: "01", CONF_AWAY_AREA: "02"})
+    panel = DMPPanel(Mock(), {CONF_PANEL_ACCOUNT_NUMBER: "12345"}, mock_pydmp)
+    _set_panels(listener, {"12345": panel})
+    listener.updateHASS = AsyncMock()
+
+    msg = _make_s3_msg("12345", "Za", type_code="BU", fields=['z 005"Zone5'])
+    await listener._handle_s3_event(msg)
+
+    assert panel.get_alarm("5") is True
+    assert panel.getZoneFlags("5")["alarm"] is True
+    assert panel.getZoneFlags("5")["status"] == "Alarm"
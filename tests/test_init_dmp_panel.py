@@ -78,7 +78,11 @@ def test_panel_alarm_zone_methods():
     panel.set_alarm("001")
     assert panel.get_alarm("001") is True
 
-    panel.clear_alarm("001")
+    # Padded and unpadded zone numbers name the same zone
+    assert panel.get_alarm("1") is True
+    assert panel.get_alarm(1) is True
+
+    panel.clear_alarm("1")
     assert panel.get_alarm("001") is False
 
 
@@ -175,3 +179,271 @@ async def test_restore_zone_existing():
 
     await panel.restore_zone("001")
     mock_zone.restore.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_area_commands_delegate_to_pydmp():
+    """Arm and disarm commands are passed through to pyDMP."""
+    mock_pydmp = Mock()
+    mock_pydmp.arm_areas = AsyncMock()
+    mock_pydmp.disarm_areas = AsyncMock()
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    await panel.arm_areas([1], instant=True)
+    await panel.disarm_areas([1, 2, 3])
+
+    mock_pydmp.arm_areas.assert_awaited_once_with([1], instant=True)
+    mock_pydmp.disarm_areas.assert_awaited_once_with([1, 2, 3])
+
+
+@pytest.mark.asyncio
+async def test_command_in_flight_tracking():
+    """commandInFlight is set only while a command is running."""
+    mock_pydmp = Mock()
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+    seen = []
+
+    async def arm_areas(areas):
+        seen.append(panel.commandInFlight())
+        raise ConnectionError("panel offline")
+
+    mock_pydmp.arm_areas = arm_areas
+
+    assert panel.commandInFlight() is False
+    with pytest.raises(ConnectionError):
+        await panel.arm_areas([1])
+    assert seen == [True]
+    assert panel.commandInFlight() is False
+
+
+def test_panel_snapshot_round_trip():
+    """A snapshot restores zone states and areas, alarm flags and the area state."""
+    mock_pydmp = Mock()
+    mock_pydmp._zones = {}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+    panel.ensure_zone("001").update_state("O")
+    panel.noteZone("001", "O", "02")
+    panel.ensure_zone("002")
+    panel.set_alarm("005")
+    panel.clear_alarm("006")
+    panel.updateArea(
+        {"areaName": "Main", "areaState": AlarmControlPanelState.ARMED_HOME}
+    )
+
+    snapshot = panel.getSnapshot()
+    assert snapshot == {
+        "zones": {"1": "O"},
+        "alarms": ["5"],
+        "area": "armed_home",
+        "zone_areas": {"1": 2},
+    }
+
+    restored_pydmp = Mock()
+    restored_pydmp._zones = {}
+    restored = _make_panel(pydmp_panel=restored_pydmp)
+    assert restored.restoreSnapshot(snapshot) == 1
+    assert restored.ensure_zone("001").state == "O"
+    assert restored.get_alarm("005") is True
+    assert restored.getArea()["areaState"] == AlarmControlPanelState.ARMED_HOME
+    assert restored.getFaultedZones([2]) == [1]
+
+
+def test_panel_restore_keeps_reported_state():
+    """Restoring never overwrites a zone state the panel already reported."""
+    mock_pydmp = Mock()
+    mock_pydmp._zones = {}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+    panel.ensure_zone("001").update_state("N")
+
+    assert panel.restoreSnapshot({"zones": {"1": "O"}}) == 0
+    assert panel.ensure_zone("001").state == "N"
+    assert panel.getArea() == AlarmControlPanelState.DISARMED
+
+
+@pytest.mark.asyncio
+async def test_update_status_goes_through_command_queue():
+    """Status queries are sent through the panel command queue."""
+    mock_pydmp = Mock()
+    mock_pydmp.update_status = AsyncMock()
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    await panel.update_status()
+
+    mock_pydmp.update_status.assert_awaited_once()
+    stats = panel.getCommandStats()
+    assert stats["wait"]["status"]["commands"] == 1
+    # Status queries do not count as commands in flight
+    assert panel.commandInFlight() is False
+
+
+@pytest.mark.asyncio
+async def test_bypass_zones_batch_results():
+    """A zone batch runs every zone and reports each result."""
+    mock_pydmp = Mock()
+    ok_zone = Mock()
+    ok_zone.bypass = AsyncMock()
+    bad_zone = Mock()
+    bad_zone.bypass = AsyncMock(side_effect=ConnectionError("NAK"))
+    mock_pydmp._zones = {1: ok_zone, 2: bad_zone}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    results = await panel.bypass_zones(["001", "002", "abc"])
+
+    assert results == {"001": "ok", "002": "NAK", "abc": "Invalid zone number"}
+    ok_zone.bypass.assert_awaited_once()
+    # The whole batch is one command on the queue
+    assert panel.getCommandStats()["wait"]["bypass"]["commands"] == 1
+    assert panel.commandInFlight() is False
+
+
+@pytest.mark.asyncio
+async def test_zone_batch_never_adds_zones():
+    """Out of range zones fail on their own; unknown zones are not added."""
+    mock_pydmp = Mock()
+    mock_pydmp._send_command = AsyncMock(return_value="ACK")
+    zone_1 = Mock()
+    zone_1.bypass = AsyncMock()
+    zone_2 = Mock()
+    zone_2.bypass = AsyncMock()
+    mock_pydmp._zones = {1: zone_1, 2: zone_2}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    results = await panel.bypass_zones(["001", "1000", "500", "002"])
+
+    assert results == {
+        "001": "ok",
+        "1000": "Invalid zone number",
+        "500": "ok",
+        "002": "ok",
+    }
+    zone_2.bypass.assert_awaited_once()
+    mock_pydmp._send_command.assert_awaited_once()
+    assert list(mock_pydmp._zones) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_restore_zones_batch():
+    """restore_zones restores each zone in the batch."""
+    mock_pydmp = Mock()
+    zone = Mock()
+    zone.restore = AsyncMock()
+    mock_pydmp._zones = {3: zone}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    assert await panel.restore_zones(["003"]) == {"003": "ok"}
+    zone.restore.assert_awaited_once()
+
+
+def test_fault_index_tracks_zone_states_and_areas():
+    """The fault index follows zone states and learned zone areas."""
+    panel = _make_panel()
+    panel.noteZone("001", "O", "01")
+    panel.noteZone("002", "S", "02")
+    panel.noteZone("003", "M")
+    panel.noteZone("004", "N", "01")
+    panel.noteZone("bad", "O")
+
+    # Zone 3 has no known area so it is never counted as in an area
+    assert panel.getFaultedZones([1]) == [1]
+    assert panel.getFaultedZones([1, 2, 3]) == [1, 2]
+    assert panel.getFaultedZonesWithoutArea() == [3]
+
+    panel.noteZone("001", "X")
+    assert panel.getFaultedZones([1]) == []
+    # Once a message names its area the zone is placed
+    panel.noteZone("003", "M", "02")
+    assert panel.getFaultedZones([2]) == [2, 3]
+    assert panel.getFaultedZonesWithoutArea() == []
+
+
+@pytest.mark.asyncio
+async def test_arm_with_bypass_bypasses_faults_then_arms():
+    """Faulted zones are bypassed before arming, in one queued command."""
+    mock_pydmp = Mock()
+    mock_pydmp.arm_areas = AsyncMock()
+    zone = Mock()
+    zone.bypass = AsyncMock()
+    mock_pydmp._zones = {5: zone}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+    panel.noteZone("005", "O", "01")
+    panel.noteZone("006", "O", "02")
+    panel.noteZone("007", "O")
+
+    result = await panel.arm_with_bypass([1], instant=True)
+
+    # Zone 7 may be in an area that is not being armed, so it is only reported
+    assert result == {"bypassed": {"005": "ok"}, "armed": True, "unknown_area": ["007"]}
+    zone.bypass.assert_awaited_once()
+    mock_pydmp.arm_areas.assert_awaited_once_with([1], instant=True)
+    assert panel.getCommandStats()["wait"]["arming"]["commands"] == 1
+
+
+@pytest.mark.asyncio
+async def test_arm_with_bypass_does_not_arm_after_failed_bypass():
+    """Nothing is armed when a bypass fails."""
+    mock_pydmp = Mock()
+    mock_pydmp.arm_areas = AsyncMock()
+    zone = Mock()
+    zone.bypass = AsyncMock(side_effect=ConnectionError("NAK"))
+    mock_pydmp._zones = {5: zone}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+    panel.noteZone("005", "S", "02")
+
+    result = await panel.arm_with_bypass([1, 2, 3])
+
+    assert result == {"bypassed": {"005": "NAK"}, "armed": False, "unknown_area": []}
+    mock_pydmp.arm_areas.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_arm_with_bypass_without_faults():
+    """With no faults the areas are armed directly."""
+    mock_pydmp = Mock()
+    mock_pydmp.arm_areas = AsyncMock()
+    mock_pydmp._zones = {}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    assert await panel.arm_with_bypass([1, 2, 3]) == {
+        "bypassed": {},
+        "armed": True,
+        "unknown_area": [],
+    }
+    mock_pydmp.arm_areas.assert_awaited_once_with([1, 2, 3])
+
+
+def test_restore_snapshot_feeds_fault_index():
+    """Zones restored from the snapshot are indexed for arming."""
+    mock_pydmp = Mock()
+    mock_pydmp._zones = {}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+
+    panel.restoreSnapshot(
+        {"zones": {"4": "O", "5": "N", "6": "O"}, "zone_areas": {"4": 1}}
+    )
+
+    assert panel.getFaultedZones([1]) == [4]
+    # Snapshots from before zone areas were stored leave the area unknown
+    assert panel.getFaultedZonesWithoutArea() == [6]
+
+
+def test_panel_zone_flags():
+    """Zone flags carry the binary sensor booleans and the compact status."""
+    mock_pydmp = Mock()
+    mock_pydmp._zones = {}
+    panel = _make_panel(pydmp_panel=mock_pydmp)
+    panel.ensure_zone("001").update_state("M")
+
+    assert panel.getZoneFlags("001") == {
+        "open": False,
+        "low_battery": False,
+        "trouble": True,
+        "bypassed": False,
+        "alarm": False,
+        "status": "Missing",
+    }
+    panel.set_alarm("001")
+    assert panel.getZoneFlags("001")["status"] == "Alarm"
+
+    # Unknown zones read as ready without being added to the panel
+    assert panel.getZoneFlags("999")["status"] == "Ready"
+    assert list(mock_pydmp._zones) == [1]
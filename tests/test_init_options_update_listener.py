@@ -8,11 +8,20 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 from custom_components.dmp import options_update_listener
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
     CONF_ZONES,
     CONF_ZONE_NUMBER,
     CONF_ZONE_NAME,
     CONF_ZONE_CLASS,
+    CONF_ZONE_DEGLITCH,
+    CONF_ZONE_RATE_LIMITS,
+    CONF_EVENT_BATCH_WINDOW,
+    CONF_INGEST_QUEUE_SIZE,
+    CONF_INGEST_OVERFLOW,
+    CONF_DUPLICATE_WINDOW,
+    CONF_LAST_CONTACT_THROTTLE,
+    CONF_RECONCILE_MIN_INTERVAL,
+    CONF_RECONCILE_MAX_INTERVAL,
+    CONF_COMPACT_ZONES,
 )
 
 
@@ -81,8 +90,7 @@ def mock_entity_registry(mock_entity_entries):
 async def test_options_update_no_changes(hass: HomeAssistant, mock_config_entry):
     """Test options update with no changes."""
     hass.data[DOMAIN] = {
-        mock_config_entry.entry_id: mock_config_entry.data.copy(),
-        LISTENER: Mock()
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
     }
     
     entry_with_no_options = MockConfigEntry(
@@ -99,8 +107,7 @@ async def test_options_update_no_changes(hass: HomeAssistant, mock_config_entry)
 async def test_options_update_zone_removed(hass: HomeAssistant, mock_config_entry, mock_entity_registry, mock_entity_entries):
     """Test removing a zone removes its entities."""
     hass.data[DOMAIN] = {
-        mock_config_entry.entry_id: mock_config_entry.data.copy(),
-        LISTENER: Mock()
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
     }
     
     entry_with_options = MockConfigEntry(
@@ -138,8 +145,7 @@ async def test_options_update_zone_removed(hass: HomeAssistant, mock_config_entr
 async def test_options_update_zone_added(hass: HomeAssistant, mock_config_entry, mock_entity_registry):
     """Test adding a zone updates config."""
     hass.data[DOMAIN] = {
-        mock_config_entry.entry_id: mock_config_entry.data.copy(),
-        LISTENER: Mock()
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
     }
     
     zones_with_new = mock_config_entry.data[CONF_ZONES].copy()
@@ -175,11 +181,56 @@ async def test_options_update_zone_added(hass: HomeAssistant, mock_config_entry,
         )
         assert new_zone[CONF_ZONE_NAME] == "Back Door"
 
+async def test_options_update_zone_filters(hass: HomeAssistant, mock_config_entry, mock_entity_registry):
+    """Test the zone filter settings are copied into the entry data."""
+    hass.data[DOMAIN] = {
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
+    }
+
+    entry_with_options = MockConfigEntry(
+        domain=DOMAIN,
+        data=mock_config_entry.data,
+        options={
+            CONF_ZONES: mock_config_entry.data[CONF_ZONES],
+            CONF_ZONE_RATE_LIMITS: {"motion": 5.0},
+            CONF_ZONE_DEGLITCH: 250,
+            CONF_EVENT_BATCH_WINDOW: 0.2,
+            CONF_LAST_CONTACT_THROTTLE: 30.0,
+            CONF_RECONCILE_MIN_INTERVAL: 120,
+            CONF_RECONCILE_MAX_INTERVAL: 0,
+            CONF_COMPACT_ZONES: True,
+            CONF_DUPLICATE_WINDOW: 5.0,
+            CONF_INGEST_QUEUE_SIZE: 64,
+            CONF_INGEST_OVERFLOW: "drop_oldest",
+        },
+        entry_id=mock_config_entry.entry_id
+    )
+
+    with patch("homeassistant.helpers.entity_registry.async_get", return_value=mock_entity_registry), \
+            patch("homeassistant.helpers.entity_registry.async_entries_for_config_entry", return_value=[]):
+
+        hass.config_entries.async_update_entry = Mock()
+        hass.config_entries.async_reload = AsyncMock()
+
+        await options_update_listener(hass, entry_with_options)
+
+        updated_data = hass.config_entries.async_update_entry.call_args[1]['data']
+        assert updated_data[CONF_ZONE_RATE_LIMITS] == {"motion": 5.0}
+        assert updated_data[CONF_ZONE_DEGLITCH] == 250
+        assert updated_data[CONF_EVENT_BATCH_WINDOW] == 0.2
+        assert updated_data[CONF_LAST_CONTACT_THROTTLE] == 30.0
+        assert updated_data[CONF_RECONCILE_MIN_INTERVAL] == 120
+        assert updated_data[CONF_RECONCILE_MAX_INTERVAL] == 0
+        assert updated_data[CONF_COMPACT_ZONES] is True
+        assert updated_data[CONF_DUPLICATE_WINDOW] == 5.0
+        assert updated_data[CONF_INGEST_QUEUE_SIZE] == 64
+        assert updated_data[CONF_INGEST_OVERFLOW] == "drop_oldest"
+        hass.config_entries.async_reload.assert_awaited_once()
+
 async def test_options_update_zone_modified(hass: HomeAssistant, mock_config_entry, mock_entity_registry):
     """Test modifying a zone name updates config."""
     hass.data[DOMAIN] = {
-        mock_config_entry.entry_id: mock_config_entry.data.copy(),
-        LISTENER: Mock()
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
     }
     
     zones_modified = mock_config_entry.data[CONF_ZONES].copy()
@@ -217,8 +268,7 @@ async def test_options_update_handles_missing_platform(hass: HomeAssistant, mock
     bad_entity.unique_id = "dmp-12345-zone-999"
     
     hass.data[DOMAIN] = {
-        mock_config_entry.entry_id: mock_config_entry.data.copy(),
-        LISTENER: Mock()
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
     }
     
     entry_with_options = MockConfigEntry(
@@ -256,8 +306,7 @@ async def test_options_update_filters_by_zone_number(hass: HomeAssistant, mock_c
     entities.append(entity2)
     
     hass.data[DOMAIN] = {
-        mock_config_entry.entry_id: mock_config_entry.data.copy(),
-        LISTENER: Mock()
+        mock_config_entry.entry_id: mock_config_entry.data.copy()
     }
     
     remaining_zones = [z for z in mock_config_entry.data[CONF_ZONES] if z[CONF_ZONE_NUMBER] != "001"]
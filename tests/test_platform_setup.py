@@ -4,10 +4,11 @@ import importlib
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from unittest.mock import Mock
+from custom_components.dmp import DMPRuntimeData
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
     CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_COMPACT_ZONES,
     CONF_ZONES,
     CONF_ZONE_NAME,
     CONF_ZONE_NUMBER,
@@ -17,6 +18,7 @@ from custom_components.dmp.const import (
     CONF_AWAY_AREA,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 
 
 def _make_panel_mock():
@@ -78,8 +80,8 @@ def _make_panel_mock():
                     },
                 ],
             },
-            1,
-            ("DMPZoneStatus",),
+            6,
+            ("DMPZoneStatus", "DMPIngestStatSensor", "DMPLastContactSensor"),
         ),
         (
             "button",
@@ -154,8 +156,8 @@ async def test_platform_async_setup_entry(
     listener.getPanels.return_value = {acct: panel}
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][LISTENER] = listener
     hass.data[DOMAIN][entry.entry_id] = platform_config
+    entry.runtime_data = DMPRuntimeData(listener, None, None)
 
     entities = []
 
@@ -168,3 +170,51 @@ async def test_platform_async_setup_entry(
     for ent in entities:
         name = type(ent).__name__
         assert name in expected_types, f"Unexpected entity type {name}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "module_name, expected_types",
+    [
+        ("binary_sensor", ()),
+        (
+            "sensor",
+            ("DMPCompactZoneStatus", "DMPIngestStatSensor", "DMPLastContactSensor"),
+        ),
+        ("switch", ("DMPZoneBypassSwitch",)),
+    ],
+)
+async def test_compact_zones_setup(module_name, expected_types, hass: HomeAssistant):
+    """Compact mode keeps only the status sensor and bypass switch per zone."""
+    module = importlib.import_module(f"custom_components.dmp.{module_name}")
+    entry = MockConfigEntry(domain=DOMAIN, data={}, entry_id="test_entry")
+    entry.add_to_hass(hass)
+    listener = Mock()
+    listener.getPanels.return_value = {"12345": _make_panel_mock()}
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][entry.entry_id] = {
+        CONF_PANEL_ACCOUNT_NUMBER: "12345",
+        CONF_COMPACT_ZONES: True,
+        CONF_ZONES: [
+            {
+                CONF_ZONE_NAME: "Front Door",
+                CONF_ZONE_NUMBER: "001",
+                CONF_ZONE_CLASS: "battery_door",
+            },
+        ],
+    }
+    entry.runtime_data = DMPRuntimeData(listener, None, None)
+    # A binary sensor left over from before compact mode was turned on
+    entity_registry = er.async_get(hass)
+    stale = entity_registry.async_get_or_create(
+        "binary_sensor", DOMAIN, "dmp-12345-zone-001-openclose", config_entry=entry
+    )
+
+    entities = []
+    await module.async_setup_entry(
+        hass, entry, lambda new, **kwargs: entities.extend(new)
+    )
+
+    assert {type(ent).__name__ for ent in entities} == set(expected_types)
+    if module_name == "binary_sensor":
+        assert entity_registry.async_get(stale.entity_id) is None
@@ -0,0 +1,77 @@
+"""Parity tests for the fast-path S3 parser."""
+
+import dataclasses
+
+import pytest
+from pydmp import DMPStatusServer, S3Message, parse_s3_message
+
+from custom_components.dmp.s3_parser import S3Event, fast_parse_s3_message, number_key
+
+# Recorded Z-frame bodies as delivered by DMPStatusServer
+CORPUS = [
+    'Zc\\t "DO\\z 006"BACK DOOR\\',
+    'Zc\\t "DC\\z 006"BACK DOOR\\',
+    'Zc\\t "HO\\z 012"GARAGE ENTRY\\',
+    'Zc\\t "FO\\z 012"GARAGE ENTRY\\',
+    'Zc\\t "ON\\v 003"PORCH LIGHT\\',
+    'Zc\\t "OF\\v 003"PORCH LIGHT\\',
+    'Zc\\t "ZZ\\z 006"BACK DOOR\\',
+    'Zc\\z 006\\',
+    'Zc\\t "DO\\z 006"BACK DOOR\\z 007"SECOND\\',
+    'Zc\\t "DO\\z 006\\a 01"PERIMETER\\s 072\\',
+    "Zc",
+    'Zx\\t "BU\\z 002"LIVING ROOM WINDOW\\a 001"PERIMETER\\u 00001"USER 1\\',
+    'Zx\\t "FI\\z 010"SMOKE\\',
+    'Zx\\z 002"LIVING ROOM WINDOW\\',
+    'Zr\\t "BU\\z 002"LIVING ROOM WINDOW\\a 001"PERIMETER\\',
+    'Zr\\t "XX\\z 002\\',
+    'Zr\\t "BU\\z   004 "  SPACED NAME  \\',
+    'Zq\\t "CL\\a 001"PERIMETER\\u 00001"USER 1\\',
+    'Zq\\t "OP\\a 002"INTERIOR\\',
+    'Za\\t "BU\\z 005"KITCHEN\\a 001"PERIMETER\\',
+    'Zs\\s 072\\',
+    'Zd\\z 003"MOTION\\',
+    "Zz\\",
+]
+
+def _messages():
+    for body in CORPUS:
+        for account in ("12345", ""):
+            yield DMPStatusServer._parse_z_body(account, body)
+
+
+@pytest.mark.parametrize("msg", list(_messages()), ids=repr)
+def test_fast_parser_matches_pydmp(msg):
+    """The fast parser returns the same fields as parse_s3_message."""
+    expected = parse_s3_message(msg)
+    actual = fast_parse_s3_message(msg)
+    for field in dataclasses.fields(expected):
+        assert getattr(actual, field.name) == getattr(expected, field.name), field.name
+
+
+@pytest.mark.parametrize("definition", ["Zc", "Zx", "Zr"])
+def test_fast_path_definitions_use_slotted_record(definition):
+    """Zc, Zx and Zr are parsed into the compact S3Event record."""
+    msg = S3Message("12345", definition, "DO", ['z 006"BACK DOOR', "t DO"], "")
+    event = fast_parse_s3_message(msg)
+    assert isinstance(event, S3Event)
+    assert not hasattr(event, "__dict__")
+    assert event.zone == "006"
+    assert event.zone_name == "BACK DOOR"
+
+
+def test_other_definitions_fall_back_to_pydmp():
+    """Anything outside the fast path is parsed by pyDMP."""
+    msg = S3Message("12345", "Zq", "CL", ['a 001"MAIN', "t CL"], "")
+    event = fast_parse_s3_message(msg)
+    assert not isinstance(event, S3Event)
+    assert event.area == "001"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("001", 1), (" 1", 1), (1, 1), ("00123", 123), ("     ", ""), ("A1", "A1"), (None, None)],
+)
+def test_number_key(value, expected):
+    """Padded numbers share one key; anything else is only stripped."""
+    assert number_key(value) == expected
@@ -1,12 +1,17 @@
 """Test sensor module for DMP integration."""
 
 import pytest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+from homeassistant.const import EntityCategory
 
+from custom_components.dmp.sensor import DMPIngestStatSensor, DMPLastContactSensor
+from custom_components.dmp import DMPRuntimeData
 from custom_components.dmp.const import (
     DOMAIN,
     CONF_PANEL_ACCOUNT_NUMBER,
+    CONF_LAST_CONTACT_THROTTLE,
     CONF_ZONES,
     CONF_ZONE_NAME,
     CONF_ZONE_NUMBER,
@@ -48,7 +53,116 @@ def mock_listener_panel():
     listener.getPanels.return_value = {"12345": panel}
     listener.register_callback = Mock()
     listener.remove_callback = Mock()
+    listener.register_zone_callback = Mock()
+    listener.remove_zone_callback = Mock()
     return listener, panel
 
 
 # async_setup_entry test consolidated in test_platform_setup.py
+
+
+def test_ingest_stat_sensor(hass, mock_config_entry, mock_listener_panel):
+    """Ingest stat sensors read counters from the listener."""
+    listener, panel = mock_listener_panel
+    listener.getIngestStats.return_value = {"dropped": 4, "high_water_mark": 9}
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
+
+    sensor = DMPIngestStatSensor(hass, mock_config_entry, "dropped")
+    assert sensor.name == "S3 Events Dropped"
+    assert sensor.native_value == 4
+    assert sensor.unique_id == "dmp-12345-panel-ingest-dropped"
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+    assert sensor.state_class == SensorStateClass.TOTAL_INCREASING
+    assert sensor.device_info["identifiers"] == {(DOMAIN, "dmp-12345-panel")}
+
+    sensor = DMPIngestStatSensor(hass, mock_config_entry, "high_water_mark")
+    assert sensor.native_value == 9
+    assert sensor.unique_id == "dmp-12345-panel-ingest-high-water-mark"
+    assert sensor.state_class == SensorStateClass.MEASUREMENT
+
+
+def test_last_contact_sensor(hass, mock_config_entry, mock_listener_panel):
+    """The last contact sensor reports the panel contact time."""
+    listener, panel = mock_listener_panel
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
+
+    sensor = DMPLastContactSensor(hass, mock_config_entry)
+    assert sensor.name == "Last Contact"
+    assert sensor.native_value == "2023-01-02T00:00:00"
+    assert sensor.unique_id == "dmp-12345-panel-last-contact"
+    assert sensor.device_class == SensorDeviceClass.TIMESTAMP
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+    assert sensor.should_poll is False
+    assert sensor.device_info["identifiers"] == {(DOMAIN, "dmp-12345-panel")}
+
+
+@pytest.mark.asyncio
+async def test_last_contact_sensor_callbacks(
+    hass, mock_config_entry, mock_listener_panel
+):
+    """The sensor registers on the contact channel and writes every contact."""
+    listener, panel = mock_listener_panel
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
+
+    sensor = DMPLastContactSensor(hass, mock_config_entry)
+    await sensor.async_added_to_hass()
+    listener.register_contact_callback.assert_called_once_with(
+        sensor.process_contact_callback
+    )
+
+    sensor.async_write_ha_state = Mock()
+    sensor.process_contact_callback()
+    sensor.process_contact_callback()
+    assert sensor.async_write_ha_state.call_count == 2
+
+    await sensor.async_will_remove_from_hass()
+    listener.remove_contact_callback.assert_called_once_with(
+        sensor.process_contact_callback
+    )
+
+
+@pytest.mark.asyncio
+async def test_last_contact_sensor_throttle(
+    hass, mock_config_entry, mock_listener_panel
+):
+    """Throttled contacts collapse into one trailing write."""
+    listener, panel = mock_listener_panel
+    hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN][mock_config_entry.entry_id] = {
+        **mock_config_entry.data,
+        CONF_LAST_CONTACT_THROTTLE: 30,
+    }
+    mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
+
+    sensor = DMPLastContactSensor(hass, mock_config_entry)
+    sensor.async_write_ha_state = Mock()
+    unsub = Mock()
+    with patch(
+        "custom_components.dmp.sensor.async_call_later", return_value=unsub
+    ) as mock_call_later:
+        sensor.process_contact_callback()
+        sensor.process_contact_callback()
+        sensor.process_contact_callback()
+
+    assert sensor.async_write_ha_state.call_count == 1
+    mock_call_later.assert_called_once()
+    assert 0 < mock_call_later.call_args[0][1] <= 30
+
+    # The trailing write publishes the latest contact
+    sensor._async_throttled_write(None)
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor._unsub_throttle is None
+
+    # A pending trailing write is cancelled on removal
+    with patch(
+        "custom_components.dmp.sensor.async_call_later", return_value=unsub
+    ):
+        sensor.process_contact_callback()
+    await sensor.async_will_remove_from_hass()
+    unsub.assert_called_once()
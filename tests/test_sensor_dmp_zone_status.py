@@ -5,15 +5,16 @@ from unittest.mock import Mock, patch
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.dmp.sensor import DMPZoneStatus
+from custom_components.dmp.sensor import DMPCompactZoneStatus, DMPZoneStatus
+from custom_components.dmp import DMPRuntimeData
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
     CONF_PANEL_ACCOUNT_NUMBER,
     CONF_ZONES,
     CONF_ZONE_NAME,
     CONF_ZONE_NUMBER,
     CONF_ZONE_CLASS,
+    EVENT_ZONE_STATE,
 )
 
 pytestmark = pytest.mark.usefixtures("init_integration")
@@ -53,6 +54,8 @@ def mock_listener_panel():
     listener.getPanels.return_value = {"12345": panel}
     listener.register_callback = Mock()
     listener.remove_callback = Mock()
+    listener.register_zone_callback = Mock()
+    listener.remove_zone_callback = Mock()
     return listener, panel
 
 
@@ -85,7 +88,7 @@ class TestDMPZoneStatus:
         device_info = sensor.device_info
         identifiers = device_info["identifiers"]
         assert (DOMAIN, "dmp-12345-zone-001") in identifiers
-        assert sensor.extra_state_attributes == {"last_contact": "2023-01-02T00:00:00"}
+        assert sensor.extra_state_attributes is None
 
     @pytest.mark.asyncio
     async def test_callbacks_registration(
@@ -98,9 +101,13 @@ class TestDMPZoneStatus:
             hass, mock_config_entry, mock_config_entry.data[CONF_ZONES][0]
         )
         await sensor.async_added_to_hass()
-        listener.register_callback.assert_called_once_with(sensor.process_zone_callback)
+        listener.register_zone_callback.assert_called_once_with(
+            "12345", "001", sensor.process_zone_callback
+        )
         await sensor.async_will_remove_from_hass()
-        listener.remove_callback.assert_called_once_with(sensor.process_zone_callback)
+        listener.remove_zone_callback.assert_called_once_with(
+            "12345", "001", sensor.process_zone_callback
+        )
 
     def test_native_value_property(
         self, hass: HomeAssistant, mock_config_entry, mock_listener_panel
@@ -192,14 +199,14 @@ class TestDMPZoneStatus:
         """Test that process_zone_callback updates state from pyDMP zone and writes state."""
         listener, panel = mock_listener_panel
         hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][LISTENER] = listener
         hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+        mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
         zone_config = mock_config_entry.data[CONF_ZONES][0]
         sensor = DMPZoneStatus(hass, mock_config_entry, zone_config)
         sensor.async_write_ha_state = Mock()
         # Set zone state to 'O' (Open) via pyDMP Zone mock
         sensor._zone.state = "O"
-        await sensor.process_zone_callback()
+        sensor.process_zone_callback()
         assert sensor._state == "Open"
         sensor.async_write_ha_state.assert_called_once()
 
@@ -210,13 +217,13 @@ class TestDMPZoneStatus:
         """Test that alarm state takes priority in status callback."""
         listener, panel = mock_listener_panel
         hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][LISTENER] = listener
         hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+        mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
         zone_config = mock_config_entry.data[CONF_ZONES][0]
         sensor = DMPZoneStatus(hass, mock_config_entry, zone_config)
         sensor.async_write_ha_state = Mock()
         panel.get_alarm.return_value = True
-        await sensor.process_zone_callback()
+        sensor.process_zone_callback()
         assert sensor._state == "Alarm"
         sensor.async_write_ha_state.assert_called_once()
 
@@ -227,8 +234,8 @@ class TestDMPZoneStatus:
         """Test device removal when sensor is removed from hass."""
         listener, panel = mock_listener_panel
         hass.data.setdefault(DOMAIN, {})
-        hass.data[DOMAIN][LISTENER] = listener
         hass.data[DOMAIN][mock_config_entry.entry_id] = mock_config_entry.data
+        mock_config_entry.runtime_data = DMPRuntimeData(listener, None, None)
         zone_config = mock_config_entry.data[CONF_ZONES][0]
         sensor = DMPZoneStatus(hass, mock_config_entry, zone_config)
         mock_device_registry = Mock()
@@ -257,3 +264,48 @@ class TestDMPZoneStatus:
         zone_config = mock_config_entry.data[CONF_ZONES][0]
         sensor = DMPZoneStatus(hass, mock_config_entry, zone_config)
         assert sensor.should_poll is False
+
+
+@pytest.mark.asyncio
+async def test_compact_status_events(
+    hass: HomeAssistant, mock_config_entry, mock_listener_panel
+):
+    """The compact sensor is an enum and fires events only on transitions."""
+    listener, panel = mock_listener_panel
+    zone = panel.ensure_zone.return_value
+    zone.is_open = False
+    zone.has_fault = False
+    zone.is_bypassed = False
+    events = []
+    hass.bus.async_listen(EVENT_ZONE_STATE, events.append)
+
+    sensor = DMPCompactZoneStatus(
+        hass, mock_config_entry, mock_config_entry.data[CONF_ZONES][0]
+    )
+    sensor.async_write_ha_state = Mock()
+    assert sensor.device_class == "enum"
+    assert "Missing" in sensor.options
+    await sensor.async_added_to_hass()
+
+    sensor.process_zone_callback()
+    await hass.async_block_till_done()
+    assert events == []
+
+    zone.state = "M"
+    zone.has_fault = True
+    sensor.process_zone_callback()
+    sensor.process_zone_callback()
+    await hass.async_block_till_done()
+
+    assert sensor.state == "Missing"
+    assert len(events) == 1
+    assert events[0].data == {
+        CONF_PANEL_ACCOUNT_NUMBER: "12345",
+        CONF_ZONE_NUMBER: "001",
+        "status": "Missing",
+        "open": False,
+        "low_battery": False,
+        "trouble": True,
+        "bypassed": False,
+        "alarm": False,
+    }
@@ -0,0 +1,278 @@
+"""Tests for the DMP bulk zone services."""
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dmp import DMPRuntimeData, async_setup
+from custom_components.dmp.services import async_setup_services
+from custom_components.dmp.const import (
+    DOMAIN,
+    SERVICE_ARM_WITH_BYPASS,
+    SERVICE_BYPASS_ZONES,
+    SERVICE_GET_ZONE_STATES,
+    SERVICE_RESTORE_ZONES,
+)
+
+
+def _add_loaded_entry(hass, listener, entry_id, zone_numbers):
+    entry = MockConfigEntry(
+        domain=DOMAIN, entry_id=entry_id, state=ConfigEntryState.LOADED
+    )
+    entry.add_to_hass(hass)
+    entry.runtime_data = DMPRuntimeData(listener, None, None)
+    hass.data.setdefault(DOMAIN, {})[entry_id] = {
+        "zones": [
+            {"zone_name": "Zone %s" % number, "zone_number": number}
+            for number in zone_numbers
+        ]
+    }
+    return entry
+
+
+@pytest.fixture
+def mock_listener(hass: HomeAssistant):
+    """Register a loaded entry whose listener has a single panel."""
+    listener = Mock()
+    listener.updateStatus = AsyncMock()
+    panel = Mock()
+    panel.bypass_zones = AsyncMock(return_value={"001": "ok", "002": "ok"})
+    panel.restore_zones = AsyncMock(return_value={"001": "ok"})
+    panel.arm_with_bypass = AsyncMock(
+        return_value={"bypassed": {"004": "ok"}, "armed": True}
+    )
+    listener.getHomeArea.return_value = "01"
+    listener.getPanels.return_value = {"12345": panel}
+    _add_loaded_entry(hass, listener, "entry_12345", ["001", "002"])
+    return listener, panel
+
+
+@pytest.mark.asyncio
+async def test_async_setup_registers_services(hass: HomeAssistant):
+    """async_setup registers both services once."""
+    assert await async_setup(hass, {}) is True
+    assert hass.services.has_service(DOMAIN, SERVICE_BYPASS_ZONES)
+    assert hass.services.has_service(DOMAIN, SERVICE_RESTORE_ZONES)
+    assert hass.services.has_service(DOMAIN, SERVICE_ARM_WITH_BYPASS)
+    assert hass.services.has_service(DOMAIN, SERVICE_GET_ZONE_STATES)
+    # A second call is a no-op
+    async_setup_services(hass)
+
+
+@pytest.mark.asyncio
+async def test_bypass_zones_returns_results(hass: HomeAssistant, mock_listener):
+    """Bypassing runs one batch, then refreshes status once."""
+    listener, panel = mock_listener
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BYPASS_ZONES,
+        {"zones": ["001", "002"]},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"results": {"001": "ok", "002": "ok"}}
+    panel.bypass_zones.assert_awaited_once_with(["001", "002"])
+    listener.updateStatus.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_restore_zones_by_account(hass: HomeAssistant, mock_listener):
+    """A single zone and an explicit account are accepted."""
+    listener, panel = mock_listener
+    listener.updateStatus.side_effect = ConnectionError("panel offline")
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_RESTORE_ZONES,
+        {"zones": "001", "account_number": "12345"},
+        blocking=True,
+        return_response=True,
+    )
+
+    # A failed refresh does not hide the batch results
+    assert response == {"results": {"001": "ok"}}
+    panel.restore_zones.assert_awaited_once_with(["001"])
+
+
+@pytest.mark.asyncio
+async def test_unconfigured_zones_rejected(hass: HomeAssistant, mock_listener):
+    """Zones the entry does not configure are rejected before any command."""
+    listener, panel = mock_listener
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError, match="1000, 500"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BYPASS_ZONES,
+            {"zones": ["001", "1000", "500"]},
+            blocking=True,
+        )
+    panel.bypass_zones.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_unknown_account_rejected(hass: HomeAssistant, mock_listener):
+    """An unknown account number is a validation error."""
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BYPASS_ZONES,
+            {"zones": ["001"], "account_number": "99999"},
+            blocking=True,
+        )
+
+
+@pytest.mark.asyncio
+async def test_account_required_with_several_panels(hass: HomeAssistant, mock_listener):
+    """The account number is required once more than one panel is set up."""
+    listener, panel = mock_listener
+    listener.getPanels.return_value = {"12345": panel, "67890": Mock()}
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_BYPASS_ZONES, {"zones": ["001"]}, blocking=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_panel_found_across_entries(hass: HomeAssistant, mock_listener):
+    """Each config entry has its own listener; the account picks the entry."""
+    other_listener = Mock()
+    other_listener.updateStatus = AsyncMock()
+    other_panel = Mock()
+    other_panel.bypass_zones = AsyncMock(return_value={"003": "ok"})
+    other_listener.getPanels.return_value = {"67890": other_panel}
+    _add_loaded_entry(hass, other_listener, "entry_67890", ["003"])
+    listener, panel = mock_listener
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BYPASS_ZONES,
+        {"zones": ["003"], "account_number": "67890"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"results": {"003": "ok"}}
+    other_listener.updateStatus.assert_awaited_once()
+    panel.bypass_zones.assert_not_awaited()
+    listener.updateStatus.assert_not_awaited()
+
+    # Without an account number the call is ambiguous
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_BYPASS_ZONES, {"zones": ["001"]}, blocking=True
+        )
+
+
+@pytest.mark.asyncio
+async def test_no_panel_set_up(hass: HomeAssistant):
+    """Calling a service before any entry has loaded is a validation error."""
+    MockConfigEntry(
+        domain=DOMAIN, entry_id="entry_12345", state=ConfigEntryState.SETUP_RETRY
+    ).add_to_hass(hass)
+    async_setup_services(hass)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_BYPASS_ZONES, {"zones": ["001"]}, blocking=True
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mode,areas,instant",
+    [
+        ("away", [1, 2, 3], False),
+        ("home", [1], False),
+        ("night", [1], True),
+    ],
+)
+async def test_arm_with_bypass(hass: HomeAssistant, mock_listener, mode, areas, instant):
+    """Each arming mode maps to the same areas as the arming panel."""
+    listener, panel = mock_listener
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_ARM_WITH_BYPASS,
+        {"mode": mode},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response == {"bypassed": {"004": "ok"}, "armed": True}
+    panel.arm_with_bypass.assert_awaited_once_with(areas, instant=instant)
+
+
+@pytest.mark.asyncio
+async def test_get_zone_states(hass: HomeAssistant, mock_listener):
+    """Zone states default to every configured zone, named from the config."""
+    listener, panel = mock_listener
+    hass.data[DOMAIN] = {
+        "entry_12345": {
+            "zones": [
+                {"zone_name": "Front Door", "zone_number": "001"},
+                {"zone_name": "Window", "zone_number": "002"},
+            ]
+        }
+    }
+    panel.getZoneFlags.side_effect = lambda zone: {"status": "Ready", "zone": zone}
+    suppressed = {"rate_limited": 0, "deglitched": 0}
+    listener.getZoneFilterStats.return_value = suppressed
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_ZONE_STATES, {}, blocking=True, return_response=True
+    )
+    assert response == {
+        "zones": {
+            "001": {
+                "status": "Ready",
+                "zone": "001",
+                "name": "Front Door",
+                "suppressed": suppressed,
+            },
+            "002": {
+                "status": "Ready",
+                "zone": "002",
+                "name": "Window",
+                "suppressed": suppressed,
+            },
+        }
+    }
+
+    # Zones that are not configured are rejected, not looked up
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_ZONE_STATES,
+            {"zones": ["001", "009"]},
+            blocking=True,
+            return_response=True,
+        )
+    assert [c.args for c in panel.getZoneFlags.call_args_list] == [
+        ("001",),
+        ("002",),
+    ]
+
+    # Unpadded zone numbers find the configured name
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_ZONE_STATES,
+        {"zones": "2"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["zones"]["2"]["name"] == "Window"
@@ -0,0 +1,125 @@
+"""Tests for the shared S3 status server."""
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+from homeassistant.core import HomeAssistant
+from pydmp import S3Message
+
+from custom_components.dmp.status_server import (
+    DMPSharedStatusServer,
+    async_acquire_status_server,
+    async_release_status_server,
+)
+from custom_components.dmp.const import DOMAIN, STATUS_SERVERS
+
+
+@pytest.fixture
+def mock_pydmp_server():
+    """Patch pyDMP's status server with one mock per created instance."""
+    servers = []
+
+    def factory(host, port):
+        server = Mock()
+        server.start = AsyncMock()
+        server.stop = AsyncMock()
+        servers.append(server)
+        return server
+
+    with patch("custom_components.dmp.status_server.DMPStatusServer", factory):
+        yield servers
+
+
+def _msg(account):
+    return S3Message(account=account, definition="Zc", type_code="DO", fields=[], raw="")
+
+
+@pytest.mark.asyncio
+async def test_routes_messages_by_account(mock_pydmp_server):
+    """Each account's messages go to the callback that attached it."""
+    server = DMPSharedStatusServer("0.0.0.0", 40001)
+    first = AsyncMock()
+    second = AsyncMock()
+    server.attach("12345", first)
+    server.attach(" 6789", second)
+
+    await server._route(_msg("12345"))
+    await server._route(_msg(" 6789"))
+    await server._route(_msg("99999"))
+
+    assert first.await_count == 1
+    assert second.await_count == 1
+    assert server.getStats()["unrouted"] == 1
+
+    server.detach("12345", first)
+    await server._route(_msg("12345"))
+    assert first.await_count == 1
+    assert server.getAccounts() == [6789]
+
+
+@pytest.mark.asyncio
+async def test_blank_account_goes_to_only_panel(mock_pydmp_server):
+    """A frame without an account is routed when only one panel is attached."""
+    server = DMPSharedStatusServer("0.0.0.0", 40001)
+    callback = AsyncMock()
+    server.attach("12345", callback)
+
+    await server._route(_msg("     "))
+    callback.assert_awaited_once()
+
+    server.attach("67890", AsyncMock())
+    await server._route(_msg("     "))
+    assert callback.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_detach_ignores_other_owner(mock_pydmp_server):
+    """Detaching only removes the account if the callback still owns it."""
+    server = DMPSharedStatusServer("0.0.0.0", 40001)
+    owner = AsyncMock()
+    server.attach("12345", owner)
+
+    server.detach("12345", AsyncMock())
+
+    assert server.getAccounts() == [12345]
+
+
+@pytest.mark.asyncio
+async def test_one_server_per_port(hass: HomeAssistant, mock_pydmp_server):
+    """Entries on the same port share one started server until the last leaves."""
+    first = await async_acquire_status_server(hass, 40001)
+    second = await async_acquire_status_server(hass, 40001)
+    other = await async_acquire_status_server(hass, 40002)
+
+    assert first is second
+    assert other is not first
+    assert len(mock_pydmp_server) == 2
+    mock_pydmp_server[0].start.assert_awaited_once()
+
+    await async_release_status_server(hass, first)
+    mock_pydmp_server[0].stop.assert_not_awaited()
+    assert hass.data[DOMAIN][STATUS_SERVERS][40001] is first
+
+    await async_release_status_server(hass, second)
+    mock_pydmp_server[0].stop.assert_awaited_once()
+    assert 40001 not in hass.data[DOMAIN][STATUS_SERVERS]
+
+    await async_release_status_server(hass, other)
+    assert hass.data[DOMAIN][STATUS_SERVERS] == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_start_is_forgotten(hass: HomeAssistant, mock_pydmp_server):
+    """A server that cannot bind is not kept around for the next entry."""
+
+    def failing_factory(host, port):
+        server = Mock()
+        server.start = AsyncMock(side_effect=OSError("address in use"))
+        return server
+
+    with patch(
+        "custom_components.dmp.status_server.DMPStatusServer", failing_factory
+    ):
+        with pytest.raises(OSError):
+            await async_acquire_status_server(hass, 40001)
+
+    assert hass.data[DOMAIN][STATUS_SERVERS] == {}
@@ -5,9 +5,9 @@ from unittest.mock import Mock
 from homeassistant.core import HomeAssistant
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.dmp import DMPRuntimeData
 from custom_components.dmp.const import (
     DOMAIN,
-    LISTENER,
     CONF_PANEL_ACCOUNT_NUMBER,
     CONF_ZONES,
     CONF_ZONE_NAME,
@@ -74,7 +74,6 @@ async def test_async_setup_entry_zones(
     listener.getPanels.return_value = {"12345": panel}
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][LISTENER] = listener
 
     config_entry = MockConfigEntry(
         domain=DOMAIN,
@@ -83,6 +82,7 @@ async def test_async_setup_entry_zones(
     )
 
     hass.data[DOMAIN][config_entry.entry_id] = config_entry.data
+    config_entry.runtime_data = DMPRuntimeData(listener, None, None)
 
     entities = []
 
@@ -114,7 +114,6 @@ async def test_async_setup_entry_update_before_add_false(hass: HomeAssistant):
     listener.getPanels.return_value = {"12345": panel}
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][LISTENER] = listener
 
     config_entry = MockConfigEntry(
         domain=DOMAIN,
@@ -132,6 +131,7 @@ async def test_async_setup_entry_update_before_add_false(hass: HomeAssistant):
     )
 
     hass.data[DOMAIN][config_entry.entry_id] = config_entry.data
+    config_entry.runtime_data = DMPRuntimeData(listener, None, None)
 
     update_before_add_values = []
 
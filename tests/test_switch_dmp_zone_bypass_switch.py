@@ -32,6 +32,8 @@ def mock_listener_panel():
     listener.getPanels.return_value = {"12345": panel}
     listener.register_callback = Mock()
     listener.remove_callback = Mock()
+    listener.register_zone_callback = Mock()
+    listener.remove_zone_callback = Mock()
     return listener, panel
 
 
@@ -82,7 +84,6 @@ def test_basic_properties(
         CONF_ZONE_CLASS: zone_class,
     }
     switch = DMPZoneBypassSwitch(hass, mock_config_entry, zone_config)
-    assert switch._name == expected_name
     assert switch._number == zone_number
     assert switch._state is False
     assert switch.name == expected_name
@@ -146,7 +147,7 @@ def test_initial_ensure_zone_called(
 def test_device_info_and_poll(
     hass: HomeAssistant, mock_config_entry, mock_listener_panel
 ):
-    """Test device_info identifiers and default should_poll property."""
+    """Test device_info identifiers and that the switch is push updated."""
     listener, panel = mock_listener_panel
     zone_config = {
         CONF_ZONE_NAME: "Front Door",
@@ -154,7 +155,7 @@ def test_device_info_and_poll(
         CONF_ZONE_CLASS: "wired_door",
     }
     switch = DMPZoneBypassSwitch(hass, mock_config_entry, zone_config)
-    assert switch.should_poll is True
+    assert switch.should_poll is False
     device_info = switch.device_info
     expected_id = (DOMAIN, "dmp-12345-zone-001")
     assert expected_id in device_info["identifiers"]
@@ -175,13 +176,17 @@ async def test_process_zone_callback_and_callbacks(
     switch = DMPZoneBypassSwitch(hass, mock_config_entry, zone_config)
     switch.async_write_ha_state = Mock()
     switch._zone.is_bypassed = True
-    await switch.process_zone_callback()
+    switch.process_zone_callback()
     assert switch._state is True
     switch.async_write_ha_state.assert_called_once()
     await switch.async_added_to_hass()
-    listener.register_callback.assert_called_once_with(switch.process_zone_callback)
+    listener.register_zone_callback.assert_called_once_with(
+        "12345", "001", switch.process_zone_callback
+    )
     await switch.async_will_remove_from_hass()
-    listener.remove_callback.assert_called_once_with(switch.process_zone_callback)
+    listener.remove_zone_callback.assert_called_once_with(
+        "12345", "001", switch.process_zone_callback
+    )
 
 
 def test_is_on_property(hass: HomeAssistant, mock_config_entry, mock_listener_panel):
@@ -212,10 +217,10 @@ def test_device_name_property(
     assert switch.device_name == "Front Door"
 
 
-def test_device_info_missing_name(
+def test_device_info_zone_name(
     hass: HomeAssistant, mock_config_entry, mock_listener_panel
 ):
-    """Test device_info does not include a name attribute."""
+    """Test device_info is named after the zone."""
     listener, panel = mock_listener_panel
     zone_config = {
         CONF_ZONE_NAME: "Front Door",
@@ -224,7 +229,7 @@ def test_device_info_missing_name(
     }
     switch = DMPZoneBypassSwitch(hass, mock_config_entry, zone_config)
     device_info = switch.device_info
-    assert "name" not in device_info
+    assert device_info["name"] == "Front Door"
 
 
 @pytest.mark.asyncio
@@ -241,5 +246,22 @@ async def test_process_zone_callback_zone_bypassed(
     switch = DMPZoneBypassSwitch(hass, mock_config_entry, zone_config)
     switch.async_write_ha_state = Mock()
     switch._zone.is_bypassed = True
-    await switch.process_zone_callback()
+    switch.process_zone_callback()
     assert switch._state is True
+
+
+def test_available_follows_connection(
+    hass: HomeAssistant, mock_config_entry, mock_listener_panel
+):
+    """The bypass switch is unavailable while the panel is not connected."""
+    listener, panel = mock_listener_panel
+    switch = DMPZoneBypassSwitch(
+        hass,
+        mock_config_entry,
+        {CONF_ZONE_NAME: "Front Door", CONF_ZONE_NUMBER: "001"},
+    )
+
+    listener.isConnected.return_value = False
+    assert switch.available is False
+    listener.isConnected.return_value = True
+    assert switch.available is True
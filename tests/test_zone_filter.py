@@ -0,0 +1,110 @@
+"""Tests for the zone open/close rate limit and deglitch filter."""
+
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+import custom_components.dmp.zone_filter as zone_filter_module
+from custom_components.dmp.zone_filter import DMPZoneFilter
+
+ZONES = [
+    {"zone_number": "001", "zone_class": "wired_motion"},
+    {"zone_number": "002", "zone_class": "wired_door"},
+]
+
+
+def _make_filter(rate_limits=None, deglitch=0):
+    wake = Mock()
+    zone_filter = DMPZoneFilter(rate_limits or {}, deglitch, wake)
+    zone_filter.setZones("12345", ZONES)
+    return zone_filter, wake
+
+
+def test_disabled_by_default():
+    """Without rate limits or deglitch every event passes."""
+    zone_filter, wake = _make_filter()
+    assert not zone_filter.enabled
+    assert zone_filter.allow("12345", "001", "O")
+    assert zone_filter.getStats() == {"rate_limited": 0, "deglitched": 0, "zones": {}}
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_leading_and_trailing_edge(monkeypatch):
+    """The first change passes, a burst collapses into one trailing wake."""
+    now = [100.0]
+    # Only the filter's clock is frozen, the event loop keeps real time
+    monkeypatch.setattr(zone_filter_module, "time", Mock(monotonic=lambda: now[0]))
+    zone_filter, wake = _make_filter({"motion": 0.05})
+
+    assert zone_filter.allow("12345", "001", "O")
+    for state in ("N", "O", "N"):
+        assert not zone_filter.allow("12345", "001", state)
+    # Door zones have no limit
+    assert zone_filter.allow("12345", "002", "O")
+    assert zone_filter.allow("12345", "002", "N")
+    wake.assert_not_called()
+
+    now[0] += 0.05
+    await asyncio.sleep(0.1)
+    wake.assert_called_once_with("12345", "001")
+    assert zone_filter.getZoneStats("12345", "001") == {
+        "rate_limited": 3,
+        "deglitched": 0,
+    }
+    assert zone_filter.getStats()["zones"] == {
+        "12345-001": {"rate_limited": 3, "deglitched": 0}
+    }
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_skips_trailing_wake_when_state_returned(monkeypatch):
+    """No trailing wake is sent when the zone ends where it was delivered."""
+    now = [100.0]
+    # Only the filter's clock is frozen, the event loop keeps real time
+    monkeypatch.setattr(zone_filter_module, "time", Mock(monotonic=lambda: now[0]))
+    zone_filter, wake = _make_filter({"motion": 0.05})
+
+    assert zone_filter.allow("12345", "001", "O")
+    assert not zone_filter.allow("12345", "001", "N")
+    assert not zone_filter.allow("12345", "001", "O")
+    now[0] += 0.05
+    await asyncio.sleep(0.1)
+
+    wake.assert_not_called()
+    # The window has passed, so the next change goes straight through
+    now[0] += 0.05
+    assert zone_filter.allow("12345", "001", "N")
+
+
+@pytest.mark.asyncio
+async def test_deglitch_drops_short_pulses():
+    """Opens shorter than the deglitch time never wake the zone."""
+    zone_filter, wake = _make_filter(deglitch=50)
+
+    assert not zone_filter.allow("12345", "002", "O")
+    assert not zone_filter.allow("12345", "002", "N")
+    await asyncio.sleep(0.1)
+    wake.assert_not_called()
+    assert zone_filter.getZoneStats("12345", "002") == {
+        "rate_limited": 0,
+        "deglitched": 1,
+    }
+
+    # An open that lasts is delivered once the deglitch time has passed
+    assert not zone_filter.allow("12345", "002", "O")
+    await asyncio.sleep(0.1)
+    wake.assert_called_once_with("12345", "002")
+    # Closing a delivered open is not delayed
+    assert zone_filter.allow("12345", "002", "N")
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_pending_wakes():
+    """Cancelling drops held back wake-ups."""
+    zone_filter, wake = _make_filter(deglitch=20)
+
+    assert not zone_filter.allow("12345", "001", "O")
+    zone_filter.cancel()
+    await asyncio.sleep(0.05)
+
+    wake.assert_not_called()